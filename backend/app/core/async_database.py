@@ -0,0 +1,217 @@
+"""
+Async Database Connection Management
+psycopg 3 connection pool for async route handlers, alongside the
+synchronous Database used by scripts and background workers
+"""
+
+import asyncio
+import struct
+from contextlib import asynccontextmanager
+from typing import Callable, Optional
+
+import numpy as np
+from psycopg import AsyncConnection
+from psycopg.adapt import Dumper, Loader
+from psycopg.pq import Format
+from psycopg.rows import dict_row
+from psycopg.types import TypeInfo
+from psycopg_pool import AsyncConnectionPool
+
+from .config import settings
+from .vector import parse_vector
+
+# pgvector TypeInfo per type name, fetched on the first connection
+_vector_types = {}
+
+
+class VectorBinaryDumper(Dumper):
+    """
+    Send a NumPy array in pgvector's binary format
+    (uint16 dimension, uint16 unused, big-endian float32 values), which
+    skips formatting and parsing decimal text on both ends
+    """
+
+    format = Format.BINARY
+
+    def dump(self, obj) -> bytes:
+        values = np.asarray(obj, dtype=">f4")
+        if values.ndim != 1:
+            raise ValueError(f"Expected a 1-D vector, got shape {values.shape}")
+        return struct.pack(">HH", values.shape[0], 0) + values.tobytes()
+
+
+class VectorBinaryLoader(Loader):
+    """Read a binary vector column as a float32 NumPy array"""
+
+    format = Format.BINARY
+    dtype = ">f4"
+
+    def load(self, data) -> np.ndarray:
+        data = bytes(data)
+        dimension = struct.unpack_from(">H", data)[0]
+        return np.frombuffer(data, dtype=self.dtype, count=dimension, offset=4).astype(np.float32)
+
+
+class HalfvecBinaryLoader(VectorBinaryLoader):
+    """Read a binary halfvec column as a float32 NumPy array"""
+
+    dtype = ">f2"
+
+
+class VectorTextLoader(Loader):
+    """Read a text vector/halfvec column as a float32 NumPy array"""
+
+    format = Format.TEXT
+
+    def load(self, data) -> np.ndarray:
+        return parse_vector(bytes(data).decode("ascii"))
+
+
+async def configure_connection(conn: AsyncConnection):
+    """
+    Register pgvector adaptation on a new pooled connection
+
+    Args:
+        conn: Connection being added to the pool
+    """
+    if not _vector_types:
+        for name in ("vector", "halfvec"):
+            info = await TypeInfo.fetch(conn, name)
+            if info is not None:
+                _vector_types[name] = info
+        # Connection is returned to the pool idle
+        await conn.rollback()
+
+    adapters = conn.adapters
+    vector = _vector_types.get("vector")
+    if vector is not None:
+        dumper = type("VectorDumper", (VectorBinaryDumper,), {"oid": vector.oid})
+        adapters.register_dumper(np.ndarray, dumper)
+        adapters.register_loader(vector.oid, VectorTextLoader)
+        adapters.register_loader(vector.oid, VectorBinaryLoader)
+    halfvec = _vector_types.get("halfvec")
+    if halfvec is not None:
+        adapters.register_loader(halfvec.oid, VectorTextLoader)
+        adapters.register_loader(halfvec.oid, HalfvecBinaryLoader)
+
+
+def _connect_kwargs() -> dict:
+    """Connection parameters shared by pooled and listener connections"""
+    return {
+        "host": settings.DB_HOST,
+        "dbname": settings.DB_NAME,
+        "user": settings.DB_USER,
+        "password": settings.DB_PASSWORD,
+        "port": settings.DB_PORT
+    }
+
+
+class AsyncDatabase:
+    """Async database connection manager"""
+
+    _pool = None
+
+    @staticmethod
+    def get_pool() -> AsyncConnectionPool:
+        """Process-wide async pool (opened by open_pool() in the app lifespan)"""
+        if AsyncDatabase._pool is None:
+            AsyncDatabase._pool = AsyncConnectionPool(
+                conninfo="",
+                kwargs={**_connect_kwargs(), "row_factory": dict_row},
+                min_size=settings.ASYNC_DB_POOL_MIN_SIZE,
+                max_size=settings.ASYNC_DB_POOL_MAX_SIZE,
+                max_lifetime=settings.DB_POOL_MAX_LIFETIME_SECONDS,
+                timeout=settings.DB_POOL_TIMEOUT_SECONDS,
+                configure=configure_connection,
+                open=False
+            )
+        return AsyncDatabase._pool
+
+    @staticmethod
+    async def open_pool():
+        """Open the pool and wait until min_size connections are ready"""
+        pool = AsyncDatabase.get_pool()
+        await pool.open(wait=True)
+
+    @staticmethod
+    async def close_pool():
+        """Close the pool (application shutdown)"""
+        if AsyncDatabase._pool is not None:
+            await AsyncDatabase._pool.close()
+            AsyncDatabase._pool = None
+
+    @staticmethod
+    def get_pool_stats() -> dict:
+        """Async pool utilization and wait-time counters"""
+        if AsyncDatabase._pool is None:
+            return {}
+        return AsyncDatabase._pool.get_stats()
+
+    @staticmethod
+    @asynccontextmanager
+    async def get_db():
+        """
+        Async context manager for database connections
+        Commits on success, rolls back on error and returns the connection
+        to the pool
+
+        Usage:
+            async with AsyncDatabase.get_db() as conn:
+                await conn.execute("SELECT * FROM table")
+        """
+        async with AsyncDatabase.get_pool().connection() as conn:
+            yield conn
+
+    @staticmethod
+    @asynccontextmanager
+    async def get_cursor():
+        """
+        Async context manager for a dict-row cursor
+
+        Usage:
+            async with AsyncDatabase.get_cursor() as cursor:
+                await cursor.execute("SELECT * FROM table")
+                results = await cursor.fetchall()
+        """
+        async with AsyncDatabase.get_pool().connection() as conn:
+            async with conn.cursor() as cursor:
+                yield cursor
+
+    @staticmethod
+    async def listen(
+        channel: str,
+        handler: Callable[[str], None],
+        on_connect: Optional[Callable[[], None]] = None,
+        retry_seconds: float = 5.0
+    ):
+        """
+        Deliver NOTIFY payloads on a channel until cancelled
+
+        Uses its own connection outside the pool (a listening connection
+        cannot be shared) and reconnects after errors. Notifications sent
+        while disconnected are lost, so `on_connect` runs after every
+        (re)connect to let callers resynchronise, e.g. by clearing a cache.
+
+        Args:
+            channel: Channel name (a plain identifier)
+            handler: Called with each notification payload
+            on_connect: Called once LISTEN is active
+            retry_seconds: Delay before reconnecting after an error
+
+        Usage:
+            task = asyncio.create_task(AsyncDatabase.listen("channel", print))
+        """
+        while True:
+            try:
+                conn = await AsyncConnection.connect(**_connect_kwargs(), autocommit=True)
+                async with conn:
+                    await conn.execute(f"LISTEN {channel}")
+                    if on_connect is not None:
+                        on_connect()
+                    async for notify in conn.notifies():
+                        handler(notify.payload)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"⚠️ LISTEN {channel} failed ({e}), reconnecting in {retry_seconds:.0f}s")
+                await asyncio.sleep(retry_seconds)
@@ -0,0 +1,130 @@
+"""
+In-process Caches
+Thread-safe bounded LRU with per-entry expiry and hit/miss counters
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional
+
+
+class TTLCache:
+    """
+    Bounded LRU whose entries expire after `ttl_seconds` (or at an explicit
+    per-entry deadline)
+
+    Expired entries are dropped when they are looked up; when the cache is
+    full the least recently used entry is evicted. Safe to share between
+    threads and the event loop: every operation is a short critical section.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 10000,
+        ttl_seconds: Optional[float] = 60.0,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        Args:
+            max_entries: Maximum entries held
+            ttl_seconds: Default lifetime of an entry (None = until evicted)
+            clock: Time source for deadlines; pass time.time to store
+                absolute expiry times such as a JWT `exp`
+        """
+        self.max_entries = max(1, max_entries)
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()   # key -> (value, expires_at)
+
+        self.hits = 0
+        self.misses = 0
+        self.expirations = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Look up a live entry
+
+        Args:
+            key: Cache key
+            default: Returned on a miss
+
+        Returns:
+            Cached value, or default when absent or expired
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, expires_at = entry
+                if expires_at is None or expires_at > self._clock():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._entries[key]
+                self.expirations += 1
+            self.misses += 1
+            return default
+
+    def put(self, key: Hashable, value: Any, expires_at: Optional[float] = None):
+        """
+        Store an entry
+
+        Args:
+            key: Cache key
+            value: Value to cache
+            expires_at: Deadline on this cache's clock; defaults to now + ttl_seconds
+        """
+        if expires_at is None and self.ttl_seconds is not None:
+            expires_at = self._clock() + self.ttl_seconds
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, key: Hashable) -> bool:
+        """
+        Drop one entry
+
+        Returns:
+            True if the key was cached
+        """
+        with self._lock:
+            removed = self._entries.pop(key, None) is not None
+            if removed:
+                self.invalidations += 1
+            return removed
+
+    def clear(self):
+        """Drop every entry"""
+        with self._lock:
+            self.invalidations += len(self._entries)
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get_stats(self) -> dict:
+        """
+        Report size and hit rate
+
+        Returns:
+            Dictionary of cache metrics
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "expirations": self.expirations,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations
+            }
@@ -19,10 +19,96 @@ class Settings:
     DB_PASSWORD: str = os.getenv("DB_PASSWORD", "postgres")
     DB_PORT: str = os.getenv("DB_PORT", "5432")
     
+    # Connection Pool (per API worker process)
+    DB_POOL_MIN_SIZE: int = int(os.getenv("DB_POOL_MIN_SIZE", "2"))
+    DB_POOL_MAX_SIZE: int = int(os.getenv("DB_POOL_MAX_SIZE", "20"))
+    DB_POOL_MAX_LIFETIME_SECONDS: float = float(os.getenv("DB_POOL_MAX_LIFETIME_SECONDS", "1800"))
+    DB_POOL_TIMEOUT_SECONDS: float = float(os.getenv("DB_POOL_TIMEOUT_SECONDS", "10"))
+    DB_POOL_CHECK_IDLE_SECONDS: float = float(os.getenv("DB_POOL_CHECK_IDLE_SECONDS", "30"))  # ping before reuse after this idle time
+    # Async pool used by the route handlers (the sync pool serves scripts and background workers)
+    ASYNC_DB_POOL_MIN_SIZE: int = int(os.getenv("ASYNC_DB_POOL_MIN_SIZE", "4"))
+    ASYNC_DB_POOL_MAX_SIZE: int = int(os.getenv("ASYNC_DB_POOL_MAX_SIZE", "20"))
+    
+    # Offload Executors (blocking calls from request handlers; full queues return 503)
+    EXECUTOR_CRYPTO_WORKERS: int = int(os.getenv("EXECUTOR_CRYPTO_WORKERS", "4"))
+    EXECUTOR_CRYPTO_QUEUE_SIZE: int = int(os.getenv("EXECUTOR_CRYPTO_QUEUE_SIZE", "64"))
+    EXECUTOR_INFERENCE_WORKERS: int = int(os.getenv("EXECUTOR_INFERENCE_WORKERS", "2"))
+    EXECUTOR_INFERENCE_QUEUE_SIZE: int = int(os.getenv("EXECUTOR_INFERENCE_QUEUE_SIZE", "256"))
+    EXECUTOR_DB_WORKERS: int = int(os.getenv("EXECUTOR_DB_WORKERS", "4"))
+    EXECUTOR_DB_QUEUE_SIZE: int = int(os.getenv("EXECUTOR_DB_QUEUE_SIZE", "32"))
+    EXECUTOR_BULK_WORKERS: int = int(os.getenv("EXECUTOR_BULK_WORKERS", "1"))  # concurrent bulk imports
+    EXECUTOR_BULK_QUEUE_SIZE: int = int(os.getenv("EXECUTOR_BULK_QUEUE_SIZE", "0"))
+    EXECUTOR_VECTOR_WORKERS: int = int(os.getenv("EXECUTOR_VECTOR_WORKERS", "2"))  # in-process vector index searches
+    EXECUTOR_VECTOR_QUEUE_SIZE: int = int(os.getenv("EXECUTOR_VECTOR_QUEUE_SIZE", "64"))
+    EXECUTOR_RETRY_AFTER_SECONDS: int = int(os.getenv("EXECUTOR_RETRY_AFTER_SECONDS", "1"))
+    # Bulk user import: bcrypt processes per import (0 = one per CPU core)
+    IMPORT_HASH_WORKERS: int = int(os.getenv("IMPORT_HASH_WORKERS", "0"))
+    
     # JWT Configuration
     SECRET_KEY: str = os.getenv("SECRET_KEY", "your-secret-key-change-in-production")
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 1440  # 24 hours
+    # Verified JWT payloads cached until their exp (0 disables)
+    TOKEN_CACHE_SIZE: int = int(os.getenv("TOKEN_CACHE_SIZE", "10000"))
+    # Verified user ids cached by get_current_user (0 TTL = always query)
+    USER_CACHE_TTL_SECONDS: float = float(os.getenv("USER_CACHE_TTL_SECONDS", "60"))
+    USER_CACHE_SIZE: int = int(os.getenv("USER_CACHE_SIZE", "10000"))
+    
+    # Embedding Configuration
+    EMBEDDING_MODEL_NAME: str = os.getenv("EMBEDDING_MODEL_NAME", "all-MiniLM-L6-v2")
+    EMBEDDING_ENGINE: str = os.getenv("EMBEDDING_ENGINE", "torch")  # torch | onnx
+    # Stored with every vector; search only compares vectors of the active version
+    EMBEDDING_VERSION: str = os.getenv("EMBEDDING_VERSION", EMBEDDING_MODEL_NAME)
+    EMBEDDING_ONNX_DIR: str = os.getenv("EMBEDDING_ONNX_DIR", "models/all-MiniLM-L6-v2-onnx-int8")
+    EMBEDDING_BATCHING_ENABLED: bool = os.getenv("EMBEDDING_BATCHING_ENABLED", "true").lower() == "true"
+    EMBEDDING_BATCH_MAX_SIZE: int = int(os.getenv("EMBEDDING_BATCH_MAX_SIZE", "32"))
+    EMBEDDING_BATCH_MAX_WAIT_MS: float = float(os.getenv("EMBEDDING_BATCH_MAX_WAIT_MS", "5"))
+    EMBEDDING_WORKERS: int = int(os.getenv("EMBEDDING_WORKERS", "0"))  # 0 = encode in the API process
+    EMBEDDING_WORKER_THREADS: int = int(os.getenv("EMBEDDING_WORKER_THREADS", "1"))  # torch threads per worker
+    EMBEDDING_CACHE_SIZE: int = int(os.getenv("EMBEDDING_CACHE_SIZE", "10000"))  # 0 disables the cache
+    EMBEDDING_CACHE_PATH: str = os.getenv("EMBEDDING_CACHE_PATH", "")  # SQLite file for the persistent tier
+    
+    # Embedding Queue (outbox consumed by background workers)
+    EMBEDDING_QUEUE_WORKERS: int = int(os.getenv("EMBEDDING_QUEUE_WORKERS", "1"))  # 0 = do not consume in this process
+    EMBEDDING_QUEUE_BATCH_SIZE: int = int(os.getenv("EMBEDDING_QUEUE_BATCH_SIZE", "64"))
+    EMBEDDING_QUEUE_MAX_ATTEMPTS: int = int(os.getenv("EMBEDDING_QUEUE_MAX_ATTEMPTS", "5"))
+    EMBEDDING_QUEUE_POLL_SECONDS: float = float(os.getenv("EMBEDDING_QUEUE_POLL_SECONDS", "1.0"))
+    
+    # Materialized similar complaints (complaint_neighbors)
+    COMPLAINT_NEIGHBORS_K: int = int(os.getenv("COMPLAINT_NEIGHBORS_K", "5"))
+    COMPLAINT_NEIGHBORS_CANDIDATES: int = int(os.getenv("COMPLAINT_NEIGHBORS_CANDIDATES", "50"))
+    
+    # Complaint partitions (monthly on date) and archival (archive_complaints.py)
+    COMPLAINTS_RETENTION_MONTHS: int = int(os.getenv("COMPLAINTS_RETENTION_MONTHS", "24"))  # months kept attached
+    COMPLAINTS_PARTITION_PREMAKE_MONTHS: int = int(os.getenv("COMPLAINTS_PARTITION_PREMAKE_MONTHS", "3"))
+    COMPLAINTS_ARCHIVE_SCHEMA: str = os.getenv("COMPLAINTS_ARCHIVE_SCHEMA", "archive")
+    
+    # Complaint search (vector | text | hybrid)
+    SEARCH_DEFAULT_MODE: str = os.getenv("SEARCH_DEFAULT_MODE", "vector")
+    SEARCH_HYBRID_CANDIDATES: int = int(os.getenv("SEARCH_HYBRID_CANDIDATES", "50"))  # per search, before fusion
+    SEARCH_RRF_K: int = int(os.getenv("SEARCH_RRF_K", "60"))
+    SEARCH_RECENT_MONTHS: int = int(os.getenv("SEARCH_RECENT_MONTHS", "12"))  # default window; 0 = full history
+    TEXT_SEARCH_CONFIG: str = os.getenv("TEXT_SEARCH_CONFIG", "english")  # Postgres text search configuration
+    SEARCH_CACHE_SIZE: int = int(os.getenv("SEARCH_CACHE_SIZE", "5000"))  # cached responses; 0 disables
+    SEARCH_CACHE_TTL_SECONDS: float = float(os.getenv("SEARCH_CACHE_TTL_SECONDS", "30"))
+    
+    # Vector Storage Layout (change with migrate_vector_storage.py)
+    VECTOR_STORAGE: str = os.getenv("VECTOR_STORAGE", "vector")  # vector (float32) | halfvec (float16)
+    VECTOR_BINARY_PREFILTER: bool = os.getenv("VECTOR_BINARY_PREFILTER", "false").lower() == "true"
+    VECTOR_RERANK_FACTOR: int = int(os.getenv("VECTOR_RERANK_FACTOR", "4"))  # candidates per result when prefiltering
+    
+    # Ward-filtered vector search (strategy chosen per ward size)
+    VECTOR_WARD_EXACT_MAX_ROWS: int = int(os.getenv("VECTOR_WARD_EXACT_MAX_ROWS", "2000"))
+    VECTOR_WARD_PARTIAL_INDEX_MIN_ROWS: int = int(os.getenv("VECTOR_WARD_PARTIAL_INDEX_MIN_ROWS", "50000"))
+    VECTOR_EF_SEARCH_MAX: int = int(os.getenv("VECTOR_EF_SEARCH_MAX", "1000"))
+    VECTOR_WARD_STATS_TTL_SECONDS: float = float(os.getenv("VECTOR_WARD_STATS_TTL_SECONDS", "300"))
+    
+    # In-process vector index (searches fall back to Postgres while it loads)
+    VECTOR_INDEX_ENABLED: bool = os.getenv("VECTOR_INDEX_ENABLED", "false").lower() == "true"
+    VECTOR_INDEX_TABLES: list = os.getenv("VECTOR_INDEX_TABLES", "complaints,announcements").split(",")
+    VECTOR_INDEX_BACKEND: str = os.getenv("VECTOR_INDEX_BACKEND", "auto")  # auto | numpy | hnswlib
+    VECTOR_INDEX_HNSW_MIN_ROWS: int = int(os.getenv("VECTOR_INDEX_HNSW_MIN_ROWS", "20000"))  # per ward shard
+    VECTOR_INDEX_HNSW_EF_SEARCH: int = int(os.getenv("VECTOR_INDEX_HNSW_EF_SEARCH", "100"))
     
     # API Configuration
     API_HOST: str = os.getenv("API_HOST", "0.0.0.0")
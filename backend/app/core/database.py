@@ -3,19 +3,30 @@ Database Connection Management
 Handles PostgreSQL connections with connection pooling
 """
 
+import threading
 import psycopg2
 from psycopg2.extras import RealDictCursor
 from contextlib import contextmanager
 from .config import settings
+from .pool import ConnectionPool
+from .vector import register_vector
 
 class Database:
     """Database connection manager"""
     
+    _pool = None
+    _pool_lock = threading.Lock()
+    
     @staticmethod
     def get_connection():
         """
-        Create and return a database connection
+        Create and return a new, unpooled database connection
         Returns connection with RealDictCursor for dict-like row access
+        NumPy arrays are adapted to pgvector and vector columns load as NumPy arrays
+        
+        Request handlers should use get_db() / get_cursor(), which borrow
+        from the pool. Use this for long-lived work such as scripts and
+        server-side cursors; the caller must close the connection.
         """
         conn = psycopg2.connect(
             host=settings.DB_HOST,
@@ -25,21 +36,50 @@ class Database:
             port=settings.DB_PORT,
             cursor_factory=RealDictCursor
         )
+        register_vector(conn)
         return conn
     
+    @staticmethod
+    def get_pool() -> ConnectionPool:
+        """Process-wide connection pool, created on first use"""
+        if Database._pool is None:
+            with Database._pool_lock:
+                if Database._pool is None:
+                    Database._pool = ConnectionPool(
+                        Database.get_connection,
+                        min_size=settings.DB_POOL_MIN_SIZE,
+                        max_size=settings.DB_POOL_MAX_SIZE,
+                        max_lifetime=settings.DB_POOL_MAX_LIFETIME_SECONDS,
+                        timeout=settings.DB_POOL_TIMEOUT_SECONDS,
+                        check_idle_seconds=settings.DB_POOL_CHECK_IDLE_SECONDS
+                    )
+        return Database._pool
+    
+    @staticmethod
+    def close_pool():
+        """Close idle pooled connections (application shutdown)"""
+        if Database._pool is not None:
+            Database._pool.close()
+    
+    @staticmethod
+    def get_pool_stats() -> dict:
+        """Connection pool utilization and wait-time metrics"""
+        return Database.get_pool().get_stats()
+    
     @staticmethod
     @contextmanager
     def get_db():
         """
         Context manager for database connections
-        Automatically handles connection closing
+        Borrows a pooled connection and returns it when done
         
         Usage:
             with Database.get_db() as conn:
                 cursor = conn.cursor()
                 cursor.execute("SELECT * FROM table")
         """
-        conn = Database.get_connection()
+        pool = Database.get_pool()
+        conn = pool.getconn()
         try:
             yield conn
             conn.commit()
@@ -47,21 +87,22 @@ class Database:
             conn.rollback()
             raise e
         finally:
-            conn.close()
+            pool.putconn(conn)
     
     @staticmethod
     @contextmanager
     def get_cursor():
         """
         Context manager for database cursor
-        Automatically handles connection and cursor closing
+        Borrows a pooled connection and returns it (and closes the cursor) when done
         
         Usage:
             with Database.get_cursor() as cursor:
                 cursor.execute("SELECT * FROM table")
                 results = cursor.fetchall()
         """
-        conn = Database.get_connection()
+        pool = Database.get_pool()
+        conn = pool.getconn()
         cursor = conn.cursor()
         try:
             yield cursor
@@ -71,7 +112,7 @@ class Database:
             raise e
         finally:
             cursor.close()
-            conn.close()
+            pool.putconn(conn)
 
 # Create database instance
 db = Database()
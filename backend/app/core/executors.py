@@ -0,0 +1,287 @@
+"""
+Offload Executors
+Named, size-limited thread/process executors for blocking work called from
+async route handlers, with admission control and queue metrics
+"""
+
+import asyncio
+import functools
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import asynccontextmanager
+
+from fastapi import HTTPException, status
+
+from .config import settings
+from ..utils.stats import percentile
+
+EXECUTOR_KINDS = ("thread", "process")
+
+
+class ExecutorSaturatedError(HTTPException):
+    """An executor's queue is full; the request is rejected with 503"""
+
+    def __init__(self, name: str, retry_after: int):
+        super().__init__(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=f"Server busy ({name} queue full), retry shortly",
+            headers={"Retry-After": str(retry_after)}
+        )
+        self.executor_name = name
+
+
+def _timed_call(fn, args, kwargs):
+    """
+    Run fn in the worker and report when it started
+    Module-level so process executors can pickle it; time.monotonic is
+    system-wide, so start times compare across processes
+    """
+    started = time.monotonic()
+    return started, fn(*args, **kwargs)
+
+
+class BoundedExecutor:
+    """
+    Worker pool with a bounded queue
+
+    At most `workers` calls run at once and at most `queue_size` more wait
+    for a worker. A call arriving when both are full is rejected straight
+    away with ExecutorSaturatedError (503 + Retry-After), so overload shows
+    up as fast failures instead of ever-growing latency.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        workers: int,
+        queue_size: int,
+        kind: str = "thread",
+        retry_after: int = 1,
+        stats_window: int = 1000
+    ):
+        """
+        Args:
+            name: Executor name, used in thread names, errors and metrics
+            workers: Calls that run concurrently
+            queue_size: Calls allowed to wait for a worker
+            kind: "thread", or "process" for CPU-bound work holding the GIL
+            retry_after: Seconds suggested to rejected clients
+            stats_window: Number of recent calls kept for percentiles
+        """
+        if kind not in EXECUTOR_KINDS:
+            raise ValueError(f"Unknown executor kind: {kind} (expected one of {EXECUTOR_KINDS})")
+        self.name = name
+        self.workers = max(1, workers)
+        self.queue_size = max(0, queue_size)
+        self.kind = kind
+        self.retry_after = retry_after
+
+        self._executor = None
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._running = 0
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self._wait_times_ms = deque(maxlen=stats_window)
+        self._run_times_ms = deque(maxlen=stats_window)
+
+    @property
+    def capacity(self) -> int:
+        """Calls admitted at once (running + queued)"""
+        return self.workers + self.queue_size
+
+    def _get_executor(self):
+        """Create the underlying pool on first use"""
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    if self.kind == "process":
+                        self._executor = ProcessPoolExecutor(max_workers=self.workers)
+                    else:
+                        self._executor = ThreadPoolExecutor(
+                            max_workers=self.workers,
+                            thread_name_prefix=f"{self.name}-executor"
+                        )
+        return self._executor
+
+    def _acquire(self):
+        """Reserve a slot or reject the call"""
+        with self._lock:
+            if self._in_flight >= self.capacity:
+                self.rejected += 1
+                raise ExecutorSaturatedError(self.name, self.retry_after)
+            self._in_flight += 1
+            self.submitted += 1
+
+    def _release(self, failed: bool):
+        """Free a slot"""
+        with self._lock:
+            self._in_flight -= 1
+            if failed:
+                self.failed += 1
+            else:
+                self.completed += 1
+
+    async def run(self, fn, *args, **kwargs):
+        """
+        Run a blocking function in this executor
+
+        Args:
+            fn: Callable (picklable for process executors)
+            *args, **kwargs: Arguments for fn
+
+        Returns:
+            fn's return value
+
+        Raises:
+            ExecutorSaturatedError: Workers and queue are all taken
+        """
+        self._acquire()
+        queued = time.monotonic()
+        failed = True
+        try:
+            loop = asyncio.get_running_loop()
+            call = functools.partial(_timed_call, fn, args, kwargs)
+            started, result = await loop.run_in_executor(self._get_executor(), call)
+            finished = time.monotonic()
+            with self._lock:
+                self._wait_times_ms.append((started - queued) * 1000.0)
+                self._run_times_ms.append((finished - started) * 1000.0)
+            failed = False
+            return result
+        finally:
+            self._release(failed)
+
+    @asynccontextmanager
+    async def admit(self):
+        """
+        Count work dispatched elsewhere (e.g. the embedding batcher) against
+        this executor's capacity, without occupying one of its workers
+
+        Usage:
+            async with executors["inference"].admit():
+                vector = await asyncio.wrap_future(batcher.submit(text))
+
+        Raises:
+            ExecutorSaturatedError: Capacity is all taken
+        """
+        self._acquire()
+        started = time.monotonic()
+        failed = True
+        try:
+            with self._lock:
+                self._running += 1
+            yield
+            failed = False
+        finally:
+            with self._lock:
+                self._running -= 1
+                self._run_times_ms.append((time.monotonic() - started) * 1000.0)
+            self._release(failed)
+
+    def get_stats(self) -> dict:
+        """
+        Report queue depth, rejections and wait/run-time percentiles
+
+        Returns:
+            Dictionary of executor metrics (times in milliseconds)
+        """
+        with self._lock:
+            waits = sorted(self._wait_times_ms)
+            runs = sorted(self._run_times_ms)
+            # Calls dispatched with run() beyond the worker count are queued
+            queued = max(0, self._in_flight - self._running - self.workers)
+            return {
+                "kind": self.kind,
+                "workers": self.workers,
+                "queue_size": self.queue_size,
+                "in_flight": self._in_flight,
+                "queue_depth": queued,
+                "submitted": self.submitted,
+                "completed": self.completed,
+                "failed": self.failed,
+                "rejected": self.rejected,
+                "wait_ms_p50": percentile(waits, 50),
+                "wait_ms_p95": percentile(waits, 95),
+                "wait_ms_max": waits[-1] if waits else 0.0,
+                "run_ms_p50": percentile(runs, 50),
+                "run_ms_p95": percentile(runs, 95)
+            }
+
+    def shutdown(self):
+        """Stop the worker pool (application shutdown)"""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+class ExecutorRegistry:
+    """Named executors shared by the services of one API worker process"""
+
+    def __init__(self):
+        self._executors = {}
+
+    def register(self, executor: BoundedExecutor) -> BoundedExecutor:
+        """Add an executor under its name"""
+        self._executors[executor.name] = executor
+        return executor
+
+    def __getitem__(self, name: str) -> BoundedExecutor:
+        return self._executors[name]
+
+    async def run(self, name: str, fn, *args, **kwargs):
+        """Run a blocking function in the named executor"""
+        return await self._executors[name].run(fn, *args, **kwargs)
+
+    def get_stats(self) -> dict:
+        """Metrics for every executor, keyed by name"""
+        return {name: executor.get_stats() for name, executor in self._executors.items()}
+
+    def shutdown(self):
+        """Stop every executor"""
+        for executor in self._executors.values():
+            executor.shutdown()
+
+
+# Create global executors
+executors = ExecutorRegistry()
+# bcrypt releases the GIL, so threads give real parallelism
+executors.register(BoundedExecutor(
+    "crypto",
+    workers=settings.EXECUTOR_CRYPTO_WORKERS,
+    queue_size=settings.EXECUTOR_CRYPTO_QUEUE_SIZE,
+    retry_after=settings.EXECUTOR_RETRY_AFTER_SECONDS
+))
+# Model calls; with batching enabled this only bounds requests waiting on the batcher
+executors.register(BoundedExecutor(
+    "inference",
+    workers=settings.EXECUTOR_INFERENCE_WORKERS,
+    queue_size=settings.EXECUTOR_INFERENCE_QUEUE_SIZE,
+    retry_after=settings.EXECUTOR_RETRY_AFTER_SECONDS
+))
+# Remaining psycopg2 calls made from request handlers
+executors.register(BoundedExecutor(
+    "db",
+    workers=settings.EXECUTOR_DB_WORKERS,
+    queue_size=settings.EXECUTOR_DB_QUEUE_SIZE,
+    retry_after=settings.EXECUTOR_RETRY_AFTER_SECONDS
+))
+# Long-running admin jobs such as CSV imports (they start their own process pools)
+executors.register(BoundedExecutor(
+    "bulk",
+    workers=settings.EXECUTOR_BULK_WORKERS,
+    queue_size=settings.EXECUTOR_BULK_QUEUE_SIZE,
+    retry_after=settings.EXECUTOR_RETRY_AFTER_SECONDS
+))
+# In-process vector index scans (NumPy and hnswlib release the GIL)
+executors.register(BoundedExecutor(
+    "vector",
+    workers=settings.EXECUTOR_VECTOR_WORKERS,
+    queue_size=settings.EXECUTOR_VECTOR_QUEUE_SIZE,
+    retry_after=settings.EXECUTOR_RETRY_AFTER_SECONDS
+))
@@ -0,0 +1,262 @@
+"""
+Connection Pool
+Thread-safe PostgreSQL connection pool with health checks, connection
+lifetime limits and wait-time metrics
+"""
+
+import threading
+import time
+from collections import deque
+from typing import Callable
+
+import psycopg2
+from psycopg2 import extensions
+from psycopg2.pool import PoolError
+
+from ..utils.stats import percentile
+
+
+class PoolTimeoutError(PoolError):
+    """No connection became available within the checkout timeout"""
+
+
+class ConnectionPool:
+    """
+    Bounded pool of psycopg2 connections
+
+    Checkout hands out the most recently returned idle connection, so a
+    small working set stays warm and surplus connections age out. A
+    connection idle for longer than `check_idle_seconds` is pinged before it
+    is handed out; broken connections, connections past `max_lifetime` and
+    connections returned mid-transaction are closed instead of reused. When
+    all `max_size` connections are in use, callers wait up to `timeout`.
+    """
+
+    def __init__(
+        self,
+        connect: Callable,
+        min_size: int = 2,
+        max_size: int = 20,
+        max_lifetime: float = 1800.0,
+        timeout: float = 10.0,
+        check_idle_seconds: float = 30.0
+    ):
+        """
+        Args:
+            connect: Zero-argument function opening a new connection
+            min_size: Connections opened up front
+            max_size: Maximum connections open at once
+            max_lifetime: Seconds after which a connection is closed on return
+            timeout: Seconds a checkout waits for a free connection
+            check_idle_seconds: Ping connections idle at least this long (0 = always)
+        """
+        self._connect = connect
+        self.min_size = min(min_size, max_size)
+        self.max_size = max_size
+        self.max_lifetime = max_lifetime
+        self.timeout = timeout
+        self.check_idle_seconds = check_idle_seconds
+
+        self._cond = threading.Condition()
+        self._idle = deque()        # (conn, created_at, returned_at)
+        self._created_at = {}       # id(conn) -> creation time, for checked-out connections
+        self._size = 0
+        self._waiting = 0
+        self._opened = False
+
+        self.checkouts = 0
+        self.timeouts = 0
+        self.connections_opened = 0
+        self.connections_closed = 0
+        self.failed_checks = 0
+        self._wait_times_ms = deque(maxlen=1000)
+
+    def open(self):
+        """Open min_size connections (done lazily on first checkout otherwise)"""
+        with self._cond:
+            if self._opened:
+                return
+            self._opened = True
+        while True:
+            with self._cond:
+                if self._size >= self.min_size:
+                    return
+                self._size += 1
+            try:
+                conn = self._new_connection()
+            except Exception:
+                with self._cond:
+                    self._size -= 1
+                    self._cond.notify()
+                raise
+            self.putconn(conn)
+
+    def getconn(self, timeout: float = None):
+        """
+        Check out a healthy connection
+
+        Args:
+            timeout: Seconds to wait when the pool is exhausted (defaults to the pool's)
+
+        Returns:
+            Open psycopg2 connection with no transaction in progress
+
+        Raises:
+            PoolTimeoutError: No connection was free within the timeout
+        """
+        if not self._opened:
+            self.open()
+        timeout = self.timeout if timeout is None else timeout
+        started = time.perf_counter()
+        deadline = started + timeout
+
+        while True:
+            with self._cond:
+                entry = None
+                while entry is None:
+                    if self._idle:
+                        entry = self._idle.pop()
+                    elif self._size < self.max_size:
+                        # Reserve a slot, then connect outside the lock
+                        self._size += 1
+                        break
+                    else:
+                        remaining = deadline - time.perf_counter()
+                        if remaining <= 0:
+                            self.timeouts += 1
+                            raise PoolTimeoutError(
+                                f"No database connection available within {timeout:.1f}s "
+                                f"({self.max_size} in use)"
+                            )
+                        self._waiting += 1
+                        try:
+                            self._cond.wait(remaining)
+                        finally:
+                            self._waiting -= 1
+
+            if entry is None:
+                try:
+                    conn = self._new_connection()
+                except Exception:
+                    with self._cond:
+                        self._size -= 1
+                        self._cond.notify()
+                    raise
+                created_at = time.monotonic()
+            else:
+                conn, created_at, returned_at = entry
+                if not self._is_usable(conn, created_at, returned_at):
+                    self._discard(conn)
+                    continue
+
+            with self._cond:
+                self._created_at[id(conn)] = created_at
+                self.checkouts += 1
+                self._wait_times_ms.append((time.perf_counter() - started) * 1000.0)
+            return conn
+
+    def putconn(self, conn, discard: bool = False):
+        """
+        Return a connection to the pool
+
+        Args:
+            conn: Connection obtained from getconn()
+            discard: Close it instead of reusing it
+        """
+        with self._cond:
+            created_at = self._created_at.pop(id(conn), None)
+        if created_at is None:
+            created_at = time.monotonic()
+
+        if not discard and not conn.closed:
+            # Never hand the next caller an open transaction
+            status = conn.get_transaction_status()
+            if status == extensions.TRANSACTION_STATUS_INTRANS:
+                try:
+                    conn.rollback()
+                except psycopg2.Error:
+                    discard = True
+            elif status != extensions.TRANSACTION_STATUS_IDLE:
+                discard = True
+
+        expired = time.monotonic() - created_at > self.max_lifetime
+        if discard or conn.closed or expired:
+            self._discard(conn)
+            return
+
+        with self._cond:
+            self._idle.append((conn, created_at, time.monotonic()))
+            self._cond.notify()
+
+    def close(self):
+        """Close idle connections (application shutdown)"""
+        with self._cond:
+            idle = list(self._idle)
+            self._idle.clear()
+            self._opened = False
+        for conn, _, _ in idle:
+            self._discard(conn)
+
+    def get_stats(self) -> dict:
+        """
+        Report pool utilization and checkout wait times
+
+        Returns:
+            Dictionary with size, idle/in-use counts, waiters, checkout
+            counters and wait-time percentiles in milliseconds
+        """
+        with self._cond:
+            waits = sorted(self._wait_times_ms)
+            in_use = self._size - len(self._idle)
+            return {
+                "size": self._size,
+                "min_size": self.min_size,
+                "max_size": self.max_size,
+                "idle": len(self._idle),
+                "in_use": in_use,
+                "utilization": in_use / self.max_size if self.max_size else 0.0,
+                "waiting": self._waiting,
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "connections_opened": self.connections_opened,
+                "connections_closed": self.connections_closed,
+                "failed_health_checks": self.failed_checks,
+                "wait_ms_p50": percentile(waits, 50),
+                "wait_ms_p95": percentile(waits, 95),
+                "wait_ms_max": waits[-1] if waits else 0.0
+            }
+
+    def _new_connection(self):
+        """Open a connection (pool slot already reserved)"""
+        conn = self._connect()
+        with self._cond:
+            self.connections_opened += 1
+        return conn
+
+    def _is_usable(self, conn, created_at: float, returned_at: float) -> bool:
+        """Health check for an idle connection about to be handed out"""
+        now = time.monotonic()
+        if conn.closed or now - created_at > self.max_lifetime:
+            return False
+        if now - returned_at < self.check_idle_seconds:
+            return True
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute("SELECT 1")
+            conn.rollback()
+            return True
+        except psycopg2.Error:
+            with self._cond:
+                self.failed_checks += 1
+            return False
+
+    def _discard(self, conn):
+        """Close a connection and free its slot"""
+        try:
+            conn.close()
+        except psycopg2.Error:
+            pass
+        with self._cond:
+            self._size -= 1
+            self.connections_closed += 1
+            self._cond.notify()
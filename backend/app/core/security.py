@@ -3,13 +3,16 @@ Security and Authentication
 Handles JWT tokens, password hashing, and authentication
 """
 
+import hashlib
+import time
 import jwt
 from datetime import datetime, timedelta
 from passlib.context import CryptContext
 from fastapi import HTTPException, Depends, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from .config import settings
-from .database import Database
+from .async_database import AsyncDatabase
+from .cache import TTLCache
 
 # Password hashing context
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
@@ -17,6 +20,35 @@ pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 # HTTP Bearer security scheme
 security = HTTPBearer()
 
+# Verified token payloads keyed by SHA-256 of the token, each dropped at the token's exp
+verified_tokens = TTLCache(
+    max_entries=settings.TOKEN_CACHE_SIZE,
+    ttl_seconds=None,
+    clock=time.time
+) if settings.TOKEN_CACHE_SIZE > 0 else None
+
+# Ids of users recently confirmed to exist, so get_current_user skips the lookup
+verified_users = TTLCache(
+    max_entries=settings.USER_CACHE_SIZE,
+    ttl_seconds=settings.USER_CACHE_TTL_SECONDS
+)
+
+# Deleting a citizen (from any worker, script or psql) notifies every API worker
+USER_DELETED_CHANNEL = "citizen_deleted"
+USER_DELETED_TRIGGER_SQL = f"""
+    CREATE OR REPLACE FUNCTION notify_citizen_deleted() RETURNS trigger AS $$
+    BEGIN
+        PERFORM pg_notify('{USER_DELETED_CHANNEL}', OLD.id::text);
+        RETURN OLD;
+    END;
+    $$ LANGUAGE plpgsql;
+
+    DROP TRIGGER IF EXISTS citizens_notify_deleted ON citizens;
+    CREATE TRIGGER citizens_notify_deleted
+        AFTER DELETE ON citizens
+        FOR EACH ROW EXECUTE FUNCTION notify_citizen_deleted();
+"""
+
 class SecurityService:
     """Handle authentication and security operations"""
     
@@ -51,6 +83,8 @@ class SecurityService:
     def decode_token(token: str) -> dict:
         """
         Decode and validate JWT token
+        Tokens verified before are served from the token cache until their
+        exp, skipping the signature check
         
         Args:
             token: JWT token string
@@ -61,22 +95,33 @@ class SecurityService:
         Raises:
             HTTPException: If token is invalid or expired
         """
+        digest = hashlib.sha256(token.encode()).digest() if verified_tokens is not None else None
+        if digest is not None:
+            cached = verified_tokens.get(digest)
+            if cached is not None:
+                return dict(cached)
+        
         try:
             payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-            return payload
         except jwt.ExpiredSignatureError:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Token expired"
             )
-        except jwt.JWTError:
+        except jwt.InvalidTokenError:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Invalid token"
             )
+        
+        # Only tokens that expire are cached, and only until they do
+        exp = payload.get('exp')
+        if digest is not None and isinstance(exp, (int, float)):
+            verified_tokens.put(digest, dict(payload), expires_at=float(exp))
+        return payload
     
     @staticmethod
-    def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)) -> dict:
+    async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)) -> dict:
         """
         Dependency to get current authenticated user
         
@@ -89,18 +134,47 @@ class SecurityService:
         token = credentials.credentials
         payload = SecurityService.decode_token(token)
         
-        # Verify user still exists in database
+        # Verify user still exists in database (cached for USER_CACHE_TTL_SECONDS;
+        # deletes evict the entry on every worker via invalidate_user)
         user_id = payload.get('user_id')
-        if user_id:
-            with Database.get_cursor() as cursor:
-                cursor.execute("SELECT id FROM citizens WHERE id = %s", (user_id,))
-                if not cursor.fetchone():
+        if user_id and verified_users.get(user_id) is None:
+            async with AsyncDatabase.get_cursor() as cursor:
+                await cursor.execute("SELECT id FROM citizens WHERE id = %s", (user_id,))
+                if not await cursor.fetchone():
                     raise HTTPException(
                         status_code=status.HTTP_401_UNAUTHORIZED,
                         detail="User not found. Please log in again."
                     )
+            verified_users.put(user_id, True)
         
         return payload
+    
+    @staticmethod
+    def invalidate_user(user_id) -> None:
+        """
+        Forget a verified user id (called on delete and for NOTIFY payloads)
+        
+        Args:
+            user_id: Citizen id, as an int or the notification's text payload
+        """
+        try:
+            verified_users.invalidate(int(user_id))
+        except (TypeError, ValueError):
+            # Unparseable payload: drop everything rather than risk a stale entry
+            verified_users.clear()
+    
+    @staticmethod
+    async def listen_for_user_deletions():
+        """
+        Keep this worker's verified-user cache in sync with deletes made
+        elsewhere; runs until cancelled (started from the app lifespan)
+        """
+        await AsyncDatabase.listen(
+            USER_DELETED_CHANNEL,
+            SecurityService.invalidate_user,
+            # Deletes may have been missed while disconnected
+            on_connect=verified_users.clear
+        )
 
 # Create security service instance
 security_service = SecurityService()
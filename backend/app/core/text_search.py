@@ -0,0 +1,119 @@
+"""
+Full-text Search SQL
+Builds Postgres full-text candidate queries over a generated tsvector column,
+and the reciprocal rank fusion used to combine them with vector candidates
+"""
+
+from typing import List, Sequence, Tuple
+
+from .config import settings
+
+
+class TextSearch:
+    """
+    SQL builder for lexical search
+
+    Searched tables carry a stored generated `search_tsv` column with a GIN
+    index. Query terms are OR-ed, so a query such as "ward 112 transformer"
+    still finds rows that contain only some of its terms; ts_rank_cd puts
+    rows matching more (and closer) terms first.
+    """
+
+    def __init__(self, config: str = "english"):
+        """
+        Args:
+            config: Postgres text search configuration (stemming, stop words)
+        """
+        self.config = config
+
+    def column_definition(self, expression: str) -> str:
+        """Column definition of the generated `search_tsv` column, for CREATE/ALTER TABLE"""
+        return f"search_tsv tsvector GENERATED ALWAYS AS (to_tsvector('{self.config}', {expression})) STORED"
+
+    def column_statements(self, table: str, expression: str) -> List[str]:
+        """
+        DDL adding the generated tsvector column and its GIN index
+
+        Args:
+            table: Table to index
+            expression: Text expression over the table's columns
+
+        Returns:
+            List of SQL statements
+        """
+        return [
+            f"ALTER TABLE {table} ADD COLUMN IF NOT EXISTS {self.column_definition(expression)}",
+            f"CREATE INDEX IF NOT EXISTS idx_{table}_search_tsv ON {table} USING gin (search_tsv)"
+        ]
+
+    def matches(
+        self,
+        table: str,
+        query: str,
+        limit: int,
+        where: str = "TRUE",
+        params: Sequence = ()
+    ) -> Tuple[str, List]:
+        """
+        Build a subquery returning the `limit` best lexical matches for `query`
+
+        Args:
+            table: Table with a `search_tsv` column
+            query: User query text (any punctuation is safe)
+            limit: Rows to return
+            where: Filter applied before ranking, with %s placeholders
+            params: Parameters for `where`
+
+        Returns:
+            (sql, params) where sql is a parenthesised subquery selecting all
+            of the table's columns plus `text_rank` (higher is better). Alias
+            it in the FROM clause and ORDER BY its text_rank DESC.
+        """
+        # plainto_tsquery AND-s the terms; swap the operators to OR them
+        sql = f"""(
+            SELECT {table}.*, ts_rank_cd({table}.search_tsv, tsq.query) AS text_rank
+            FROM {table},
+                 LATERAL (
+                     SELECT replace(plainto_tsquery('{self.config}', %s)::text, '&', '|')::tsquery AS query
+                 ) AS tsq
+            WHERE {table}.search_tsv @@ tsq.query AND {where}
+            ORDER BY text_rank DESC, {table}.id
+            LIMIT %s
+        )"""
+        return sql, [query, *params, limit]
+
+
+def rrf_fusion(vector: Tuple[str, List], text: Tuple[str, List], k: int = 60) -> Tuple[str, List]:
+    """
+    Fuse two candidate subqueries with reciprocal rank fusion
+
+    Each candidate scores sum(1 / (k + rank)) over the lists it appears in,
+    so rows found by both searches rise to the top without having to
+    calibrate cosine distance against ts_rank.
+
+    Args:
+        vector: (sql, params) from VectorSearch.nearest()
+        text: (sql, params) from TextSearch.matches()
+        k: RRF constant; larger values flatten the gap between ranks
+
+    Returns:
+        (sql, params) where sql is a parenthesised subquery of (id,
+        vector_rank, text_rank, score). Order by score DESC.
+    """
+    vector_sql, vector_params = vector
+    text_sql, text_params = text
+    sql = f"""(
+        SELECT coalesce(v.id, t.id) AS id, v.rank AS vector_rank, t.rank AS text_rank,
+               coalesce(1.0 / (%s + v.rank), 0) + coalesce(1.0 / (%s + t.rank), 0) AS score
+        FROM (
+            SELECT id, row_number() OVER (ORDER BY distance) AS rank FROM {vector_sql} AS nearest
+        ) AS v
+        FULL OUTER JOIN (
+            SELECT id, row_number() OVER (ORDER BY text_rank DESC, id) AS rank FROM {text_sql} AS lexical
+        ) AS t ON t.id = v.id
+    )"""
+    return sql, [k, k, *vector_params, *text_params]
+
+
+# Create global text search instance
+text_search = TextSearch(config=settings.TEXT_SEARCH_CONFIG)
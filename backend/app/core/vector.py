@@ -0,0 +1,107 @@
+"""
+pgvector Type Adaptation
+Lets psycopg2 send NumPy arrays as pgvector values and read vector
+columns back as NumPy float32 arrays
+"""
+
+import threading
+
+import numpy as np
+from psycopg2.extensions import register_adapter, register_type, new_type
+
+# Set once the result typecaster is installed for this process
+_registered = False
+_register_lock = threading.Lock()
+
+
+def to_vector_literal(embedding) -> str:
+    """
+    Format an embedding as a pgvector text literal
+
+    Values are written as float32 with 9 significant digits, which is
+    enough to round-trip float32 exactly. The result is about a third
+    smaller and roughly three times faster to build than str() on the
+    float64 values of a Python list.
+
+    Args:
+        embedding: 1-D NumPy array or sequence of floats
+
+    Returns:
+        String such as "[0.0123,-0.0456,...]"
+    """
+    values = np.asarray(embedding, dtype=np.float32)
+    if values.ndim != 1:
+        raise ValueError(f"Expected a 1-D vector, got shape {values.shape}")
+    return "[" + ",".join(["%.9g" % value for value in values.tolist()]) + "]"
+
+
+def parse_vector(value, cursor=None):
+    """
+    psycopg2 typecaster: pgvector text output -> NumPy float32 array
+
+    Args:
+        value: Text representation from the server (or None)
+        cursor: Cursor performing the fetch (unused)
+
+    Returns:
+        1-D float32 array, or None for NULL
+    """
+    if value is None:
+        return None
+    body = value[1:-1]
+    if not body:
+        return np.zeros(0, dtype=np.float32)
+    return np.array(body.split(","), dtype=np.float32)
+
+
+class VectorAdapter:
+    """
+    psycopg2 adapter sending a NumPy array as a quoted pgvector literal
+    The literal only contains digits, signs, exponents, dots and commas,
+    so no escaping is needed
+    """
+
+    def __init__(self, embedding):
+        self.embedding = embedding
+
+    def getquoted(self) -> bytes:
+        return ("'" + to_vector_literal(self.embedding) + "'").encode("ascii")
+
+
+# psycopg2 looks adapters up by Python type only (there is no per-connection
+# adapter registry), and the literal VectorAdapter writes does not depend on
+# the connection, so the adapter is installed once here for every connection
+register_adapter(np.ndarray, VectorAdapter)
+
+
+def register_vector(conn):
+    """
+    Register the pgvector result typecaster for this process
+
+    The typecaster needs the pgvector type OIDs, which are looked up on the
+    first connection that has the extension and then registered globally,
+    so later connections pay nothing. The lookup is rolled back so the
+    connection is handed out without an open transaction.
+
+    Args:
+        conn: Open psycopg2 connection
+    """
+    global _registered
+    if _registered:
+        return
+
+    with _register_lock:
+        if _registered:
+            return
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute("SELECT typname, oid FROM pg_type WHERE typname IN ('vector', 'halfvec')")
+                rows = cursor.fetchall()
+        finally:
+            conn.rollback()
+        # Works with both tuple and RealDictCursor rows
+        oids = tuple(row['oid'] if isinstance(row, dict) else row[1] for row in rows)
+        # Before CREATE EXTENSION vector there is nothing to register yet; try again next time
+        if oids:
+            register_type(new_type(oids, "PGVECTOR", parse_vector))
+            _registered = True
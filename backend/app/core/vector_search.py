@@ -0,0 +1,210 @@
+"""
+Vector Search SQL
+Builds nearest-neighbour queries and index DDL for the configured embedding
+storage layout: float32 `vector`, float16 `halfvec`, and an optional
+binary-quantized HNSW pre-filter reranked at stored precision
+"""
+
+from typing import List, Sequence, Tuple
+
+from .config import settings
+
+STORAGE_TYPES = ("vector", "halfvec")
+
+# Cosine operator class per storage type
+COSINE_OPS = {
+    "vector": "vector_cosine_ops",
+    "halfvec": "halfvec_cosine_ops",
+}
+
+# halfvec and binary_quantize arrived in pgvector 0.7.0
+MIN_PGVECTOR_FOR_COMPACT = (0, 7, 0)
+
+
+class VectorSearch:
+    """
+    SQL builder for one storage layout
+
+    Callers get a FROM-clause subquery of the nearest rows with a `distance`
+    column (cosine distance), so the same search code works against either
+    layout. With the binary pre-filter, the HNSW index on the bit-quantized
+    vectors returns `rerank_factor * limit` candidates, which are then
+    reranked by exact cosine distance on the stored vectors.
+    """
+
+    def __init__(
+        self,
+        storage: str = "vector",
+        binary_prefilter: bool = False,
+        rerank_factor: int = 4,
+        dimension: int = 384
+    ):
+        """
+        Args:
+            storage: Column type, "vector" (float32) or "halfvec" (float16)
+            binary_prefilter: Search a binary_quantize HNSW index, then rerank
+            rerank_factor: Candidates fetched per requested row when prefiltering
+            dimension: Embedding dimension
+        """
+        if storage not in STORAGE_TYPES:
+            raise ValueError(f"Unknown vector storage: {storage} (expected one of {STORAGE_TYPES})")
+        self.storage = storage
+        self.binary_prefilter = binary_prefilter
+        self.rerank_factor = max(1, rerank_factor)
+        self.dimension = dimension
+
+    @property
+    def column_type(self) -> str:
+        """SQL type of the embedding column, e.g. halfvec(384)"""
+        return f"{self.storage}({self.dimension})"
+
+    @property
+    def requires_compact_support(self) -> bool:
+        """True when the layout needs pgvector >= 0.7 (halfvec / binary_quantize)"""
+        return self.storage != "vector" or self.binary_prefilter
+
+    def nearest(
+        self,
+        table: str,
+        embedding,
+        limit: int,
+        where: str = "TRUE",
+        params: Sequence = (),
+        query_sql: str = None,
+        exact: bool = False
+    ) -> Tuple[str, List]:
+        """
+        Build a subquery returning the `limit` rows nearest to `embedding`
+
+        Args:
+            table: Table with an `embedding` column
+            embedding: Query vector (NumPy array, adapted by app.core.vector)
+            limit: Rows to return
+            where: Filter applied before ranking, with %s placeholders
+            params: Parameters for `where`
+            query_sql: SQL expression to use as the query vector instead of
+                `embedding`, e.g. `src.embedding` inside a LATERAL join
+            exact: Rank every row matching `where` by exact distance instead
+                of using an HNSW index (cheaper for small filtered sets)
+
+        Returns:
+            (sql, params) where sql is a parenthesised subquery selecting all
+            of the table's columns plus `distance`, nearest first. Alias it
+            in the FROM clause and ORDER BY its distance.
+        """
+        query = query_sql or f"%s::{self.column_type}"
+        query_params = [] if query_sql else [embedding]
+
+        if exact:
+            # OFFSET 0 fences the subquery so the sort cannot become an index scan
+            sql = f"""(
+                SELECT * FROM (
+                    SELECT *, embedding <=> {query} AS distance
+                    FROM {table}
+                    WHERE {where}
+                    OFFSET 0
+                ) AS scanned
+                ORDER BY distance
+                LIMIT %s
+            )"""
+            return sql, [*query_params, *params, limit]
+
+        if not self.binary_prefilter:
+            sql = f"""(
+                SELECT *, embedding <=> {query} AS distance
+                FROM {table}
+                WHERE {where}
+                ORDER BY distance
+                LIMIT %s
+            )"""
+            return sql, [*query_params, *params, limit]
+
+        sql = f"""(
+            SELECT candidates.*, candidates.embedding <=> {query} AS distance
+            FROM (
+                SELECT * FROM {table}
+                WHERE {where}
+                ORDER BY binary_quantize(embedding)::bit({self.dimension})
+                    <~> binary_quantize({query})
+                LIMIT %s
+            ) AS candidates
+            ORDER BY distance
+            LIMIT %s
+        )"""
+        return sql, [*query_params, *params, *query_params, limit * self.rerank_factor, limit]
+
+    def index_statements(self, table: str, full_index: bool = True) -> List[str]:
+        """
+        CREATE INDEX statements for this layout
+
+        Args:
+            table: Table with an `embedding` column
+            full_index: Include the HNSW index on the stored vectors (only
+                needed without the binary pre-filter, or as a fallback)
+
+        Returns:
+            List of SQL statements
+        """
+        statements = []
+        if full_index:
+            statements.append(
+                f"CREATE INDEX IF NOT EXISTS idx_{table}_embedding ON {table} "
+                f"USING hnsw (embedding {COSINE_OPS[self.storage]})"
+            )
+        if self.binary_prefilter:
+            statements.append(
+                f"CREATE INDEX IF NOT EXISTS idx_{table}_embedding_bq ON {table} "
+                f"USING hnsw ((binary_quantize(embedding)::bit({self.dimension})) bit_hamming_ops)"
+            )
+        return statements
+
+    def ward_index_statements(self, table: str, ward: int) -> List[str]:
+        """
+        CREATE INDEX statements for a partial HNSW index over one ward
+
+        The index the layout searches (binary when prefiltering, otherwise
+        full precision) is built over just the ward's rows, so ward-filtered
+        searches walk a graph containing only matching rows. The planner
+        only uses it when the query's ward is a literal.
+
+        Args:
+            table: Table with `embedding` and `ward_number` columns
+            ward: Ward number
+
+        Returns:
+            List of SQL statements
+        """
+        ward = int(ward)
+        if self.binary_prefilter:
+            return [
+                f"CREATE INDEX IF NOT EXISTS idx_{table}_embedding_bq_w{ward} ON {table} "
+                f"USING hnsw ((binary_quantize(embedding)::bit({self.dimension})) bit_hamming_ops) "
+                f"WHERE ward_number = {ward}"
+            ]
+        return [
+            f"CREATE INDEX IF NOT EXISTS idx_{table}_embedding_w{ward} ON {table} "
+            f"USING hnsw (embedding {COSINE_OPS[self.storage]}) WHERE ward_number = {ward}"
+        ]
+
+
+def pgvector_version(cursor) -> Tuple[int, ...]:
+    """
+    Installed pgvector version as a tuple, e.g. (0, 7, 4)
+
+    Args:
+        cursor: Database cursor (tuple or RealDictCursor)
+    """
+    cursor.execute("SELECT extversion FROM pg_extension WHERE extname = 'vector'")
+    row = cursor.fetchone()
+    if not row:
+        return ()
+    version = row['extversion'] if isinstance(row, dict) else row[0]
+    return tuple(int(part) for part in version.split("."))
+
+
+# Create global vector search instance for the configured layout
+vector_search = VectorSearch(
+    storage=settings.VECTOR_STORAGE,
+    binary_prefilter=settings.VECTOR_BINARY_PREFILTER,
+    rerank_factor=settings.VECTOR_RERANK_FACTOR
+)
@@ -0,0 +1,376 @@
+"""
+Ward-filtered Vector Search
+Picks how to run a nearest-neighbour search restricted to one ward from the
+ward's size: an exact scan, a per-ward partial HNSW index, or the global HNSW
+index with a candidate list widened to survive the ward filter
+"""
+
+import asyncio
+import math
+import re
+import threading
+import time
+from typing import List, Optional, Sequence, Tuple
+
+from .async_database import AsyncDatabase
+from .config import settings
+from .vector_search import vector_search
+
+STRATEGIES = ("exact", "partial_index", "filtered_hnsw")
+
+# hnsw.iterative_scan arrived in pgvector 0.8.0
+MIN_PGVECTOR_ITERATIVE_SCAN = (0, 8, 0)
+
+# pgvector's hnsw.ef_search default and the largest value it accepts
+DEFAULT_EF_SEARCH = 40
+MAX_EF_SEARCH = 1000
+
+# Partial indexes created by VectorSearch.ward_index_statements()
+WARD_INDEX_PATTERN = re.compile(r"_w(\d+)$")
+
+
+class WardSearch:
+    """
+    Strategy planner for `ward_number = X` vector searches on one table
+
+    pgvector filters HNSW results after the graph walk: with the global
+    index and the default ef_search of 40, a ward holding 1% of the rows
+    yields well under `limit` matches. Per ward:
+
+    - exact: rows <= exact_max_rows. Every ward row is ranked by exact
+      distance via the ward b-tree index; perfect recall and cheap.
+    - partial_index: a partial HNSW index exists for the ward (created by
+      manage_ward_indexes.py for wards >= partial_index_min_rows). The
+      ward is inlined as a literal so the planner can match the index.
+    - filtered_hnsw: the global index with hnsw.ef_search raised in
+      proportion to the ward's share of the table, or iterative scans
+      on pgvector >= 0.8. A ward whose required ef_search exceeds
+      ef_search_max without iterative scans is searched exactly instead.
+
+    Ward sizes, partial indexes and the pgvector version are read from the
+    database at most every `stats_ttl_seconds`. Counting ward sizes scans
+    the table, so async searches refresh stale stats in one background task
+    and plan from the previous snapshot meanwhile; only the very first
+    searches wait for the initial load.
+    """
+
+    def __init__(
+        self,
+        table: str = "complaints",
+        exact_max_rows: int = 2000,
+        partial_index_min_rows: int = 50000,
+        ef_search_max: int = 1000,
+        stats_ttl_seconds: float = 300.0
+    ):
+        """
+        Args:
+            table: Table with `embedding` and `ward_number` columns
+            exact_max_rows: Largest ward searched by exact scan
+            partial_index_min_rows: Smallest ward worth a partial HNSW index
+            ef_search_max: Upper bound for the widened hnsw.ef_search
+                (capped at pgvector's limit of 1000)
+            stats_ttl_seconds: How long ward sizes are trusted
+        """
+        self.table = table
+        self.exact_max_rows = exact_max_rows
+        self.partial_index_min_rows = partial_index_min_rows
+        self.ef_search_max = min(ef_search_max, MAX_EF_SEARCH)
+        self.stats_ttl_seconds = stats_ttl_seconds
+
+        self._lock = threading.Lock()
+        self._ward_rows = {}
+        self._total_rows = 0
+        self._partial_wards = set()
+        self._iterative_scan = False
+        self._loaded_at = None
+        self._refreshing = False
+        self._refresh_task = None
+        self._chosen = {strategy: 0 for strategy in STRATEGIES}
+
+    def _stats_statements(self) -> List[Tuple[str, tuple]]:
+        """Queries behind refresh(), shared by the sync and async variants"""
+        return [
+            (
+                f"""
+                SELECT ward_number, count(*) AS n
+                FROM {self.table}
+                WHERE embedding IS NOT NULL
+                GROUP BY ward_number
+                """,
+                ()
+            ),
+            (
+                """
+                SELECT indexname FROM pg_indexes
+                WHERE schemaname = current_schema() AND tablename = %s AND indexname LIKE %s
+                """,
+                (self.table, f"idx_{self.table}_embedding%_w%")
+            ),
+            ("SELECT extversion FROM pg_extension WHERE extname = 'vector'", ())
+        ]
+
+    def _apply_stats(self, counts: list, indexes: list, extension: list):
+        """Install freshly queried stats"""
+        ward_rows = {row['ward_number']: row['n'] for row in counts}
+        partial_wards = set()
+        for row in indexes:
+            match = WARD_INDEX_PATTERN.search(row['indexname'])
+            if match:
+                partial_wards.add(int(match.group(1)))
+        version = tuple(int(part) for part in extension[0]['extversion'].split(".")) if extension else ()
+        with self._lock:
+            self._ward_rows = ward_rows
+            self._total_rows = sum(ward_rows.values())
+            self._partial_wards = partial_wards
+            self._iterative_scan = version >= MIN_PGVECTOR_ITERATIVE_SCAN
+            self._loaded_at = time.monotonic()
+
+    def _stale(self) -> bool:
+        return self._loaded_at is None or time.monotonic() - self._loaded_at > self.stats_ttl_seconds
+
+    def _claim_refresh(self) -> bool:
+        """Whether the caller should refresh now (at most one refresh at a time)"""
+        with self._lock:
+            if self._refreshing:
+                return False
+            self._refreshing = True
+            return True
+
+    def _refresh_done(self):
+        with self._lock:
+            self._refreshing = False
+
+    def _start_refresh(self) -> Optional[asyncio.Task]:
+        """Start a background stats refresh unless one is running; returns the running task"""
+        loop = asyncio.get_running_loop()
+        task = self._refresh_task
+        if task is not None and not task.done():
+            if task.get_loop() is loop:
+                return task
+            # Left behind by an event loop that has since gone away
+            self._refresh_done()
+        if not self._claim_refresh():
+            return None
+        self._refresh_task = loop.create_task(self._refresh_in_background())
+        return self._refresh_task
+
+    async def _refresh_in_background(self):
+        """refresh_async() on a connection of its own, outside any request transaction"""
+        try:
+            async with AsyncDatabase.get_cursor() as cursor:
+                await self.refresh_async(cursor)
+        except Exception as e:
+            print(f"⚠️ Ward stats refresh failed ({e}); keeping the previous snapshot")
+            with self._lock:
+                if self._loaded_at is not None:
+                    # Retry after another TTL rather than on every search
+                    self._loaded_at = time.monotonic()
+        finally:
+            self._refresh_done()
+
+    def refresh(self, cursor):
+        """Reload ward sizes and partial indexes (sync cursor)"""
+        results = []
+        for sql, params in self._stats_statements():
+            cursor.execute(sql, params)
+            results.append(cursor.fetchall())
+        self._apply_stats(*results)
+
+    async def refresh_async(self, cursor):
+        """refresh() for async (psycopg 3) cursors"""
+        results = []
+        for sql, params in self._stats_statements():
+            await cursor.execute(sql, params)
+            results.append(await cursor.fetchall())
+        self._apply_stats(*results)
+
+    def plan(self, ward: int, limit: int, strategy: Optional[str] = None) -> dict:
+        """
+        Choose how to search one ward, from the cached stats
+
+        Args:
+            ward: Ward number
+            limit: Rows the search returns
+            strategy: Force a strategy (benchmarks); None chooses by ward size
+
+        Returns:
+            Dictionary with strategy, ward_rows, ef_search (None = leave the
+            session default) and iterative_scan
+        """
+        ward = int(ward)
+        with self._lock:
+            rows = self._ward_rows.get(ward, 0)
+            total = self._total_rows
+            has_partial = ward in self._partial_wards
+            iterative = self._iterative_scan
+
+        # The binary pre-filter fetches rerank_factor candidates per row
+        candidates = limit * (vector_search.rerank_factor if vector_search.binary_prefilter else 1)
+        ef_search = None
+        forced = strategy is not None
+        if not forced:
+            if rows <= self.exact_max_rows:
+                strategy = "exact"
+            elif has_partial:
+                strategy = "partial_index"
+            else:
+                strategy = "filtered_hnsw"
+
+        if strategy == "partial_index":
+            if candidates > DEFAULT_EF_SEARCH:
+                ef_search = min(candidates, self.ef_search_max)
+        elif strategy == "filtered_hnsw":
+            # Expect rows/total of the walked candidates to be in the ward; keep 2x headroom
+            share = rows / total if rows and total else 1.0
+            needed = math.ceil(candidates / share * 2)
+            ef_search = min(max(DEFAULT_EF_SEARCH, candidates, needed), self.ef_search_max)
+            # Past the cap only iterative scans still find enough ward rows
+            if max(needed, candidates) > self.ef_search_max and not iterative and not forced:
+                strategy, ef_search = "exact", None
+
+        with self._lock:
+            self._chosen[strategy] += 1
+        return {
+            "strategy": strategy,
+            "ward_rows": rows,
+            "ef_search": ef_search,
+            "iterative_scan": strategy == "filtered_hnsw" and iterative
+        }
+
+    def _setup_statements(self, plan: dict) -> List[Tuple[str, tuple]]:
+        """Transaction-local settings for a plan"""
+        statements = []
+        if plan["ef_search"] is not None:
+            statements.append(("SELECT set_config('hnsw.ef_search', %s, true)", (str(plan["ef_search"]),)))
+        if plan["iterative_scan"]:
+            statements.append(("SELECT set_config('hnsw.iterative_scan', 'relaxed_order', true)", ()))
+        return statements
+
+    def _nearest_sql(self, plan: dict, embedding, ward: int, limit: int,
+                     where: str, params: Sequence, query_sql: Optional[str] = None) -> Tuple[str, List]:
+        """vector_search.nearest() for a plan, with the ward filter added"""
+        if plan["strategy"] == "partial_index":
+            # A literal, so the partial index predicate can be proven
+            ward_sql, ward_params = f"ward_number = {int(ward)}", []
+        else:
+            ward_sql, ward_params = "ward_number = %s", [ward]
+        return vector_search.nearest(
+            self.table,
+            embedding,
+            limit,
+            where=f"{ward_sql} AND {where}",
+            params=[*ward_params, *params],
+            query_sql=query_sql,
+            exact=plan["strategy"] == "exact"
+        )
+
+    def nearest(
+        self,
+        cursor,
+        embedding,
+        ward: int,
+        limit: int,
+        where: str = "TRUE",
+        params: Sequence = (),
+        strategy: Optional[str] = None,
+        query_sql: Optional[str] = None
+    ) -> Tuple[str, List]:
+        """
+        vector_search.nearest() restricted to one ward, planned by ward size
+
+        Applies the plan's settings to the cursor's transaction, so run the
+        returned SQL on the same cursor before committing. Stale stats are
+        refreshed inline on the cursor (by one caller at a time).
+
+        Args:
+            cursor: Database cursor (stats refresh and SET LOCAL run on it)
+            embedding: Query vector (None with `query_sql`)
+            ward: Ward number
+            limit: Rows to return
+            where: Additional filter (without the ward), with %s placeholders
+            params: Parameters for `where`
+            strategy: Force a strategy; None chooses by ward size
+            query_sql: SQL expression to use as the query vector, e.g.
+                `src.embedding` inside a LATERAL join over rows of this ward
+
+        Returns:
+            (sql, params) as from VectorSearch.nearest()
+        """
+        if self._stale() and self._claim_refresh():
+            try:
+                self.refresh(cursor)
+            finally:
+                self._refresh_done()
+        plan = self.plan(ward, limit, strategy)
+        for sql, setup_params in self._setup_statements(plan):
+            cursor.execute(sql, setup_params)
+        return self._nearest_sql(plan, embedding, ward, limit, where, params, query_sql)
+
+    async def nearest_async(
+        self,
+        cursor,
+        embedding,
+        ward: int,
+        limit: int,
+        where: str = "TRUE",
+        params: Sequence = (),
+        strategy: Optional[str] = None,
+        query_sql: Optional[str] = None
+    ) -> Tuple[str, List]:
+        """
+        nearest() for async (psycopg 3) cursors
+
+        Stale stats are refreshed by a background task; the search plans
+        from the previous snapshot unless there is none yet.
+        """
+        if self._stale():
+            task = self._start_refresh()
+            if self._loaded_at is None and task is not None:
+                await asyncio.shield(task)
+        plan = self.plan(ward, limit, strategy)
+        for sql, setup_params in self._setup_statements(plan):
+            await cursor.execute(sql, setup_params)
+        return self._nearest_sql(plan, embedding, ward, limit, where, params, query_sql)
+
+    def ward_sizes(self) -> dict:
+        """Embedded rows per ward, from the cached stats"""
+        with self._lock:
+            return dict(self._ward_rows)
+
+    def wards_needing_index(self) -> List[int]:
+        """Wards large enough for a partial index that do not have one"""
+        with self._lock:
+            return sorted(
+                ward for ward, rows in self._ward_rows.items()
+                if ward is not None and rows >= self.partial_index_min_rows and ward not in self._partial_wards
+            )
+
+    def get_stats(self) -> dict:
+        """
+        Report the planner's view of the table
+
+        Returns:
+            Dictionary with ward counts, partial indexes and strategy usage
+        """
+        with self._lock:
+            return {
+                "table": self.table,
+                "wards": len(self._ward_rows),
+                "embedded_rows": self._total_rows,
+                "partial_index_wards": sorted(self._partial_wards),
+                "iterative_scan": self._iterative_scan,
+                "stats_age_seconds": (
+                    round(time.monotonic() - self._loaded_at, 1) if self._loaded_at is not None else None
+                ),
+                "chosen": dict(self._chosen)
+            }
+
+
+# Create global ward search planner for complaints
+ward_search = WardSearch(
+    "complaints",
+    exact_max_rows=settings.VECTOR_WARD_EXACT_MAX_ROWS,
+    partial_index_min_rows=settings.VECTOR_WARD_PARTIAL_INDEX_MIN_ROWS,
+    ef_search_max=settings.VECTOR_EF_SEARCH_MAX,
+    stats_ttl_seconds=settings.VECTOR_WARD_STATS_TTL_SECONDS
+)
@@ -3,11 +3,17 @@ Announcement Routes
 Handles official announcements from government
 """
 
-from fastapi import APIRouter, Depends, HTTPException
-from pydantic import BaseModel
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from pydantic import BaseModel, Field
 from typing import Optional
-from ..core.database import Database
+from ..core.async_database import AsyncDatabase
+from ..core.config import settings
+from ..core.vector_search import vector_search
 from ..core.security import security_service
+from ..services.embedding_queue import embedding_queue
+from ..services.search_cache import normalize_query, search_cache
+from ..services.vector_index import vector_index
+from ..utils.pagination import keyset_after, next_page
 
 # Create router for announcement endpoints
 router = APIRouter(
@@ -31,54 +37,59 @@ class AnnouncementResponse(BaseModel):
 
 @router.get("/")
 async def get_announcements(
+    response: Response,
     ward: int = None,
-    limit: int = 20,
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
     current_user: dict = Depends(security_service.get_current_user)
 ):
     """
-    Get announcements (optionally filtered by ward)
+    Get announcements (optionally filtered by ward), newest first
     
     Query Parameters:
         - ward: Optional ward filter (ward number)
-        - limit: Maximum number of announcements (default: 20)
+        - limit: Maximum number of announcements, 1-100 (default: 20)
+        - cursor: X-Next-Cursor value from the previous page
     
     Returns:
-        List of announcements
+        List of announcements; the X-Next-Cursor response header is set
+        when there are more
     
     Requires:
         JWT authentication token
     """
     try:
-        with Database.get_cursor() as cursor:
-            # Build query with optional ward filter
-            if ward:
-                cursor.execute("""
-                    SELECT id, ward_number, title, body, date
-                    FROM announcements
-                    WHERE ward_number = %s OR ward_number IS NULL
-                    ORDER BY date DESC
-                    LIMIT %s
-                """, (ward, limit))
-            else:
-                cursor.execute("""
-                    SELECT id, ward_number, title, body, date
-                    FROM announcements
-                    ORDER BY date DESC
-                    LIMIT %s
-                """, (limit,))
-            
-            announcements = cursor.fetchall()
-            
-            return [
-                AnnouncementResponse(
-                    id=a['id'],
-                    ward=a['ward_number'],
-                    title=a['title'],
-                    body=a['body'],
-                    date=a['date'].isoformat()
-                )
-                for a in announcements
-            ]
+        # Seek past the previous page on the date index instead of OFFSET
+        after_sql, params = keyset_after(cursor)
+        conditions = [after_sql]
+        
+        # Build query with optional ward filter
+        if ward:
+            conditions.append("(ward_number = %s OR ward_number IS NULL)")
+            params.append(ward)
+        
+        async with AsyncDatabase.get_cursor() as db_cursor:
+            await db_cursor.execute(f"""
+                SELECT id, ward_number, title, body, date
+                FROM announcements
+                WHERE {" AND ".join(conditions)}
+                ORDER BY date DESC, id DESC
+                LIMIT %s
+            """, (*params, limit + 1))
+            announcements, next_cursor = next_page(await db_cursor.fetchall(), limit)
+        
+        if next_cursor:
+            response.headers["X-Next-Cursor"] = next_cursor
+        return [
+            AnnouncementResponse(
+                id=a['id'],
+                ward=a['ward_number'],
+                title=a['title'],
+                body=a['body'],
+                date=a['date'].isoformat()
+            )
+            for a in announcements
+        ]
     
     except HTTPException:
         raise
@@ -90,7 +101,7 @@ class AnnouncementSearchQuery(BaseModel):
     """Search query for announcements"""
     query: str
     ward: Optional[int] = None
-    limit: int = 5
+    limit: int = Field(5, ge=1, le=100)
 
 
 @router.post("/search")
@@ -107,55 +118,20 @@ async def search_announcements(
         - limit: Maximum results (default: 5)
     
     Returns:
-        Relevant announcements ranked by semantic similarity
+        Relevant announcements ranked by semantic similarity (cached briefly)
     
     Requires:
         JWT authentication token
     """
     try:
-        # Import here to avoid circular imports
-        from ..services.embedding_service import embedding_service
-        
-        with Database.get_cursor() as cursor:
-            # Generate query embedding
-            query_embedding = embedding_service.get_embedding(search_query.query)
-            embedding_str = embedding_service.embedding_to_postgres_string(query_embedding)
-            
-            # Build search query
-            sql = """
-                SELECT id, ward_number, title, body, date,
-                       1 - (embedding <=> %s::vector) AS relevance_score
-                FROM announcements
-                WHERE embedding IS NOT NULL
-            """
-            params = [embedding_str]
-            
-            # Apply ward filter if specified
-            if search_query.ward:
-                sql += " AND (ward_number = %s OR ward_number IS NULL)"
-                params.append(search_query.ward)
-            
-            sql += " ORDER BY relevance_score DESC LIMIT %s"
-            params.append(search_query.limit)
-            
-            cursor.execute(sql, params)
-            results = cursor.fetchall()
-            
-            return {
-                "results": [
-                    {
-                        "id": r['id'],
-                        "ward": r['ward_number'],
-                        "title": r['title'],
-                        "body": r['body'],
-                        "date": r['date'].isoformat(),
-                        "relevance_score": float(r['relevance_score'])
-                    }
-                    for r in results
-                ],
-                "query": search_query.query,
-                "total_found": len(results)
-            }
+        # Identical concurrent searches share one embedding and one scan
+        response, cached = await search_cache.get_or_compute(
+            "announcements",
+            search_query.ward,
+            (normalize_query(search_query.query), search_query.limit),
+            lambda: _search_announcements(search_query)
+        )
+        return {**response, "cached": cached}
     
     except HTTPException:
         raise
@@ -163,6 +139,72 @@ async def search_announcements(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+async def _search_announcements(search_query: AnnouncementSearchQuery) -> dict:
+    """Run one announcement search against the database (cache miss)"""
+    # Import here to avoid circular imports
+    from ..services.embedding_service import embedding_service
+    
+    # Generate query embedding before borrowing a connection
+    query_embedding = await embedding_service.get_embedding_async(search_query.query)
+    
+    # In-process index first (ward shards plus city-wide); None falls back to Postgres
+    ranked = None
+    if settings.VECTOR_INDEX_ENABLED:
+        ranked = await vector_index.search(
+            "announcements",
+            query_embedding,
+            search_query.limit,
+            wards=[search_query.ward, None] if search_query.ward else None
+        )
+    
+    async with AsyncDatabase.get_cursor() as cursor:
+        # Only compare against vectors from the active model version
+        where = "embedding_model = %s"
+        filter_params = [embedding_service.version]
+        
+        # Apply ward filter if specified
+        if search_query.ward:
+            where += " AND (ward_number = %s OR ward_number IS NULL)"
+            filter_params.append(search_query.ward)
+        
+        # Build search query (ranked inside the subquery so the vector index is used)
+        if ranked is not None:
+            nearest_sql, params = vector_index.candidates_sql("announcements", ranked, where=where, params=filter_params)
+        else:
+            nearest_sql, params = vector_search.nearest(
+                "announcements",
+                query_embedding,
+                search_query.limit,
+                where=where,
+                params=filter_params
+            )
+        sql = f"""
+            SELECT id, ward_number, title, body, date,
+                   1 - distance AS relevance_score
+            FROM {nearest_sql} AS nearest
+            ORDER BY distance
+        """
+        
+        await cursor.execute(sql, params)
+        results = await cursor.fetchall()
+        
+        return {
+            "results": [
+                {
+                    "id": r['id'],
+                    "ward": r['ward_number'],
+                    "title": r['title'],
+                    "body": r['body'],
+                    "date": r['date'].isoformat(),
+                    "relevance_score": float(r['relevance_score'])
+                }
+                for r in results
+            ],
+            "query": search_query.query,
+            "total_found": len(results)
+        }
+
+
 @router.post("/")
 async def create_announcement(
     announcement_data: AnnouncementCreate,
@@ -187,8 +229,8 @@ async def create_announcement(
         raise HTTPException(status_code=403, detail="Admin access required")
     
     try:
-        with Database.get_cursor() as cursor:
-            cursor.execute("""
+        async with AsyncDatabase.get_cursor() as cursor:
+            await cursor.execute("""
                 INSERT INTO announcements (ward_number, title, body, date)
                 VALUES (%s, %s, %s, CURRENT_TIMESTAMP)
                 RETURNING id
@@ -197,12 +239,17 @@ async def create_announcement(
                 announcement_data.title,
                 announcement_data.body
             ))
-            announcement_id = cursor.fetchone()['id']
+            announcement_id = (await cursor.fetchone())['id']
             
-            return {
-                "message": "Announcement created successfully",
-                "announcement_id": announcement_id
-            }
+            # Embedded in the background so it becomes searchable shortly
+            await embedding_queue.enqueue_async(cursor, "announcements", announcement_id)
+        
+        embedding_queue.notify()
+        search_cache.invalidate("announcements", announcement_data.ward)
+        return {
+            "message": "Announcement created successfully",
+            "announcement_id": announcement_id
+        }
     
     except HTTPException:
         raise
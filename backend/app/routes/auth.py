@@ -1,11 +1,16 @@
 """
 Authentication Routes
-Handles user registration and login
+Handles user registration, login, bulk import and account removal
 """
 
-from fastapi import APIRouter, HTTPException
+import codecs
+from fastapi import APIRouter, Depends, File, HTTPException, UploadFile
+from ..core.config import settings
+from ..core.executors import executors
+from ..core.security import security_service
 from ..models.user import UserRegister, UserLogin, LoginResponse
 from ..services.user_service import user_service
+from ..services.user_import import import_users
 
 # Create router for auth endpoints
 router = APIRouter(
@@ -29,7 +34,7 @@ async def register(user_data: UserRegister):
         Success message and user_id
     """
     try:
-        result = user_service.register_user(user_data)
+        result = await user_service.register_user(user_data)
         return result
     except HTTPException:
         raise
@@ -50,9 +55,75 @@ async def login(credentials: UserLogin):
         JWT access token and user information
     """
     try:
-        result = user_service.login_user(credentials)
+        result = await user_service.login_user(credentials)
         return result
     except HTTPException:
         raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.delete("/users/{user_id}")
+async def delete_user(
+    user_id: int,
+    current_user: dict = Depends(security_service.get_current_user)
+):
+    """
+    Delete a user account (Admin only)
+    
+    Path Parameters:
+        - user_id: ID of the user to delete
+    
+    Returns:
+        Success message
+    
+    Requires:
+        JWT authentication token with admin role
+    """
+    if current_user['role'] != 'admin':
+        raise HTTPException(status_code=403, detail="Admin access required")
+    
+    try:
+        result = await user_service.delete_user(user_id)
+        return result
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/users/import")
+async def import_users_csv(
+    file: UploadFile = File(...),
+    current_user: dict = Depends(security_service.get_current_user)
+):
+    """
+    Bulk-import users from a CSV file (Admin only)
+    
+    Form Data:
+        - file: CSV with columns name, email, password (required) and
+          ward_number, zone, phone, address, role (optional)
+    
+    Returns:
+        Counts of imported, duplicate and invalid rows, plus per-row errors
+        (first 1000). Returns 503 while another import is running; very large
+        files are better loaded with `python import_users.py`.
+    
+    Requires:
+        JWT authentication token with admin role
+    """
+    if current_user['role'] != 'admin':
+        raise HTTPException(status_code=403, detail="Admin access required")
+    
+    try:
+        # The upload is spooled to disk by the server; the import streams it back.
+        # A StreamReader, not io.TextIOWrapper: SpooledTemporaryFile only has
+        # the io.IOBase methods TextIOWrapper needs from Python 3.11.
+        csv_file = codecs.getreader("utf-8-sig")(file.file)
+        return await executors.run("bulk", import_users, csv_file, workers=settings.IMPORT_HASH_WORKERS)
+    except HTTPException:
+        raise
+    except (ValueError, UnicodeDecodeError) as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
@@ -3,7 +3,8 @@ Complaint Routes
 Handles complaint submission, search, and management
 """
 
-from fastapi import APIRouter, Depends, HTTPException
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
 from ..models.complaint import (
     ComplaintSubmit, 
     ComplaintSubmitResponse,
@@ -39,7 +40,7 @@ async def submit_complaint(
         JWT authentication token
     """
     try:
-        result = complaint_service.submit_complaint(
+        result = await complaint_service.submit_complaint(
             complaint_data,
             current_user['user_id']
         )
@@ -56,21 +57,23 @@ async def search_complaints(
     current_user: dict = Depends(security_service.get_current_user)
 ):
     """
-    AI-powered semantic search across complaints
+    Search across complaints by meaning, keywords, or both
     
     Request Body:
         - query: Natural language search query
         - ward: Optional ward filter
         - limit: Maximum results (default: 10)
+        - mode: vector, text or hybrid (default: SEARCH_DEFAULT_MODE)
+        - cursor: next_cursor from the previous page
     
     Returns:
-        Relevant complaints ranked by semantic similarity
+        Relevant complaints ranked by the chosen mode, with per-stage timings
     
     Requires:
         JWT authentication token
     """
     try:
-        results = complaint_service.search_complaints(
+        results = await complaint_service.search_complaints(
             search_query,
             current_user['role'],
             current_user['user_id'],
@@ -83,6 +86,37 @@ async def search_complaints(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.get("/mine")
+async def list_my_complaints(
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
+    current_user: dict = Depends(security_service.get_current_user)
+):
+    """
+    The current user's complaints, newest first
+    
+    Query Parameters:
+        - limit: Page size, 1-100 (default: 20)
+        - cursor: next_cursor from the previous page
+    
+    Returns:
+        Complaints and next_cursor (null on the last page)
+    
+    Requires:
+        JWT authentication token
+    """
+    try:
+        return await complaint_service.list_user_complaints(
+            current_user['user_id'],
+            limit,
+            cursor
+        )
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @router.get("/similar/{complaint_id}")
 async def get_similar_issues(
     complaint_id: int,
@@ -101,7 +135,7 @@ async def get_similar_issues(
         JWT authentication token
     """
     try:
-        result = complaint_service.get_similar_issues(complaint_id)
+        result = await complaint_service.get_similar_issues(complaint_id)
         return result
     except HTTPException:
         raise
@@ -122,7 +156,8 @@ async def update_complaint_status(
         - complaint_id: ID of complaint to update
     
     Request Body:
-        - status: New status (pending/in_progress/resolved/rejected)
+        - status: New status (pending/in_progress/resolved/rejected; resolved and
+          rejected are final, see complaint_partitions.FINAL_STATUSES)
     
     Returns:
         Success message
@@ -131,7 +166,7 @@ async def update_complaint_status(
         JWT authentication token with officer or admin role
     """
     try:
-        result = complaint_service.update_complaint_status(
+        result = await complaint_service.update_complaint_status(
             complaint_id,
             update_data.status,
             current_user['role'],
@@ -4,7 +4,7 @@ Handles dashboard data and analytics
 """
 
 from fastapi import APIRouter, Depends, HTTPException
-from ..core.database import Database
+from ..core.async_database import AsyncDatabase
 from ..core.security import security_service
 
 # Create router for dashboard endpoints
@@ -35,7 +35,7 @@ async def get_dashboard_data(
         - Admins: See all data across all wards
     """
     try:
-        with Database.get_cursor() as cursor:
+        async with AsyncDatabase.get_cursor() as cursor:
             user_role = current_user['role']
             user_ward = current_user['ward']
             
@@ -48,36 +48,36 @@ async def get_dashboard_data(
                 params.append(user_ward)
             
             # 1. Ward-wise complaint counts
-            cursor.execute(f"""
+            await cursor.execute(f"""
                 SELECT ward_number, COUNT(*) as complaint_count
                 FROM complaints
                 {ward_filter}
                 GROUP BY ward_number
                 ORDER BY complaint_count DESC
             """, params)
-            ward_data = cursor.fetchall()
+            ward_data = await cursor.fetchall()
             
             # 2. Status breakdown
-            cursor.execute(f"""
+            await cursor.execute(f"""
                 SELECT status, COUNT(*) as count
                 FROM complaints
                 {ward_filter}
                 GROUP BY status
             """, params)
-            status_data = cursor.fetchall()
+            status_data = await cursor.fetchall()
             
             # 3. Category distribution
-            cursor.execute(f"""
+            await cursor.execute(f"""
                 SELECT category, COUNT(*) as count
                 FROM complaints
                 {ward_filter}
                 GROUP BY category
                 ORDER BY count DESC
             """, params)
-            category_data = cursor.fetchall()
+            category_data = await cursor.fetchall()
             
             # 4. Recent trends (last 7 days)
-            cursor.execute(f"""
+            await cursor.execute(f"""
                 SELECT DATE(date) as day, COUNT(*) as count
                 FROM complaints
                 {ward_filter}
@@ -85,7 +85,7 @@ async def get_dashboard_data(
                 GROUP BY DATE(date)
                 ORDER BY day ASC
             """, params)
-            trend_data = cursor.fetchall()
+            trend_data = await cursor.fetchall()
             
             response_data = {
                 "ward_wise": [
@@ -111,16 +111,16 @@ async def get_dashboard_data(
                 user_id = current_user['user_id']
                 
                 # User's complaint status breakdown
-                cursor.execute("""
+                await cursor.execute("""
                     SELECT status, COUNT(*) as count
                     FROM complaints
                     WHERE user_id = %s
                     GROUP BY status
                 """, (user_id,))
-                user_status_data = cursor.fetchall()
+                user_status_data = await cursor.fetchall()
                 
                 # User's recent complaints
-                cursor.execute("""
+                await cursor.execute("""
                     SELECT c.id, c.ward_number, c.category, c.description, c.status, c.date,
                            u.name as citizen_name
                     FROM complaints c
@@ -129,7 +129,7 @@ async def get_dashboard_data(
                     ORDER BY c.date DESC
                     LIMIT 5
                 """, (user_id,))
-                user_complaints = cursor.fetchall()
+                user_complaints = await cursor.fetchall()
                 
                 response_data["my_complaints_by_status"] = {
                     row['status']: row['count'] for row in user_status_data
@@ -172,7 +172,7 @@ async def get_summary_stats(
         JWT authentication token
     """
     try:
-        with Database.get_cursor() as cursor:
+        async with AsyncDatabase.get_cursor() as cursor:
             user_role = current_user['role']
             user_ward = current_user['ward']
             
@@ -185,7 +185,7 @@ async def get_summary_stats(
                 params.append(user_ward)
             
             # Get summary counts
-            cursor.execute(f"""
+            await cursor.execute(f"""
                 SELECT 
                     COUNT(*) as total,
                     COUNT(*) FILTER (WHERE status = 'pending') as pending,
@@ -194,7 +194,7 @@ async def get_summary_stats(
                 FROM complaints
                 {ward_filter}
             """, params)
-            summary = cursor.fetchone()
+            summary = await cursor.fetchone()
             
             return {
                 "total_complaints": summary['total'],
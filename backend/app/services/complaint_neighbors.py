@@ -0,0 +1,382 @@
+"""
+Complaint Neighbours
+Materialized top-k similar complaints per complaint, so the similar-issues
+endpoint is an indexed lookup instead of an inference plus an HNSW scan
+"""
+
+from typing import Callable, List, Optional
+
+from ..core.config import settings
+from ..core.database import Database
+from ..core.ward_search import ward_search
+from .embedding_service import embedding_service
+
+# No foreign keys: complaints is partitioned on (id, date), so its id alone is
+# not a referenceable key. Entries of deleted or archived complaints are
+# removed with remove() (user deletion, archive_complaints.py).
+COMPLAINT_NEIGHBORS_TABLE_SQL = """
+    ALTER TABLE complaints ADD COLUMN IF NOT EXISTS neighbors_model VARCHAR(100);
+    CREATE TABLE IF NOT EXISTS complaint_neighbors (
+        complaint_id INTEGER NOT NULL,
+        neighbor_id INTEGER NOT NULL,
+        similarity REAL NOT NULL,
+        PRIMARY KEY (complaint_id, neighbor_id)
+    );
+    CREATE INDEX IF NOT EXISTS idx_complaint_neighbors_neighbor
+        ON complaint_neighbors (neighbor_id);
+"""
+
+
+class ComplaintNeighbors:
+    """
+    Maintains complaint_neighbors: the `k` most similar complaints in the
+    same ward for every complaint, with their similarity scores
+
+    complaints.neighbors_model records the embedding version a complaint's
+    list was built for; a list is only trusted when it matches the active
+    version. Lists are written in three ways:
+
+    - at insert time, by the submit statement itself (see ComplaintService)
+    - propagate(): a new complaint is offered to the lists of its nearest
+      `candidates` ward neighbours and replaces their weakest entry if it
+      is closer, so existing lists pick up new arrivals incrementally
+    - build()/build_all(): lists recomputed from scratch, used for rows
+      embedded by the background queue, on a lookup miss and by
+      build_complaint_neighbors.py
+
+    build() and propagate() search one ward at a time through ward_search,
+    which picks an exact scan, a partial index or a widened HNSW walk from
+    the ward's size, so small wards still get complete lists without every
+    rebuild scanning whole wards.
+    """
+
+    def __init__(self, k: int = 5, candidates: int = 50):
+        """
+        Args:
+            k: Neighbours stored per complaint
+            candidates: Existing complaints whose lists a new complaint is
+                offered to (its nearest ones in the ward)
+        """
+        self.k = k
+        self.candidates = candidates
+
+    def build(self, cursor, complaint_ids: List[int]):
+        """
+        Recompute the lists of the given complaints
+
+        Args:
+            cursor: Database cursor (the caller commits)
+            complaint_ids: Complaints whose own lists to rebuild
+        """
+        cursor.execute(*self._clear_statement(complaint_ids))
+        cursor.execute(*self._wards_statement(complaint_ids))
+        for row in cursor.fetchall():
+            # Planning applies the ward's settings, so insert before the next ward
+            nearest = ward_search.nearest(cursor, None, row['ward_number'], self.k, **self._build_search())
+            cursor.execute(*self._build_statement(nearest, row['ids']))
+        cursor.execute(*self._mark_statement(complaint_ids))
+
+    async def build_async(self, cursor, complaint_ids: List[int]):
+        """build() for async (psycopg 3) cursors"""
+        await cursor.execute(*self._clear_statement(complaint_ids))
+        await cursor.execute(*self._wards_statement(complaint_ids))
+        for row in await cursor.fetchall():
+            nearest = await ward_search.nearest_async(
+                cursor, None, row['ward_number'], self.k, **self._build_search()
+            )
+            await cursor.execute(*self._build_statement(nearest, row['ids']))
+        await cursor.execute(*self._mark_statement(complaint_ids))
+
+    def propagate(self, cursor, complaint_ids: List[int]):
+        """
+        Add new complaints to the lists of existing complaints they are
+        closer to than those lists' weakest entry
+
+        Args:
+            cursor: Database cursor (the caller commits)
+            complaint_ids: Newly embedded complaints
+        """
+        cursor.execute(*self._wards_statement(complaint_ids))
+        for row in cursor.fetchall():
+            nearest = ward_search.nearest(
+                cursor, None, row['ward_number'], self.candidates, **self._propagate_search()
+            )
+            cursor.execute(*self._propagate_statement(nearest, row['ids']))
+        cursor.execute(*self._trim_statement(complaint_ids))
+
+    async def propagate_async(self, cursor, complaint_ids: List[int]):
+        """propagate() for async (psycopg 3) cursors"""
+        await cursor.execute(*self._wards_statement(complaint_ids))
+        for row in await cursor.fetchall():
+            nearest = await ward_search.nearest_async(
+                cursor, None, row['ward_number'], self.candidates, **self._propagate_search()
+            )
+            await cursor.execute(*self._propagate_statement(nearest, row['ids']))
+        await cursor.execute(*self._trim_statement(complaint_ids))
+
+    def refresh(self, cursor, complaint_ids: List[int]):
+        """build() and propagate() for newly embedded complaints"""
+        self.build(cursor, complaint_ids)
+        self.propagate(cursor, complaint_ids)
+
+    def remove(self, cursor, complaint_ids: List[int]):
+        """
+        Delete every list entry of, or pointing at, the given complaints
+
+        Args:
+            cursor: Database cursor (the caller commits)
+            complaint_ids: Complaints being deleted or archived
+        """
+        cursor.execute(*self._remove_statement(complaint_ids))
+
+    async def remove_async(self, cursor, complaint_ids: List[int]):
+        """remove() for async (psycopg 3) cursors"""
+        await cursor.execute(*self._remove_statement(complaint_ids))
+
+    def _remove_statement(self, complaint_ids: List[int]) -> tuple:
+        """SQL for remove(), shared by the sync and async variants"""
+        return (
+            "DELETE FROM complaint_neighbors WHERE complaint_id = ANY(%s) OR neighbor_id = ANY(%s)",
+            (complaint_ids, complaint_ids)
+        )
+
+    # Statements shared by the sync and async variants. Complaints without
+    # a ward are never in a ward group, so their lists stay empty.
+
+    def _wards_statement(self, complaint_ids: List[int]) -> tuple:
+        """The given complaints embedded with the active version, grouped by ward"""
+        return (
+            """
+            SELECT ward_number, array_agg(id) AS ids
+            FROM complaints
+            WHERE id = ANY(%s) AND embedding_model = %s AND ward_number IS NOT NULL
+            GROUP BY ward_number
+            """,
+            (complaint_ids, embedding_service.version)
+        )
+
+    def _clear_statement(self, complaint_ids: List[int]) -> tuple:
+        return (
+            "DELETE FROM complaint_neighbors WHERE complaint_id = ANY(%s)",
+            (complaint_ids,)
+        )
+
+    def _build_search(self) -> dict:
+        """ward_search arguments for one complaint's own list"""
+        return {
+            "where": "embedding_model = %s AND id <> src.id",
+            "params": [embedding_service.version],
+            "query_sql": "src.embedding"
+        }
+
+    def _build_statement(self, nearest: tuple, ids: List[int]) -> tuple:
+        """Insert the lists of one ward's complaints"""
+        nearest_sql, nearest_params = nearest
+        return (
+            f"""
+            INSERT INTO complaint_neighbors (complaint_id, neighbor_id, similarity)
+            SELECT src.id, nearest.id, 1 - nearest.distance
+            FROM complaints src
+            CROSS JOIN LATERAL {nearest_sql} AS nearest
+            WHERE src.id = ANY(%s)
+            """,
+            (*nearest_params, ids)
+        )
+
+    def _mark_statement(self, complaint_ids: List[int]) -> tuple:
+        version = embedding_service.version
+        return (
+            """
+            UPDATE complaints
+            SET neighbors_model = CASE WHEN embedding_model = %s THEN %s END
+            WHERE id = ANY(%s)
+            """,
+            (version, version, complaint_ids)
+        )
+
+    def _propagate_search(self) -> dict:
+        """ward_search arguments for the existing complaints a new one is offered to"""
+        version = embedding_service.version
+        return {
+            "where": "embedding_model = %s AND neighbors_model = %s AND id <> added.id",
+            "params": [version, version],
+            "query_sql": "added.embedding"
+        }
+
+    def _propagate_statement(self, nearest: tuple, ids: List[int]) -> tuple:
+        """Offer one ward's new complaints to their nearest complaints' lists"""
+        nearest_sql, nearest_params = nearest
+        return (
+            f"""
+            INSERT INTO complaint_neighbors (complaint_id, neighbor_id, similarity)
+            SELECT candidate.id, added.id, 1 - candidate.distance
+            FROM complaints added
+            CROSS JOIN LATERAL {nearest_sql} AS candidate
+            CROSS JOIN LATERAL (
+                SELECT count(*) AS size, min(similarity) AS weakest
+                FROM complaint_neighbors
+                WHERE complaint_id = candidate.id
+            ) AS list
+            WHERE added.id = ANY(%s)
+              AND (list.size < %s OR 1 - candidate.distance > list.weakest)
+            ON CONFLICT (complaint_id, neighbor_id) DO UPDATE SET similarity = EXCLUDED.similarity
+            """,
+            (*nearest_params, ids, self.k)
+        )
+
+    def _trim_statement(self, complaint_ids: List[int]) -> tuple:
+        """Lists that just gained an entry drop back to k"""
+        return (
+            """
+            DELETE FROM complaint_neighbors n
+            USING (
+                SELECT complaint_id, neighbor_id,
+                       row_number() OVER (
+                           PARTITION BY complaint_id ORDER BY similarity DESC, neighbor_id
+                       ) AS position
+                FROM complaint_neighbors
+                WHERE complaint_id IN (
+                    SELECT complaint_id FROM complaint_neighbors WHERE neighbor_id = ANY(%s)
+                )
+            ) AS ranked
+            WHERE n.complaint_id = ranked.complaint_id
+              AND n.neighbor_id = ranked.neighbor_id
+              AND ranked.position > %s
+            """,
+            (complaint_ids, self.k)
+        )
+
+    async def lookup_async(self, cursor, complaint_id: int) -> Optional[dict]:
+        """
+        Read a complaint's stored neighbours
+
+        Args:
+            cursor: Async database cursor
+            complaint_id: Complaint to look up
+
+        Returns:
+            None if the complaint does not exist, otherwise a dict with
+            `complaint` (description, ward_number, embedding_model,
+            neighbors_model) and `neighbors` (rows with similarity_score,
+            most similar first; only meaningful when neighbors_model is the
+            active version)
+        """
+        await cursor.execute(
+            """
+            SELECT src.description AS src_description, src.ward_number AS src_ward,
+                   src.embedding_model AS src_embedding_model,
+                   src.neighbors_model AS src_neighbors_model,
+                   c.id, c.ward_number, c.description, c.category, c.status, c.date,
+                   n.similarity AS similarity_score
+            FROM complaints src
+            LEFT JOIN complaint_neighbors n ON n.complaint_id = src.id
+            LEFT JOIN complaints c ON c.id = n.neighbor_id
+            WHERE src.id = %s
+            ORDER BY n.similarity DESC NULLS LAST
+            LIMIT %s
+            """,
+            (complaint_id, self.k)
+        )
+        rows = await cursor.fetchall()
+        if not rows:
+            return None
+        first = rows[0]
+        return {
+            "complaint": {
+                "description": first['src_description'],
+                "ward_number": first['src_ward'],
+                "embedding_model": first['src_embedding_model'],
+                "neighbors_model": first['src_neighbors_model']
+            },
+            "neighbors": [row for row in rows if row['id'] is not None]
+        }
+
+    def build_all(
+        self,
+        ward: Optional[int] = None,
+        stale_only: bool = False,
+        chunk_size: int = 500,
+        progress: Optional[Callable[[int, int], None]] = None
+    ) -> int:
+        """
+        Batch builder: recompute lists for every embedded complaint
+
+        Args:
+            ward: Only rebuild this ward
+            stale_only: Only complaints whose list is missing or was built
+                for another embedding version; these are also propagated
+                into their neighbours' lists
+            chunk_size: Complaints per transaction
+            progress: Called with (complaints done, total)
+
+        Returns:
+            Number of complaints processed
+        """
+        version = embedding_service.version
+        conditions = ["embedding_model = %s"]
+        params = [version]
+        if ward is not None:
+            conditions.append("ward_number = %s")
+            params.append(ward)
+        if stale_only:
+            conditions.append("neighbors_model IS DISTINCT FROM %s")
+            params.append(version)
+        where = " AND ".join(conditions)
+
+        with Database.get_cursor() as cursor:
+            cursor.execute(f"SELECT count(*) AS n FROM complaints WHERE {where}", params)
+            total = cursor.fetchone()['n']
+
+        done = 0
+        last_id = 0
+        while True:
+            with Database.get_cursor() as cursor:
+                cursor.execute(
+                    f"SELECT id FROM complaints WHERE {where} AND id > %s ORDER BY id LIMIT %s",
+                    (*params, last_id, chunk_size)
+                )
+                ids = [row['id'] for row in cursor.fetchall()]
+                if not ids:
+                    break
+                if stale_only:
+                    self.refresh(cursor, ids)
+                else:
+                    self.build(cursor, ids)
+            last_id = ids[-1]
+            done += len(ids)
+            if progress is not None:
+                progress(done, total)
+        return done
+
+    def get_stats(self) -> dict:
+        """
+        Report list coverage for the active embedding version
+
+        Returns:
+            Dictionary with embedded, built and stale complaint counts
+        """
+        version = embedding_service.version
+        with Database.get_cursor() as cursor:
+            cursor.execute(
+                """
+                SELECT count(*) AS embedded,
+                       count(*) FILTER (WHERE neighbors_model = %s) AS built
+                FROM complaints
+                WHERE embedding_model = %s
+                """,
+                (version, version)
+            )
+            row = cursor.fetchone()
+        return {
+            "k": self.k,
+            "embedded": row['embedded'],
+            "built": row['built'],
+            "stale": row['embedded'] - row['built']
+        }
+
+
+# Create global complaint neighbours instance
+complaint_neighbors = ComplaintNeighbors(
+    k=settings.COMPLAINT_NEIGHBORS_K,
+    candidates=settings.COMPLAINT_NEIGHBORS_CANDIDATES
+)
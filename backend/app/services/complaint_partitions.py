@@ -0,0 +1,401 @@
+"""
+Complaint Partitions
+Monthly range partitions of the complaints table on `date`, and the
+retention job that moves old, fully closed months into an archive schema
+"""
+
+import re
+from datetime import date, datetime
+from typing import List, Optional
+
+from ..core.config import settings
+from ..core.text_search import text_search
+from ..core.vector_search import vector_search
+from .complaint_neighbors import complaint_neighbors
+
+# Text behind complaints.search_tsv (lexical side of hybrid search)
+COMPLAINTS_SEARCH_TEXT = "coalesce(category, '') || ' ' || description"
+
+# B-tree indexes on complaints; on the partitioned table each one is
+# created on every partition
+COMPLAINT_INDEXES = [
+    "CREATE INDEX IF NOT EXISTS idx_complaints_ward ON complaints(ward_number)",
+    "CREATE INDEX IF NOT EXISTS idx_complaints_status ON complaints(status)",
+    "CREATE INDEX IF NOT EXISTS idx_complaints_category ON complaints(category)",
+    "CREATE INDEX IF NOT EXISTS idx_complaints_date ON complaints(date DESC)",
+    "CREATE INDEX IF NOT EXISTS idx_complaints_user ON complaints(user_id)",
+    # Keyset pages of a citizen's own complaints (/complaints/mine)
+    "CREATE INDEX IF NOT EXISTS idx_complaints_user_date ON complaints(user_id, date DESC, id DESC)",
+]
+
+# Final complaint statuses (PUT /complaints/update accepts
+# pending/in_progress/resolved/rejected); a month is only archived once
+# every complaint in it has one of these
+FINAL_STATUSES = ("resolved", "rejected")
+
+DEFAULT_PARTITION = "complaints_default"
+PARTITION_PATTERN = re.compile(r"^complaints_(\d{4})_(\d{2})$")
+
+
+def month_start(value) -> date:
+    """First day of the month containing `value` (date or datetime)"""
+    return date(value.year, value.month, 1)
+
+
+def add_months(month: date, months: int) -> date:
+    """First day of the month `months` after (or before) `month`"""
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    """Name of the partition holding `month`, e.g. complaints_2025_07"""
+    return f"complaints_{month:%Y_%m}"
+
+
+def recent_window_start(months: int, today: Optional[date] = None) -> Optional[datetime]:
+    """
+    Start of the default search window: the current month and the
+    `months` - 1 before it
+
+    Window edges fall on partition bounds, so a windowed query touches
+    exactly `months` partitions.
+
+    Args:
+        months: Window length in months (0 = no window)
+        today: Reference date (defaults to today)
+
+    Returns:
+        Inclusive lower bound for complaints.date, or None for no window
+    """
+    if months <= 0:
+        return None
+    start = add_months(month_start(today or date.today()), -(months - 1))
+    return datetime(start.year, start.month, start.day)
+
+
+def stored_columns(cursor, table: str) -> List[str]:
+    """
+    A table's stored columns in table order
+
+    Generated columns (search_tsv) are left out, since they cannot be
+    inserted into. Reading them from the catalog keeps columns this code
+    does not know about, such as those of the comprehensive schema.
+
+    Args:
+        cursor: Database cursor (tuple or RealDictCursor)
+        table: Table name in the current schema
+    """
+    cursor.execute(
+        """
+        SELECT column_name FROM information_schema.columns
+        WHERE table_schema = current_schema() AND table_name = %s AND is_generated = 'NEVER'
+        ORDER BY ordinal_position
+        """,
+        (table,)
+    )
+    return [row['column_name'] if isinstance(row, dict) else row[0] for row in cursor.fetchall()]
+
+
+def is_partitioned(cursor, table: str = "complaints") -> bool:
+    """
+    Whether a table is partitioned (its indexes cannot be built CONCURRENTLY)
+
+    Args:
+        cursor: Database cursor (tuple or RealDictCursor)
+        table: Table name
+    """
+    cursor.execute("SELECT relkind = 'p' AS partitioned FROM pg_class WHERE oid = to_regclass(%s)", (table,))
+    row = cursor.fetchone()
+    if not row:
+        return False
+    return row['partitioned'] if isinstance(row, dict) else row[0]
+
+
+class ComplaintPartitions:
+    """
+    Declarative monthly partitioning of complaints on `date`
+
+    The primary key becomes (id, date), since a unique constraint on a
+    partitioned table must contain the partition key; ids still come from
+    complaints_id_seq and stay unique. Queries filtering on `date` (the
+    search window, dashboard trends, keyset pages) only scan the matching
+    partitions, and every partition carries its own HNSW, GIN and b-tree
+    indexes, so the indexes of live months stay small.
+
+    - ensure_partitions() creates the months from `since` up to
+      `premake_months` ahead, plus a DEFAULT partition that catches
+      anything outside them. Rows already sitting in the default
+      partition are moved into a month when it is created.
+    - archive() detaches months older than `retention_months` whose
+      complaints are all closed (FINAL_STATUSES) and moves them into
+      `archive_schema`. They leave every query, index and count, but stay
+      restorable with restore(). Months that still hold open complaints
+      are kept.
+    """
+
+    def __init__(
+        self,
+        retention_months: int = 24,
+        premake_months: int = 3,
+        archive_schema: str = "archive"
+    ):
+        """
+        Args:
+            retention_months: Months kept attached (the current one included)
+            premake_months: Future months created ahead of time
+            archive_schema: Schema detached partitions are moved into
+        """
+        self.retention_months = retention_months
+        self.premake_months = premake_months
+        self.archive_schema = archive_schema
+
+    def table_statements(self) -> List[str]:
+        """
+        DDL for the partitioned complaints table (a no-op if it exists)
+
+        Returns:
+            List of SQL statements
+        """
+        return [
+            "CREATE SEQUENCE IF NOT EXISTS complaints_id_seq AS INTEGER",
+            f"""
+            CREATE TABLE IF NOT EXISTS complaints (
+                id INTEGER NOT NULL DEFAULT nextval('complaints_id_seq'),
+                user_id INTEGER NOT NULL REFERENCES citizens(id) ON DELETE CASCADE,
+                ward_number INTEGER NOT NULL,
+                category VARCHAR(100) NOT NULL,
+                description TEXT NOT NULL,
+                status VARCHAR(20) NOT NULL DEFAULT 'pending',
+                date TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+                embedding {vector_search.column_type},
+                embedding_model VARCHAR(100),
+                neighbors_model VARCHAR(100),
+                {text_search.column_definition(COMPLAINTS_SEARCH_TEXT)},
+                PRIMARY KEY (id, date)
+            ) PARTITION BY RANGE (date)
+            """,
+            "ALTER SEQUENCE complaints_id_seq OWNED BY complaints.id"
+        ]
+
+    def like_statements(self, source: str) -> List[str]:
+        """
+        DDL for a partitioned complaints table with every column of an
+        existing table, plus the columns this application adds
+
+        Columns, defaults, generated columns and CHECK constraints come from
+        `source`; foreign keys and triggers are not copied by LIKE and have
+        to be re-created by the caller.
+
+        Args:
+            source: Existing (unpartitioned) complaints table
+
+        Returns:
+            List of SQL statements
+        """
+        return [
+            "CREATE SEQUENCE IF NOT EXISTS complaints_id_seq AS INTEGER",
+            f"""
+            CREATE TABLE complaints (
+                LIKE {source} INCLUDING DEFAULTS INCLUDING GENERATED INCLUDING CONSTRAINTS
+            ) PARTITION BY RANGE (date)
+            """,
+            f"ALTER TABLE complaints ADD COLUMN IF NOT EXISTS embedding {vector_search.column_type}",
+            "ALTER TABLE complaints ADD COLUMN IF NOT EXISTS embedding_model VARCHAR(100)",
+            "ALTER TABLE complaints ADD COLUMN IF NOT EXISTS neighbors_model VARCHAR(100)",
+            "ALTER TABLE complaints ALTER COLUMN id SET DEFAULT nextval('complaints_id_seq')",
+            "ALTER TABLE complaints ALTER COLUMN date SET NOT NULL",
+            "ALTER TABLE complaints ADD PRIMARY KEY (id, date)",
+            "ALTER SEQUENCE complaints_id_seq OWNED BY complaints.id"
+        ]
+
+    def partitions(self, cursor) -> List[dict]:
+        """
+        Attached partitions, oldest month first
+
+        Args:
+            cursor: Database cursor (RealDictCursor)
+
+        Returns:
+            List of dicts with name, month (None for the default partition)
+            and estimated rows
+        """
+        cursor.execute(
+            """
+            SELECT c.relname AS name, greatest(c.reltuples, 0)::bigint AS rows
+            FROM pg_inherits i
+            JOIN pg_class c ON c.oid = i.inhrelid
+            WHERE i.inhparent = 'complaints'::regclass
+            """
+        )
+        found = []
+        for row in cursor.fetchall():
+            match = PARTITION_PATTERN.match(row['name'])
+            month = date(int(match.group(1)), int(match.group(2)), 1) if match else None
+            found.append({"name": row['name'], "month": month, "rows": row['rows']})
+        return sorted(found, key=lambda partition: (partition["month"] is None, partition["month"] or date.min))
+
+    def ensure_partitions(self, cursor, since: Optional[date] = None) -> List[str]:
+        """
+        Create missing monthly partitions and the default partition
+
+        Args:
+            cursor: Database cursor (RealDictCursor; the caller commits)
+            since: First month to cover (defaults to the retention window)
+
+        Returns:
+            Names of the partitions created
+        """
+        current = month_start(date.today())
+        month = month_start(since) if since else add_months(current, -(self.retention_months - 1))
+        last = add_months(current, self.premake_months)
+
+        cursor.execute(f"CREATE TABLE IF NOT EXISTS {DEFAULT_PARTITION} PARTITION OF complaints DEFAULT")
+        existing = {partition["name"] for partition in self.partitions(cursor)}
+        created = []
+        while month <= last:
+            name = partition_name(month)
+            if name not in existing:
+                self._create_partition(cursor, name, month, add_months(month, 1))
+                created.append(name)
+            month = add_months(month, 1)
+        return created
+
+    def _create_partition(self, cursor, name: str, start: date, end: date):
+        """Create one month, moving in any of its rows the default partition holds"""
+        cursor.execute(
+            f"SELECT EXISTS (SELECT 1 FROM {DEFAULT_PARTITION} WHERE date >= %s AND date < %s) AS found",
+            (start, end)
+        )
+        if not cursor.fetchone()['found']:
+            cursor.execute(
+                f"CREATE TABLE {name} PARTITION OF complaints FOR VALUES FROM (%s) TO (%s)",
+                (start, end)
+            )
+            return
+
+        # Postgres refuses a new partition whose range has rows in the default
+        # partition: build it standalone, move the rows, then attach it
+        columns = ", ".join(stored_columns(cursor, "complaints"))
+        cursor.execute(
+            f"CREATE TABLE {name} (LIKE complaints INCLUDING DEFAULTS INCLUDING GENERATED INCLUDING CONSTRAINTS)"
+        )
+        cursor.execute(
+            f"""
+            WITH moved AS (
+                DELETE FROM {DEFAULT_PARTITION} WHERE date >= %s AND date < %s
+                RETURNING {columns}
+            )
+            INSERT INTO {name} ({columns}) SELECT {columns} FROM moved
+            """,
+            (start, end)
+        )
+        cursor.execute(
+            f"ALTER TABLE complaints ATTACH PARTITION {name} FOR VALUES FROM (%s) TO (%s)",
+            (start, end)
+        )
+
+    def archive(self, cursor, dry_run: bool = False) -> List[dict]:
+        """
+        Detach fully closed months older than the retention window into
+        the archive schema
+
+        Their neighbour list entries and leftover embedding jobs are
+        deleted, since the complaints no longer exist for the API.
+
+        Args:
+            cursor: Database cursor (RealDictCursor; the caller commits)
+            dry_run: Only report what would be archived
+
+        Returns:
+            List of dicts with partition, rows, open (rows not in a final status) and
+            action ("archived", "would archive" or "kept")
+        """
+        cutoff = add_months(month_start(date.today()), -(self.retention_months - 1))
+        report = []
+        for partition in self.partitions(cursor):
+            if partition["month"] is None or partition["month"] >= cutoff:
+                continue
+            name = partition["name"]
+            cursor.execute(
+                f"""
+                SELECT count(*) AS rows,
+                       count(*) FILTER (WHERE status <> ALL(%s)) AS open
+                FROM {name}
+                """,
+                (list(FINAL_STATUSES),)
+            )
+            counts = cursor.fetchone()
+            entry = {"partition": name, "rows": counts['rows'], "open": counts['open']}
+            if counts['open']:
+                entry["action"] = "kept"
+            elif dry_run:
+                entry["action"] = "would archive"
+            else:
+                self._detach(cursor, name)
+                entry["action"] = "archived"
+            report.append(entry)
+        return report
+
+    def _detach(self, cursor, name: str):
+        """Move one partition out of complaints and into the archive schema"""
+        cursor.execute(f"SELECT id FROM {name}")
+        ids = [row['id'] for row in cursor.fetchall()]
+        if ids:
+            complaint_neighbors.remove(cursor, ids)
+            cursor.execute(
+                "DELETE FROM embedding_jobs WHERE table_name = 'complaints' AND row_id = ANY(%s)",
+                (ids,)
+            )
+        cursor.execute(f"CREATE SCHEMA IF NOT EXISTS {self.archive_schema}")
+        cursor.execute(f"ALTER TABLE complaints DETACH PARTITION {name}")
+        cursor.execute(f"ALTER TABLE {name} SET SCHEMA {self.archive_schema}")
+
+    def archived(self, cursor) -> List[str]:
+        """
+        Partitions in the archive schema, oldest first
+
+        Args:
+            cursor: Database cursor (RealDictCursor)
+        """
+        cursor.execute(
+            "SELECT tablename FROM pg_tables WHERE schemaname = %s AND tablename ~ %s ORDER BY tablename",
+            (self.archive_schema, PARTITION_PATTERN.pattern)
+        )
+        return [row['tablename'] for row in cursor.fetchall()]
+
+    def restore(self, cursor, name: str):
+        """
+        Re-attach an archived month
+
+        Its complaints get their neighbour lists marked stale, so
+        `build_complaint_neighbors.py --stale-only` rebuilds them.
+
+        Args:
+            cursor: Database cursor (RealDictCursor; the caller commits)
+            name: Partition name, e.g. complaints_2023_01
+
+        Raises:
+            ValueError: If `name` is not an archived monthly partition
+        """
+        match = PARTITION_PATTERN.match(name)
+        if not match or name not in self.archived(cursor):
+            raise ValueError(f"{name} is not an archived complaints partition")
+        start = date(int(match.group(1)), int(match.group(2)), 1)
+
+        cursor.execute("SELECT current_schema() AS schema")
+        schema = cursor.fetchone()['schema']
+        cursor.execute(f"ALTER TABLE {self.archive_schema}.{name} SET SCHEMA {schema}")
+        cursor.execute(
+            f"ALTER TABLE complaints ATTACH PARTITION {name} FOR VALUES FROM (%s) TO (%s)",
+            (start, add_months(start, 1))
+        )
+        cursor.execute(f"UPDATE {name} SET neighbors_model = NULL")
+
+
+# Create global complaint partitions instance
+complaint_partitions = ComplaintPartitions(
+    retention_months=settings.COMPLAINTS_RETENTION_MONTHS,
+    premake_months=settings.COMPLAINTS_PARTITION_PREMAKE_MONTHS,
+    archive_schema=settings.COMPLAINTS_ARCHIVE_SCHEMA
+)
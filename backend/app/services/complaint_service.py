@@ -3,18 +3,41 @@ Complaint Service
 Business logic for complaint management and AI-powered search
 """
 
+import asyncio
+import time
 from datetime import datetime
 from typing import List, Optional
 from fastapi import HTTPException, status
-from ..core.database import Database
+from ..core.async_database import AsyncDatabase
+from ..core.config import settings
+from ..core.text_search import rrf_fusion, text_search
+from ..core.vector_search import vector_search
+from ..core.ward_search import ward_search
 from ..models.complaint import ComplaintSubmit, ComplaintResponse, SearchQuery, ComplaintSubmitResponse
 from .embedding_service import embedding_service
+from .embedding_queue import embedding_queue
+from .complaint_neighbors import complaint_neighbors
+from .complaint_partitions import recent_window_start
+from .search_cache import normalize_query, search_cache
+from .vector_index import vector_index
+from ..utils.pagination import (
+    InvalidCursorError, decode_cursor, encode_cursor, keyset_after, next_page, query_fingerprint
+)
+
+# search_complaints modes (see its docstring)
+SEARCH_MODES = ("vector", "text", "hybrid")
+
+# Similar complaints returned with a new submission
+SUBMIT_SIMILAR_LIMIT = 3
+
+# Fire-and-forget tasks (asyncio only keeps weak references to tasks)
+_background_tasks = set()
 
 class ComplaintService:
     """Handle complaint-related operations"""
     
     @staticmethod
-    def submit_complaint(
+    async def submit_complaint(
         complaint_data: ComplaintSubmit,
         user_id: int
     ) -> ComplaintSubmitResponse:
@@ -28,53 +51,138 @@ class ComplaintService:
         Returns:
             ComplaintSubmitResponse with complaint_id and similar complaints
         """
-        with Database.get_cursor() as cursor:
-            # Generate embedding for complaint description
-            embedding = embedding_service.get_embedding(complaint_data.description)
-            embedding_str = embedding_service.embedding_to_postgres_string(embedding)
-            
-            # Insert complaint
-            cursor.execute(
-                """
-                INSERT INTO complaints (user_id, ward_number, category, description, status, date, embedding)
-                VALUES (%s, %s, %s, %s, %s, %s, %s::vector)
-                RETURNING id
-                """,
-                (
-                    user_id,
-                    complaint_data.ward,
-                    complaint_data.category,
-                    complaint_data.description,
-                    'pending',
-                    datetime.now(),
-                    embedding_str
+        # Embed once, before borrowing a connection
+        try:
+            embedding = await embedding_service.get_embedding_async(complaint_data.description)
+        except Exception as e:
+            print(f"⚠️ Embedding deferred to queue: {e}")
+            embedding = None
+        
+        insert_params = [
+            user_id,
+            complaint_data.ward,
+            complaint_data.category,
+            complaint_data.description,
+            'pending',
+            datetime.now()
+        ]
+        
+        if embedding is None:
+            # Store it now; the background queue embeds it shortly
+            async with AsyncDatabase.get_cursor() as cursor:
+                await cursor.execute(
+                    """
+                    INSERT INTO complaints (user_id, ward_number, category, description, status, date)
+                    VALUES (%s, %s, %s, %s, %s, %s)
+                    RETURNING id
+                    """,
+                    insert_params
                 )
+                complaint_id = (await cursor.fetchone())['id']
+                await embedding_queue.enqueue_async(cursor, "complaints", complaint_id)
+            embedding_queue.notify()
+            search_cache.invalidate("complaints", complaint_data.ward)
+            return ComplaintSubmitResponse(
+                message="Complaint submitted successfully",
+                complaint_id=complaint_id,
+                similar_complaints=[]
             )
-            complaint_id = cursor.fetchone()['id']
-            
-            # Find similar complaints
-            similar = ComplaintService._find_similar_internal(
+        
+        version = embedding_service.version
+        
+        async with AsyncDatabase.get_cursor() as cursor:
+            # Exact scan, partial index or widened HNSW, by ward size
+            nearest_sql, nearest_params = await ward_search.nearest_async(
                 cursor,
-                complaint_data.description,
+                embedding,
                 complaint_data.ward,
-                exclude_id=complaint_id
+                complaint_neighbors.k,
+                where="embedding_model = %s",
+                params=[version]
             )
             
-            return ComplaintSubmitResponse(
-                message="Complaint submitted successfully",
-                complaint_id=complaint_id,
-                similar_complaints=similar[:3]
+            # Insert, find similar complaints and store them as the new row's
+            # neighbour list in one statement. The search runs on the statement's
+            # snapshot, which does not include the new row; the join condition
+            # makes the exclusion explicit.
+            sql = f"""
+                WITH inserted AS (
+                    INSERT INTO complaints
+                        (user_id, ward_number, category, description, status, date,
+                         embedding, embedding_model, neighbors_model)
+                    VALUES (%s, %s, %s, %s, %s, %s, %s::{vector_search.column_type}, %s, %s)
+                    RETURNING id
+                ),
+                neighbors AS (
+                    SELECT inserted.id AS complaint_id, nearest.id, nearest.ward_number,
+                           nearest.description, nearest.category, nearest.status, nearest.date,
+                           nearest.distance
+                    FROM inserted
+                    LEFT JOIN {nearest_sql} AS nearest ON nearest.id <> inserted.id
+                ),
+                stored AS (
+                    INSERT INTO complaint_neighbors (complaint_id, neighbor_id, similarity)
+                    SELECT complaint_id, id, 1 - distance FROM neighbors WHERE id IS NOT NULL
+                )
+                SELECT complaint_id, id, ward_number, description, category, status, date,
+                       1 - distance AS similarity_score
+                FROM neighbors
+                ORDER BY distance
+            """
+            await cursor.execute(sql, [*insert_params, embedding, version, version, *nearest_params])
+            rows = await cursor.fetchall()
+        complaint_id = rows[0]['complaint_id']
+        search_cache.invalidate("complaints", complaint_data.ward)
+        
+        # Offer the new complaint to its neighbours' lists after responding
+        ComplaintService._spawn(ComplaintService._propagate_neighbors(complaint_id))
+        
+        return ComplaintSubmitResponse(
+            message="Complaint submitted successfully",
+            complaint_id=complaint_id,
+            similar_complaints=ComplaintService._similar_responses(
+                [r for r in rows if r['id'] is not None][:SUBMIT_SIMILAR_LIMIT]
             )
+        )
+    
+    @staticmethod
+    def _spawn(coroutine):
+        """Run a coroutine in the background, keeping a reference until it finishes"""
+        task = asyncio.create_task(coroutine)
+        _background_tasks.add(task)
+        task.add_done_callback(_background_tasks.discard)
+    
+    @staticmethod
+    async def _propagate_neighbors(complaint_id: int):
+        """Add a new complaint to existing neighbour lists (best effort)"""
+        try:
+            async with AsyncDatabase.get_cursor() as cursor:
+                await complaint_neighbors.propagate_async(cursor, [complaint_id])
+        except Exception as e:
+            # The next build_complaint_neighbors.py run catches up
+            print(f"⚠️ Neighbour refresh failed for complaint {complaint_id}: {e}")
     
     @staticmethod
-    def search_complaints(
+    async def search_complaints(
         search_query: SearchQuery,
         user_role: str,
         user_id: int,
         user_ward: str
     ) -> dict:
         """
-        AI-powered semantic search across complaints
+        Search complaints by meaning, by keywords, or both
+        
+        The mode comes from the query's `mode` field (default
+        SEARCH_DEFAULT_MODE):
+        - vector: semantic nearest neighbours of the query embedding
+        - text: Postgres full-text search, for exact identifiers such as
+          road names or ticket numbers
+        - hybrid: both candidate sets fused with reciprocal rank fusion in
+          one statement; relevance_score is then the fused RRF score
+        
+        Only complaints from the last SEARCH_RECENT_MONTHS months are
+        searched (so older partitions are pruned) unless the query sets
+        `include_history`; the response's `since` is the window start.
         
         Args:
             search_query: Search query parameters
@@ -82,67 +190,253 @@ class ComplaintService:
             user_id: ID of user
             user_ward: Ward of user
             
+        Pass the response's `next_cursor` back as the query's `cursor` to
+        get the next page; it is null on the last page.
+        
+        Responses are cached briefly (see SearchCache); `cached` tells
+        whether this one was, in which case timings only has total_ms.
+        
         Returns:
-            Dictionary with search results
+            Dictionary with search results, the mode used and per-stage
+            timings in milliseconds
         """
-        with Database.get_cursor() as cursor:
-            # Generate query embedding
-            query_embedding = embedding_service.get_embedding(search_query.query)
-            embedding_str = embedding_service.embedding_to_postgres_string(query_embedding)
+        mode = getattr(search_query, 'mode', None) or settings.SEARCH_DEFAULT_MODE
+        if mode not in SEARCH_MODES:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Unknown search mode '{mode}' (expected one of: {', '.join(SEARCH_MODES)})"
+            )
+        
+        # Officers only see their ward; citizens and admins share one scope
+        scope = f"officer:{user_ward}" if user_role == 'officer' else "all"
+        include_history = bool(getattr(search_query, 'include_history', False))
+        query_key = (
+            normalize_query(search_query.query), search_query.ward, scope, search_query.limit, mode, include_history
+        )
+        
+        # Results are ranked by relevance, so the cursor records how far
+        # into the ranking the client is, tied to this exact search
+        fingerprint = query_fingerprint(*query_key)
+        offset = 0
+        token = getattr(search_query, 'cursor', None)
+        if token:
+            position = decode_cursor(token, ("offset", "query"))
+            offset = position["offset"]
+            if position["query"] != fingerprint or not isinstance(offset, int) or offset < 0:
+                raise InvalidCursorError("Cursor does not belong to this search")
+        
+        since = None if include_history else recent_window_start(settings.SEARCH_RECENT_MONTHS)
+        cache_ward = search_query.ward or (int(user_ward) if user_role == 'officer' and user_ward else None)
+        started = time.perf_counter()
+        response, cached = await search_cache.get_or_compute(
+            "complaints",
+            cache_ward,
+            (*query_key, offset),
+            lambda: ComplaintService._search_complaints(
+                search_query, mode, user_role, user_ward, since, offset, fingerprint
+            )
+        )
+        if cached:
+            return {
+                **response,
+                "cached": True,
+                "timings": {"total_ms": round((time.perf_counter() - started) * 1000, 2)}
+            }
+        return {**response, "cached": False}
+    
+    @staticmethod
+    async def _search_complaints(
+        search_query: SearchQuery,
+        mode: str,
+        user_role: str,
+        user_ward: str,
+        since: Optional[datetime],
+        offset: int,
+        fingerprint: str
+    ) -> dict:
+        """Run one search_complaints() page against the database (cache miss)"""
+        timings = {}
+        started = time.perf_counter()
+        
+        # Generate query embedding before borrowing a connection
+        query_embedding = None
+        if mode != "text":
+            query_embedding = await embedding_service.get_embedding_async(search_query.query)
+            timings["embed_ms"] = round((time.perf_counter() - started) * 1000, 2)
+        
+        # Apply ward filter if specified
+        conditions = []
+        filter_params = []
+        if search_query.ward:
+            conditions.append("ward_number = %s")
+            filter_params.append(search_query.ward)
+        
+        # Apply role-based filtering
+        # Citizens can search all complaints if no ward specified, otherwise that ward
+        if user_role == 'officer':
+            conditions.append("ward_number = %s")
+            filter_params.append(user_ward)
+        
+        # A date bound lets the planner skip partitions outside the window
+        if since is not None:
+            conditions.append("date >= %s")
+            filter_params.append(since)
+        
+        # Rank through the end of this page, plus one row to detect a next page.
+        # Hybrid ranks a deeper candidate list from each search before fusing.
+        candidates = offset + search_query.limit + 1
+        if mode == "hybrid":
+            candidates = max(candidates, settings.SEARCH_HYBRID_CANDIDATES)
+        
+        query_started = time.perf_counter()
+        async with AsyncDatabase.get_cursor() as cursor:
+            # Rank inside the candidate subqueries so the HNSW / GIN indexes are used
+            if mode != "text":
+                # Vectors from other model versions live in a different space
+                vector_where = " AND ".join(["embedding_model = %s", *conditions])
+                vector_params = [embedding_service.version, *filter_params]
+                ward = search_query.ward or (user_ward if user_role == 'officer' else None)
+                ranked = None
+                if settings.VECTOR_INDEX_ENABLED:
+                    # In-process index; None means Postgres has to answer
+                    ranked = await vector_index.search(
+                        "complaints", query_embedding, candidates, wards=[ward] if ward else None, since=since
+                    )
+                if ranked is not None:
+                    vector = vector_index.candidates_sql("complaints", ranked, where=vector_where, params=vector_params)
+                elif ward:
+                    # Strategy chosen by ward size; the ward filter is already in `conditions`
+                    vector = await ward_search.nearest_async(
+                        cursor, query_embedding, ward, candidates, where=vector_where, params=vector_params
+                    )
+                else:
+                    vector = vector_search.nearest(
+                        "complaints", query_embedding, candidates, where=vector_where, params=vector_params
+                    )
+            if mode != "vector":
+                # Lexical matches do not need an embedding yet
+                text = text_search.matches(
+                    "complaints",
+                    search_query.query,
+                    candidates,
+                    where=" AND ".join(conditions) or "TRUE",
+                    params=filter_params
+                )
+            
+            if mode == "vector":
+                ranked_sql, params = vector
+                score, order = "1 - c.distance", "c.distance, c.id"
+            elif mode == "text":
+                ranked_sql, params = text
+                score, order = "c.text_rank", "c.text_rank DESC, c.id"
+            else:
+                ranked_sql, params = rrf_fusion(vector, text, k=settings.SEARCH_RRF_K)
+                score, order = "f.score", "f.score DESC, f.id"
             
-            # Build search query
-            sql = """
+            if mode == "hybrid":
+                ranked_sql = f"{ranked_sql} AS f JOIN complaints c ON c.id = f.id"
+                # The fused list carries ids only; without the window every
+                # attached partition's primary key would be probed per id
+                if since is not None:
+                    ranked_sql += " AND c.date >= %s"
+                    params = [*params, since]
+            else:
+                ranked_sql = f"{ranked_sql} AS c"
+            sql = f"""
                 SELECT c.id, c.ward_number, c.category, c.description, c.status, c.date,
                        u.name as citizen_name,
-                       1 - (c.embedding <=> %s::vector) AS relevance_score
-                FROM complaints c
+                       {score} AS relevance_score
+                FROM {ranked_sql}
                 JOIN citizens u ON c.user_id = u.id
-                WHERE 1=1
+                ORDER BY {order}
+                LIMIT %s OFFSET %s
             """
-            params = [embedding_str]
-            
-            # Apply ward filter if specified
-            if search_query.ward:
-                sql += " AND c.ward_number = %s"
-                params.append(search_query.ward)
-            
-            # Apply role-based filtering
-            if user_role == 'citizen':
-                # Citizens can search all complaints if no ward specified, otherwise their ward
-                if search_query.ward:
-                    sql += " AND c.ward_number = %s"
-                    params.append(search_query.ward)
-                # No additional filter for citizens - they can search all
-            elif user_role == 'officer':
-                sql += " AND c.ward_number = %s"
-                params.append(user_ward)
+            params = [*params, search_query.limit + 1, offset]
             
-            sql += " ORDER BY relevance_score DESC LIMIT %s"
-            params.append(search_query.limit)
-            
-            cursor.execute(sql, params)
-            results = cursor.fetchall()
+            await cursor.execute(sql, params)
+            results = await cursor.fetchall()
+        finished = time.perf_counter()
+        next_cursor = None
+        if len(results) > search_query.limit:
+            results = results[:search_query.limit]
+            next_cursor = encode_cursor({"offset": offset + search_query.limit, "query": fingerprint})
+        timings["query_ms"] = round((finished - query_started) * 1000, 2)
+        timings["total_ms"] = round((finished - started) * 1000, 2)
+        
+        return {
+            "results": [
+                ComplaintResponse(
+                    id=r['id'],
+                    ward=r['ward_number'],
+                    category=r['category'],
+                    description=r['description'],
+                    status=r['status'],
+                    date=r['date'].isoformat(),
+                    citizen_name=r['citizen_name'],
+                    relevance_score=float(r['relevance_score'])
+                )
+                for r in results
+            ],
+            "query": search_query.query,
+            "mode": mode,
+            "since": since.isoformat() if since else None,
+            "total_found": len(results),
+            "next_cursor": next_cursor,
+            "timings": timings
+        }
+    
+    @staticmethod
+    async def list_user_complaints(
+        user_id: int,
+        limit: int = 20,
+        cursor: Optional[str] = None
+    ) -> dict:
+        """
+        List a citizen's own complaints, newest first
+        
+        Args:
+            user_id: ID of the complaining citizen
+            limit: Page size
+            cursor: next_cursor from the previous page
             
-            return {
-                "results": [
-                    ComplaintResponse(
-                        id=r['id'],
-                        ward=r['ward_number'],
-                        category=r['category'],
-                        description=r['description'],
-                        status=r['status'],
-                        date=r['date'].isoformat(),
-                        citizen_name=r['citizen_name'],
-                        relevance_score=float(r['relevance_score'])
-                    )
-                    for r in results
-                ],
-                "query": search_query.query,
-                "total_found": len(results)
-            }
+        Returns:
+            Dictionary with complaints and next_cursor (None on the last page)
+        """
+        # Seek on (user_id, date, id) so every page is one short index range
+        after_sql, after_params = keyset_after(cursor, "c.date", "c.id")
+        async with AsyncDatabase.get_cursor() as db_cursor:
+            await db_cursor.execute(
+                f"""
+                SELECT c.id, c.ward_number, c.category, c.description, c.status, c.date,
+                       u.name as citizen_name
+                FROM complaints c
+                JOIN citizens u ON c.user_id = u.id
+                WHERE c.user_id = %s AND {after_sql}
+                ORDER BY c.date DESC, c.id DESC
+                LIMIT %s
+                """,
+                (user_id, *after_params, limit + 1)
+            )
+            rows, next_cursor = next_page(await db_cursor.fetchall(), limit)
+        
+        return {
+            "complaints": [
+                ComplaintResponse(
+                    id=r['id'],
+                    ward=r['ward_number'],
+                    category=r['category'],
+                    description=r['description'],
+                    status=r['status'],
+                    date=r['date'].isoformat(),
+                    citizen_name=r['citizen_name']
+                )
+                for r in rows
+            ],
+            "next_cursor": next_cursor
+        }
     
     @staticmethod
-    def get_similar_issues(complaint_id: int) -> dict:
+    async def get_similar_issues(complaint_id: int) -> dict:
         """
         Find complaints similar to a specific complaint
         
@@ -152,35 +446,43 @@ class ComplaintService:
         Returns:
             Dictionary with similar complaints
         """
-        with Database.get_cursor() as cursor:
-            # Fetch the original complaint
-            cursor.execute(
-                "SELECT description, ward_number FROM complaints WHERE id = %s",
-                (complaint_id,)
-            )
-            complaint = cursor.fetchone()
-            
-            if not complaint:
+        async with AsyncDatabase.get_cursor() as cursor:
+            # Precomputed neighbours: one indexed lookup
+            found = await complaint_neighbors.lookup_async(cursor, complaint_id)
+            if found is None:
                 raise HTTPException(
                     status_code=status.HTTP_404_NOT_FOUND,
                     detail="Complaint not found"
                 )
             
-            # Find similar complaints
-            similar = ComplaintService._find_similar_internal(
-                cursor,
-                complaint['description'],
-                complaint['ward_number'],
-                exclude_id=complaint_id
-            )
-            
-            return {
-                "complaint_id": complaint_id,
-                "similar_issues": similar
-            }
+            complaint = found['complaint']
+            version = embedding_service.version
+            if complaint['neighbors_model'] != version and complaint['embedding_model'] == version:
+                # List missing or built for an older model: build it from the stored vector
+                await complaint_neighbors.build_async(cursor, [complaint_id])
+                found = await complaint_neighbors.lookup_async(cursor, complaint_id)
+                complaint = found['complaint']
+        
+        if complaint['neighbors_model'] == version:
+            similar = ComplaintService._similar_responses(found['neighbors'])
+        else:
+            # Not embedded yet (queued): embed the description, with no connection held
+            query_embedding = await embedding_service.get_embedding_async(complaint['description'])
+            async with AsyncDatabase.get_cursor() as cursor:
+                similar = await ComplaintService._find_similar_internal(
+                    cursor,
+                    query_embedding,
+                    complaint['ward_number'],
+                    exclude_id=complaint_id
+                )
+        
+        return {
+            "complaint_id": complaint_id,
+            "similar_issues": similar
+        }
     
     @staticmethod
-    def update_complaint_status(
+    async def update_complaint_status(
         complaint_id: int,
         new_status: str,
         user_role: str,
@@ -204,14 +506,14 @@ class ComplaintService:
                 detail="Insufficient permissions"
             )
         
-        with Database.get_cursor() as cursor:
+        async with AsyncDatabase.get_cursor() as cursor:
             # Verify ward access for officers
             if user_role == 'officer':
-                cursor.execute(
+                await cursor.execute(
                     "SELECT ward_number FROM complaints WHERE id = %s",
                     (complaint_id,)
                 )
-                complaint = cursor.fetchone()
+                complaint = await cursor.fetchone()
                 if not complaint or complaint['ward_number'] != user_ward:
                     raise HTTPException(
                         status_code=status.HTTP_403_FORBIDDEN,
@@ -219,17 +521,20 @@ class ComplaintService:
                     )
             
             # Update status
-            cursor.execute(
-                "UPDATE complaints SET status = %s WHERE id = %s",
+            await cursor.execute(
+                "UPDATE complaints SET status = %s WHERE id = %s RETURNING ward_number",
                 (new_status, complaint_id)
             )
-            
-            return {"message": "Status updated successfully"}
+            updated = await cursor.fetchone()
+        
+        if updated is not None:
+            search_cache.invalidate("complaints", updated['ward_number'])
+        return {"message": "Status updated successfully"}
     
     @staticmethod
-    def _find_similar_internal(
+    async def _find_similar_internal(
         cursor,
-        query_text: str,
+        query_embedding,
         ward: str,
         exclude_id: Optional[int] = None,
         limit: int = 5
@@ -238,8 +543,8 @@ class ComplaintService:
         Internal helper to find similar complaints
         
         Args:
-            cursor: Database cursor
-            query_text: Text to find similar complaints for
+            cursor: Async database cursor
+            query_embedding: Embedding of the text to find similar complaints for
             ward: Ward to search within
             exclude_id: Optional complaint ID to exclude
             limit: Maximum number of results
@@ -247,29 +552,36 @@ class ComplaintService:
         Returns:
             List of similar complaints
         """
-        # Generate query embedding
-        query_embedding = embedding_service.get_embedding(query_text)
-        embedding_str = embedding_service.embedding_to_postgres_string(query_embedding)
-        
         # Build similarity search query
-        sql = """
-            SELECT id, ward_number, description, category, status, date,
-                   1 - (embedding <=> %s::vector) AS similarity_score
-            FROM complaints
-            WHERE ward_number = %s
-        """
-        params = [embedding_str, ward]
+        conditions = ["embedding_model = %s"]
+        filter_params = [embedding_service.version]
         
         if exclude_id:
-            sql += " AND id != %s"
-            params.append(exclude_id)
-        
-        sql += " ORDER BY similarity_score DESC LIMIT %s"
-        params.append(limit)
+            conditions.append("id != %s")
+            filter_params.append(exclude_id)
         
-        cursor.execute(sql, params)
-        results = cursor.fetchall()
+        # Exact scan, partial index or widened HNSW, by ward size
+        nearest_sql, params = await ward_search.nearest_async(
+            cursor,
+            query_embedding,
+            ward,
+            limit,
+            where=" AND ".join(conditions),
+            params=filter_params
+        )
+        sql = f"""
+            SELECT id, ward_number, description, category, status, date,
+                   1 - distance AS similarity_score
+            FROM {nearest_sql} AS nearest
+            ORDER BY distance
+        """
         
+        await cursor.execute(sql, params)
+        return ComplaintService._similar_responses(await cursor.fetchall())
+    
+    @staticmethod
+    def _similar_responses(rows: list) -> List[ComplaintResponse]:
+        """Build similar-complaint responses from rows with a similarity_score"""
         return [
             ComplaintResponse(
                 id=r['id'],
@@ -280,7 +592,7 @@ class ComplaintService:
                 date=r['date'].isoformat(),
                 similarity_score=float(r['similarity_score'])
             )
-            for r in results
+            for r in rows
         ]
 
 # Create complaint service instance
@@ -0,0 +1,370 @@
+"""
+Embedding Backfill Service
+Streams rows without embeddings (or, when re-embedding, rows embedded by an
+older model version), encodes them in length-sorted batches and writes them
+back in bulk, checkpointing progress so runs can resume
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+from psycopg2.extras import execute_values
+from psycopg2.extensions import cursor as TupleCursor
+
+from ..core.database import Database
+from ..core.vector_search import vector_search
+from .embedding_service import embedding_service
+
+# Every table with an `embedding VECTOR(384)` column in
+# database/comprehensive_schema.sql, mapped to the SQL expression whose text
+# is embedded. Keep these in sync with the write paths that embed on insert.
+EMBEDDED_TABLES: Dict[str, str] = {
+    "complaints": "description",
+    "reports": "report_text",
+    "announcements": "concat_ws('. ', title, body)",
+    "roads": "concat_ws('. ', name, road_type, location, condition_rating)",
+    "bridges": "concat_ws('. ', name, bridge_type, status)",
+    "publicfacilities": "concat_ws('. ', name, facility_type, address)",
+    "transportroutes": "concat_ws('. ', route_number, route_name, start_point, end_point)",
+    "poweroutages": "concat_ws('. ', location, affected_area, cause)",
+    "waterissues": "concat_ws('. ', issue_type, location, description)",
+    "garbagecomplaints": "concat_ws('. ', complaint_type, location, description)",
+    "parks": "concat_ws('. ', name, park_type)",
+    "trees": "concat_ws('. ', tree_species, health_status, location)",
+    "crimeincidents": "concat_ws('. ', incident_type, location, description)",
+    "emergencyincidents": "concat_ws('. ', incident_type, location, description)",
+    "businesses": "concat_ws('. ', business_name, business_type, location)",
+    "educationalinstitutions": "concat_ws('. ', name, institution_type, address)",
+    "healthcarefacilities": "concat_ws('. ', name, facility_type, address)",
+    "constructionprojects": "concat_ws('. ', project_name, project_type, description)",
+    "constructioncomplaints": "concat_ws('. ', complaint_type, location, description)",
+    "citizenfeedback": "concat_ws('. ', service_type, feedback_text)",
+    "communityevents": "concat_ws('. ', event_name, event_type, description)",
+}
+
+# Model behind every vector stored before embedding_model was tracked
+LEGACY_EMBEDDING_VERSION = "all-MiniLM-L6-v2"
+
+CHECKPOINT_TABLE_SQL = """
+    CREATE TABLE IF NOT EXISTS embedding_backfill_state (
+        table_name VARCHAR(100) PRIMARY KEY,
+        last_id BIGINT NOT NULL DEFAULT 0,
+        rows_done BIGINT NOT NULL DEFAULT 0,
+        updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+    )
+"""
+
+
+class BackfillJob:
+    """
+    Backfill embeddings for one table
+
+    Reads with a server-side named cursor in chunks of `chunk_size` rows,
+    encodes each chunk in length-sorted batches of `batch_size`, writes the
+    chunk with one UPDATE ... FROM (VALUES ...) and records the last id in
+    embedding_backfill_state in the same transaction. The checkpoint only
+    lets an interrupted run resume; it is cleared once the run reaches the
+    end of the table, so the next run rescans from the first id and picks
+    up rows whose embedding was reset below the old high-water mark.
+
+    In re-embed mode the job selects rows whose embedding_model differs from
+    the active version instead of rows with no embedding. Old vectors stay in
+    place (and out of search results) until their row is rewritten, so the
+    API keeps serving throughout; `rate_limit` caps rows per second so the
+    migration does not compete with production queries.
+    """
+
+    def __init__(
+        self,
+        table: str,
+        chunk_size: int = 5000,
+        batch_size: int = 64,
+        restart: bool = False,
+        reembed: bool = False,
+        rate_limit: float = 0.0
+    ):
+        """
+        Args:
+            table: Table name (key of EMBEDDED_TABLES)
+            chunk_size: Rows fetched and written per transaction
+            batch_size: Texts per model call
+            restart: Ignore any saved checkpoint and start from the first id
+            reembed: Rewrite vectors from other model versions, not just missing ones
+            rate_limit: Maximum rows embedded per second (0 = unlimited)
+        """
+        if table not in EMBEDDED_TABLES:
+            raise ValueError(f"No embedding source defined for table: {table}")
+        self.table = table
+        self.text_expr = EMBEDDED_TABLES[table]
+        self.chunk_size = chunk_size
+        self.batch_size = batch_size
+        self.restart = restart
+        self.reembed = reembed
+        self.rate_limit = rate_limit
+        self.version = embedding_service.version
+        self.rows_done = 0
+        self._encoded = 0
+        self._started = None
+
+        if reembed:
+            # Each target version migrates independently of the plain backfill
+            self.checkpoint_key = f"{table}@{self.version}"
+            self.pending_sql = "t.embedding_model IS DISTINCT FROM %s"
+            self.guard_sql = "t.embedding_model IS DISTINCT FROM v.embedding_model"
+        else:
+            self.checkpoint_key = table
+            self.pending_sql = "t.embedding IS NULL"
+            self.guard_sql = self.pending_sql
+
+    def run(self) -> int:
+        """
+        Run the backfill to completion
+
+        Returns:
+            Number of rows embedded in this run
+        """
+        read_conn = Database.get_connection()
+        write_conn = Database.get_connection()
+        try:
+            if not self._prepare(write_conn):
+                print(f"  [{self.table}] skipped: table or embedding column not found")
+                return 0
+
+            checkpoint = self._load_checkpoint(write_conn)
+            last_id = 0 if self.restart else checkpoint
+            total = self._count_pending(write_conn, last_id)
+            if last_id and not total:
+                # The previous run got through its last chunk but not the cleanup
+                self._clear_checkpoint(write_conn)
+                last_id = 0
+                total = self._count_pending(write_conn, last_id)
+            if last_id:
+                print(f"  [{self.table}] resuming after id {last_id}")
+            if not total:
+                return 0
+            mode = f"re-embedding to {self.version}" if self.reembed else "embedding"
+            print(f"  [{self.table}] {mode} {total} rows")
+
+            self._started = time.perf_counter()
+            with read_conn.cursor(name=f"backfill_{self.table}", cursor_factory=TupleCursor) as reader:
+                reader.itersize = self.chunk_size
+                reader.execute(
+                    f"""
+                    SELECT t.id, {self.text_expr} AS text
+                    FROM {self.table} AS t
+                    WHERE {self.pending_sql} AND t.id > %s
+                    ORDER BY t.id
+                    """,
+                    self._pending_params() + (last_id,)
+                )
+                while True:
+                    rows = reader.fetchmany(self.chunk_size)
+                    if not rows:
+                        break
+                    last_id = self._process_chunk(write_conn, rows)
+                    self._report(total, last_id)
+            read_conn.commit()
+            self._clear_checkpoint(write_conn)
+            return self.rows_done
+        finally:
+            read_conn.close()
+            write_conn.close()
+
+    def _pending_params(self) -> tuple:
+        """Query parameters for pending_sql"""
+        return (self.version,) if self.reembed else ()
+
+    def _process_chunk(self, conn, rows: list) -> int:
+        """Encode one chunk and write it back with its checkpoint"""
+        ids = [row[0] for row in rows]
+        texts = [row[1] or "" for row in rows]
+
+        # Similar lengths per batch keep padding (and wasted compute) low
+        order = sorted(range(len(texts)), key=lambda i: len(texts[i]))
+        vectors = [None] * len(texts)
+        for start in range(0, len(order), self.batch_size):
+            self._throttle()
+            batch = order[start:start + self.batch_size]
+            embeddings = embedding_service.get_embeddings_batch(
+                [texts[i] for i in batch],
+                use_cache=False,
+                show_progress_bar=False
+            )
+            for i, embedding in zip(batch, embeddings):
+                vectors[i] = embedding
+            self._encoded += len(batch)
+
+        last_id = ids[-1]
+        with conn.cursor() as cursor:
+            # Re-checking the pending condition skips rows the API rewrote meanwhile
+            execute_values(
+                cursor,
+                f"""
+                UPDATE {self.table} AS t
+                SET embedding = v.embedding::{vector_search.column_type},
+                    embedding_model = v.embedding_model
+                FROM (VALUES %s) AS v(id, embedding, embedding_model)
+                WHERE t.id = v.id
+                  AND {self.guard_sql}
+                """,
+                [(row_id, vector, self.version) for row_id, vector in zip(ids, vectors)],
+                page_size=len(ids)
+            )
+            cursor.execute(
+                """
+                INSERT INTO embedding_backfill_state (table_name, last_id, rows_done, updated_at)
+                VALUES (%s, %s, %s, CURRENT_TIMESTAMP)
+                ON CONFLICT (table_name) DO UPDATE
+                SET last_id = EXCLUDED.last_id,
+                    rows_done = embedding_backfill_state.rows_done + EXCLUDED.rows_done,
+                    updated_at = EXCLUDED.updated_at
+                """,
+                (self.checkpoint_key, last_id, len(ids))
+            )
+        conn.commit()
+        self.rows_done += len(ids)
+        return last_id
+
+    def _throttle(self):
+        """Sleep until the rows encoded so far fit under rate_limit"""
+        if self.rate_limit <= 0:
+            return
+        ahead = self._encoded / self.rate_limit - (time.perf_counter() - self._started)
+        if ahead > 0:
+            time.sleep(ahead)
+
+    def _report(self, total: int, last_id: int):
+        """Print progress with throughput and an ETA"""
+        elapsed = time.perf_counter() - self._started
+        rate = self.rows_done / elapsed if elapsed else 0.0
+        remaining = max(total - self.rows_done, 0)
+        eta = f"{remaining / rate:.0f}s" if rate else "?"
+        print(f"  [{self.table}] {self.rows_done}/{total} rows "
+              f"({100.0 * self.rows_done / total:.1f}%, last id {last_id}, "
+              f"{rate:.0f} rows/s, ETA {eta})")
+
+    def _prepare(self, conn) -> bool:
+        """
+        Check the table exists here with an embedding column, and add the
+        embedding_model column where an older schema lacks it
+        """
+        with conn.cursor() as cursor:
+            cursor.execute(
+                """
+                SELECT column_name FROM information_schema.columns
+                WHERE table_schema = current_schema()
+                  AND table_name = %s AND column_name IN ('embedding', 'embedding_model')
+                """,
+                (self.table,)
+            )
+            columns = {row['column_name'] for row in cursor.fetchall()}
+            if 'embedding' in columns and 'embedding_model' not in columns:
+                cursor.execute(f"ALTER TABLE {self.table} ADD COLUMN embedding_model VARCHAR(100)")
+        conn.commit()
+        return 'embedding' in columns
+
+    def _count_pending(self, conn, last_id: int) -> int:
+        """Count rows this run still has to embed"""
+        with conn.cursor() as cursor:
+            cursor.execute(
+                f"SELECT count(*) AS pending FROM {self.table} AS t WHERE {self.pending_sql} AND t.id > %s",
+                self._pending_params() + (last_id,)
+            )
+            pending = cursor.fetchone()['pending']
+        conn.commit()
+        return pending
+
+    def _load_checkpoint(self, conn) -> int:
+        """Create the checkpoint table if needed and read this job's last id"""
+        with conn.cursor() as cursor:
+            cursor.execute(CHECKPOINT_TABLE_SQL)
+            cursor.execute(
+                "SELECT last_id FROM embedding_backfill_state WHERE table_name = %s",
+                (self.checkpoint_key,)
+            )
+            row = cursor.fetchone()
+        conn.commit()
+        return row['last_id'] if row else 0
+
+    def _clear_checkpoint(self, conn):
+        """Forget this job's last id once the table has been read to the end"""
+        with conn.cursor() as cursor:
+            cursor.execute(
+                "DELETE FROM embedding_backfill_state WHERE table_name = %s",
+                (self.checkpoint_key,)
+            )
+        conn.commit()
+
+
+def get_version_counts(tables: Optional[List[str]] = None) -> Dict[str, Dict[str, int]]:
+    """
+    Count stored vectors per model version
+
+    Args:
+        tables: Tables to inspect (defaults to every EMBEDDED_TABLES entry)
+
+    Returns:
+        {table: {version: rows}}; rows without a vector count under "(none)"
+        and vectors with no recorded version under "(unknown)"
+    """
+    counts = {}
+    with Database.get_cursor() as cursor:
+        for table in tables or list(EMBEDDED_TABLES):
+            cursor.execute(
+                """
+                SELECT count(*) AS found FROM information_schema.columns
+                WHERE table_schema = current_schema()
+                  AND table_name = %s AND column_name = 'embedding_model'
+                """,
+                (table,)
+            )
+            if not cursor.fetchone()['found']:
+                continue
+            cursor.execute(
+                f"""
+                SELECT CASE WHEN embedding IS NULL THEN '(none)'
+                            ELSE coalesce(embedding_model, '(unknown)') END AS version,
+                       count(*) AS rows
+                FROM {table}
+                GROUP BY 1
+                ORDER BY 1
+                """
+            )
+            counts[table] = {row['version']: row['rows'] for row in cursor.fetchall()}
+    return counts
+
+
+def run_backfill(
+    tables: Optional[List[str]] = None,
+    workers: int = 2,
+    chunk_size: int = 5000,
+    batch_size: int = 64,
+    restart: bool = False,
+    reembed: bool = False,
+    rate_limit: float = 0.0
+) -> Dict[str, int]:
+    """
+    Backfill several tables, `workers` of them in parallel
+
+    Args:
+        tables: Tables to process (defaults to every EMBEDDED_TABLES entry)
+        workers: Tables processed concurrently
+        chunk_size: Rows per fetch/write transaction
+        batch_size: Texts per model call
+        restart: Ignore saved checkpoints
+        reembed: Rewrite vectors from other model versions as well
+        rate_limit: Maximum rows per second for each table (0 = unlimited)
+
+    Returns:
+        Rows embedded per table
+    """
+    tables = tables or list(EMBEDDED_TABLES)
+    jobs = [
+        BackfillJob(table, chunk_size, batch_size, restart, reembed, rate_limit)
+        for table in tables
+    ]
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        counts = executor.map(lambda job: job.run(), jobs)
+        return dict(zip(tables, counts))
@@ -0,0 +1,201 @@
+"""
+Embedding Batcher
+Coalesces concurrent single-text embedding requests into batched model calls
+"""
+
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, List
+
+from ..utils.stats import percentile
+
+
+class EmbeddingBatcher:
+    """
+    Micro-batching scheduler in front of the embedding model
+
+    Callers submit one text at a time and block on a Future. A single
+    background thread drains the queue, waiting at most `max_wait_ms` after
+    the first pending request (or until `max_batch_size` texts are queued),
+    encodes the whole batch with one model call and resolves each caller's
+    Future with its own vector. With `concurrency` > 1, up to that many
+    batches are encoded at once (e.g. one per worker process); while every
+    slot is busy, new requests keep accumulating into the next batch.
+    """
+
+    def __init__(
+        self,
+        encode_batch: Callable[[List[str]], list],
+        max_batch_size: int = 32,
+        max_wait_ms: float = 5.0,
+        concurrency: int = 1,
+        stats_window: int = 1000
+    ):
+        """
+        Args:
+            encode_batch: Function mapping a list of texts to a list of vectors
+            max_batch_size: Upper bound on texts per model call
+            max_wait_ms: How long to hold the first request while collecting more
+            concurrency: Number of batches allowed in flight at once
+            stats_window: Number of recent batches kept for statistics
+        """
+        self._encode_batch = encode_batch
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max_wait_ms / 1000.0
+
+        self._queue = queue.Queue()
+        self._thread = None
+        self._start_lock = threading.Lock()
+        self.concurrency = max(1, concurrency)
+        self._slots = threading.Semaphore(self.concurrency)
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.concurrency,
+            thread_name_prefix="embedding-batch"
+        ) if self.concurrency > 1 else None
+        self._in_flight = 0
+
+        # Rolling statistics for tuning the batching window
+        self._stats_lock = threading.Lock()
+        self._batch_sizes = deque(maxlen=stats_window)
+        self._wait_times_ms = deque(maxlen=stats_window)
+        self._total_requests = 0
+        self._total_batches = 0
+        self._errors = 0
+
+    def submit(self, text: str) -> Future:
+        """
+        Queue a text for embedding
+
+        Args:
+            text: Input text string
+
+        Returns:
+            Future resolving to the embedding vector
+        """
+        self._ensure_started()
+        future = Future()
+        self._queue.put((text, future, time.perf_counter()))
+        return future
+
+    def embed(self, text: str) -> list:
+        """Submit a text and block until its embedding is ready"""
+        return self.submit(text).result()
+
+    def get_stats(self) -> dict:
+        """
+        Report queue depth, batch-size and wait-time statistics
+
+        Returns:
+            Dictionary of batching metrics
+        """
+        with self._stats_lock:
+            sizes = list(self._batch_sizes)
+            waits = sorted(self._wait_times_ms)
+            stats = {
+                "queue_depth": self._queue.qsize(),
+                "max_batch_size": self.max_batch_size,
+                "max_wait_ms": self.max_wait * 1000.0,
+                "batches_in_flight": self._in_flight,
+                "total_requests": self._total_requests,
+                "total_batches": self._total_batches,
+                "errors": self._errors,
+                "avg_batch_size": (sum(sizes) / len(sizes)) if sizes else 0.0,
+                "max_observed_batch_size": max(sizes) if sizes else 0,
+            }
+        stats["wait_ms_p50"] = percentile(waits, 50)
+        stats["wait_ms_p95"] = percentile(waits, 95)
+        stats["wait_ms_max"] = waits[-1] if waits else 0.0
+        return stats
+
+    def _ensure_started(self):
+        """Start the scheduler thread on first use"""
+        if self._thread is not None:
+            return
+        with self._start_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run,
+                    name="embedding-batcher",
+                    daemon=True
+                )
+                self._thread.start()
+
+    def _collect_batch(self) -> list:
+        """Block for the first request, then gather more until the window closes"""
+        batch = [self._queue.get()]
+        deadline = time.perf_counter() + self.max_wait
+
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+
+        # Anything already queued rides along without extending the window
+        while len(batch) < self.max_batch_size:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        """Scheduler loop: wait for a free slot, collect, hand the batch off"""
+        while True:
+            self._slots.acquire()
+            handed_off = False
+            try:
+                batch = self._collect_batch()
+                with self._stats_lock:
+                    self._in_flight += 1
+                handed_off = True
+                if self._executor is None:
+                    self._process(batch)
+                else:
+                    self._executor.submit(self._process, batch)
+            except Exception as e:
+                # This is the only scheduler thread; keep it alive for later requests
+                print(f"⚠️ Embedding batcher error: {e}")
+                if not handed_off:
+                    self._slots.release()
+
+    def _process(self, batch: list):
+        """Encode one batch and fan the results back out to the callers"""
+        try:
+            # Drop callers that gave up (a cancelled await cancels its Future);
+            # the remaining Futures can no longer be cancelled
+            batch = [item for item in batch if item[1].set_running_or_notify_cancel()]
+            if not batch:
+                return
+            started = time.perf_counter()
+            texts = [text for text, _, _ in batch]
+
+            try:
+                vectors = self._encode_batch(texts)
+            except Exception as e:
+                with self._stats_lock:
+                    self._errors += 1
+                for _, future, _ in batch:
+                    future.set_exception(e)
+                return
+
+            for (_, future, _), vector in zip(batch, vectors):
+                future.set_result(vector)
+
+            with self._stats_lock:
+                self._total_requests += len(batch)
+                self._total_batches += 1
+                self._batch_sizes.append(len(batch))
+                self._wait_times_ms.extend(
+                    (started - enqueued) * 1000.0 for _, _, enqueued in batch
+                )
+        finally:
+            with self._stats_lock:
+                self._in_flight -= 1
+            self._slots.release()
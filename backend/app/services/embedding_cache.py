@@ -0,0 +1,193 @@
+"""
+Embedding Cache
+Content-addressed cache for text embeddings with an LRU memory tier
+and an optional SQLite tier that survives restarts
+"""
+
+import hashlib
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+import numpy as np
+
+
+def normalize_text(text: str) -> str:
+    """
+    Normalize text before hashing
+    Collapses whitespace and lowercases (all-MiniLM-L6-v2 uses an uncased tokenizer)
+    """
+    return " ".join(text.split()).lower()
+
+
+class EmbeddingCache:
+    """
+    Two-tier embedding cache keyed by model name and SHA-256 of normalized text
+
+    The memory tier is a bounded LRU. When `disk_path` is set, entries are also
+    written to a SQLite file; memory misses fall back to it and promote hits.
+    """
+
+    def __init__(self, model_name: str, max_entries: int = 10000, disk_path: Optional[str] = None):
+        """
+        Args:
+            model_name: Model that produced the vectors (part of every key)
+            max_entries: Maximum entries held in memory
+            disk_path: Optional SQLite file for the persistent tier
+        """
+        self.model_name = model_name
+        self.max_entries = max(1, max_entries)
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+
+        self._disk = None
+        if disk_path:
+            self._disk = sqlite3.connect(disk_path, check_same_thread=False)
+            self._disk.execute("PRAGMA journal_mode=WAL")
+            self._disk.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings (key TEXT PRIMARY KEY, vector BLOB NOT NULL)"
+            )
+            self._disk.commit()
+
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def make_key(self, text: str) -> str:
+        """Build the content address for a text"""
+        digest = hashlib.sha256(normalize_text(text).encode("utf-8")).hexdigest()
+        return f"{self.model_name}:{digest}"
+
+    def get(self, text: str) -> Optional[np.ndarray]:
+        """
+        Look up a cached embedding
+
+        Args:
+            text: Input text string
+
+        Returns:
+            Embedding vector, or None on a miss
+        """
+        return self.get_many([text])[0]
+
+    def get_many(self, texts: List[str]) -> List[Optional[np.ndarray]]:
+        """
+        Look up cached embeddings for several texts
+
+        Args:
+            texts: List of text strings
+
+        Returns:
+            List aligned with `texts`, None where the cache missed
+        """
+        keys = [self.make_key(text) for text in texts]
+        results = [None] * len(keys)
+        missing = {}
+
+        with self._lock:
+            for i, key in enumerate(keys):
+                vector = self._entries.get(key)
+                if vector is not None:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    results[i] = vector
+                else:
+                    missing.setdefault(key, []).append(i)
+
+        if missing and self._disk is not None:
+            found = self._disk_get(list(missing))
+            with self._lock:
+                for key, vector in found.items():
+                    self.disk_hits += len(missing[key])
+                    self._remember(key, vector)
+                    for i in missing.pop(key):
+                        results[i] = vector
+
+        with self._lock:
+            self.misses += sum(len(indexes) for indexes in missing.values())
+        return results
+
+    def put(self, text: str, vector: np.ndarray):
+        """Store an embedding for a text"""
+        self.put_many([text], [vector])
+
+    def put_many(self, texts: List[str], vectors: List[np.ndarray]):
+        """
+        Store embeddings for several texts
+
+        Args:
+            texts: List of text strings
+            vectors: Embedding vectors aligned with `texts`
+        """
+        # Stored read-only so callers cannot mutate a shared cached vector
+        items = {}
+        for text, vector in zip(texts, vectors):
+            vector = np.array(vector, dtype=np.float32)
+            vector.flags.writeable = False
+            items[self.make_key(text)] = vector
+        with self._lock:
+            for key, vector in items.items():
+                self._remember(key, vector)
+
+        if self._disk is not None:
+            rows = [
+                (key, vector.tobytes())
+                for key, vector in items.items()
+            ]
+            with self._lock:
+                self._disk.executemany(
+                    "INSERT OR REPLACE INTO embeddings (key, vector) VALUES (?, ?)",
+                    rows
+                )
+                self._disk.commit()
+
+    def clear(self):
+        """Drop all in-memory entries (the disk tier is kept)"""
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self) -> dict:
+        """
+        Report cache counters
+
+        Returns:
+            Dictionary with size, hit/miss and eviction counts
+        """
+        with self._lock:
+            lookups = self.hits + self.disk_hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": ((self.hits + self.disk_hits) / lookups) if lookups else 0.0,
+                "disk_tier": self._disk is not None
+            }
+
+    def _remember(self, key: str, vector: np.ndarray):
+        """Insert into the LRU tier, evicting the oldest entries (lock held)"""
+        self._entries[key] = vector
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def _disk_get(self, keys: List[str]) -> Dict[str, np.ndarray]:
+        """Fetch entries from the SQLite tier"""
+        found = {}
+        with self._lock:
+            # Stay well under SQLite's bound-parameter limit
+            for start in range(0, len(keys), 500):
+                chunk = keys[start:start + 500]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._disk.execute(
+                    f"SELECT key, vector FROM embeddings WHERE key IN ({placeholders})",
+                    chunk
+                ).fetchall()
+                for key, blob in rows:
+                    found[key] = np.frombuffer(blob, dtype=np.float32)
+        return found
@@ -0,0 +1,153 @@
+"""
+Embedding Engines
+Pluggable inference backends that turn texts into normalized vectors
+"""
+
+import os
+from typing import List
+
+import numpy as np
+
+# Max cosine distance allowed between the int8 ONNX engine and the torch
+# engine for the same text (checked by benchmarks/embedding_engines.py).
+# Dynamic int8 quantization of all-MiniLM-L6-v2 typically stays above 0.99
+# cosine similarity; anything below 0.98 means a bad export.
+ONNX_COSINE_TOLERANCE = 0.02
+
+
+class EmbeddingEngine:
+    """
+    Base class for embedding backends
+
+    Subclasses load their model in __init__ and implement encode().
+    """
+
+    name = "base"
+
+    def encode(self, texts: List[str], show_progress_bar: bool = False) -> np.ndarray:
+        """
+        Encode texts into L2-normalized vectors
+
+        Args:
+            texts: List of text strings
+            show_progress_bar: Display encoding progress where supported
+
+        Returns:
+            float32 array of shape (len(texts), dimension)
+        """
+        raise NotImplementedError
+
+
+class TorchEngine(EmbeddingEngine):
+    """Reference backend: PyTorch SentenceTransformer"""
+
+    name = "torch"
+
+    def __init__(self, model_name: str, threads: int = 0):
+        """
+        Args:
+            model_name: SentenceTransformers model name or path
+            threads: torch intra-op threads (0 keeps the torch default)
+        """
+        import torch
+        from sentence_transformers import SentenceTransformer
+
+        if threads > 0:
+            torch.set_num_threads(threads)
+        self.model = SentenceTransformer(model_name)
+
+    def encode(self, texts: List[str], show_progress_bar: bool = False) -> np.ndarray:
+        return self.model.encode(
+            texts,
+            normalize_embeddings=True,
+            show_progress_bar=show_progress_bar,
+            convert_to_numpy=True
+        ).astype(np.float32, copy=False)
+
+
+class OnnxEngine(EmbeddingEngine):
+    """
+    CPU backend: int8-quantized ONNX Runtime graph of the same model
+
+    Expects a directory produced by export_onnx_model.py containing
+    `model_int8.onnx` and `tokenizer.json`. Pooling and normalization mirror
+    SentenceTransformer (mean over non-padding tokens, then L2).
+    """
+
+    name = "onnx"
+
+    def __init__(self, model_dir: str, threads: int = 0, max_seq_length: int = 256, dimension: int = 384):
+        """
+        Args:
+            model_dir: Directory holding the exported model and tokenizer
+            threads: ONNX Runtime intra-op threads (0 keeps the runtime default)
+            max_seq_length: Token limit, matching the SentenceTransformer config
+            dimension: Output vector dimension
+        """
+        import onnxruntime as ort
+        from tokenizers import Tokenizer
+
+        self.dimension = dimension
+        model_path = os.path.join(model_dir, "model_int8.onnx")
+        tokenizer_path = os.path.join(model_dir, "tokenizer.json")
+        if not os.path.exists(model_path):
+            raise FileNotFoundError(
+                f"{model_path} not found - run `python export_onnx_model.py` first"
+            )
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if threads > 0:
+            options.intra_op_num_threads = threads
+        self.session = ort.InferenceSession(
+            model_path,
+            sess_options=options,
+            providers=["CPUExecutionProvider"]
+        )
+        self.input_names = {i.name for i in self.session.get_inputs()}
+
+        self.tokenizer = Tokenizer.from_file(tokenizer_path)
+        self.tokenizer.enable_truncation(max_length=max_seq_length)
+        self.tokenizer.enable_padding(pad_id=0, pad_token="[PAD]")
+
+    def encode(self, texts: List[str], show_progress_bar: bool = False) -> np.ndarray:
+        if not texts:
+            return np.zeros((0, self.dimension), dtype=np.float32)
+
+        encodings = self.tokenizer.encode_batch(list(texts))
+        input_ids = np.array([e.ids for e in encodings], dtype=np.int64)
+        attention_mask = np.array([e.attention_mask for e in encodings], dtype=np.int64)
+        feeds = {"input_ids": input_ids, "attention_mask": attention_mask}
+        if "token_type_ids" in self.input_names:
+            feeds["token_type_ids"] = np.array([e.type_ids for e in encodings], dtype=np.int64)
+
+        token_embeddings = self.session.run(None, feeds)[0]
+
+        # Mean pooling over real tokens
+        mask = attention_mask[..., None].astype(np.float32)
+        summed = (token_embeddings * mask).sum(axis=1)
+        counts = np.clip(mask.sum(axis=1), 1e-9, None)
+        pooled = summed / counts
+
+        norms = np.linalg.norm(pooled, axis=1, keepdims=True)
+        return (pooled / np.clip(norms, 1e-12, None)).astype(np.float32)
+
+
+def create_engine(engine: str, model_name: str, onnx_dir: str = "", threads: int = 0) -> EmbeddingEngine:
+    """
+    Build an embedding engine by name
+
+    Args:
+        engine: "torch" or "onnx"
+        model_name: SentenceTransformers model (torch engine)
+        onnx_dir: Exported model directory (onnx engine)
+        threads: Intra-op threads for the backend (0 = backend default)
+
+    Returns:
+        Loaded EmbeddingEngine
+    """
+    if engine == "torch":
+        return TorchEngine(model_name, threads=threads)
+    if engine == "onnx":
+        return OnnxEngine(onnx_dir, threads=threads)
+    raise ValueError(f"Unknown embedding engine: {engine}")
@@ -0,0 +1,268 @@
+"""
+Embedding Process Pool
+Runs the embedding model in worker processes so encoding escapes the GIL
+"""
+
+import atexit
+import multiprocessing as mp
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from multiprocessing import shared_memory
+from typing import List
+
+import numpy as np
+
+
+def _worker_main(engine: str, model_name: str, onnx_dir: str, shm_name: str,
+                 max_batch_size: int, dimension: int, threads: int, conn):
+    """
+    Worker process entry point
+
+    Loads its own copy of the model, then serves batches received over the
+    pipe. Vectors are written into the worker's shared-memory block and only
+    the row count is sent back.
+    """
+    from .embedding_engines import create_engine
+
+    model = create_engine(engine, model_name, onnx_dir=onnx_dir, threads=max(1, threads))
+    shm = shared_memory.SharedMemory(name=shm_name)
+    out = np.ndarray((max_batch_size, dimension), dtype=np.float32, buffer=shm.buf)
+    conn.send(("ready", None))
+
+    try:
+        while True:
+            texts = conn.recv()
+            if texts is None:
+                break
+            try:
+                vectors = model.encode(texts)
+                out[:len(texts)] = vectors
+                conn.send(("ok", len(texts)))
+            except Exception as e:
+                conn.send(("error", repr(e)))
+    finally:
+        del out
+        shm.close()
+
+
+class _Worker:
+    """Parent-side handle for one worker process"""
+
+    def __init__(self, process, conn, shm, out):
+        self.process = process
+        self.conn = conn
+        self.shm = shm
+        self.out = out
+
+
+class ProcessPoolEncoder:
+    """
+    Pool of N processes, each holding its own embedding model
+
+    Callers borrow an idle worker from a queue, send it a batch of texts and
+    read the resulting vectors out of that worker's shared-memory block.
+    Batches larger than `max_batch_size` are split and spread across workers.
+    A worker found dead (crashed mid-batch or while idle) is replaced, with
+    a fresh shared-memory block, before its slot is handed out again.
+    """
+
+    def __init__(
+        self,
+        model_name: str,
+        workers: int,
+        engine: str = "torch",
+        onnx_dir: str = "",
+        dimension: int = 384,
+        max_batch_size: int = 64,
+        threads: int = 1,
+        startup_timeout: float = 300.0
+    ):
+        """
+        Args:
+            model_name: SentenceTransformers model each worker loads
+            workers: Number of worker processes
+            engine: Embedding engine each worker runs ("torch" or "onnx")
+            onnx_dir: Exported model directory for the onnx engine
+            dimension: Embedding dimension
+            max_batch_size: Largest batch a worker encodes in one call
+            threads: Intra-op threads per worker (keep workers * threads <= cores)
+            startup_timeout: Seconds to wait for every worker to load its model
+        """
+        self.name = f"{engine}-pool"
+        self.model_name = model_name
+        self.dimension = dimension
+        self.max_batch_size = max_batch_size
+        self.size = max(1, workers)
+
+        # Spawn so workers never inherit the parent's torch/thread state
+        self._ctx = mp.get_context("spawn")
+        self._worker_args = (engine, model_name, onnx_dir, max_batch_size, dimension, threads)
+        self.startup_timeout = startup_timeout
+        self._workers: List[_Worker] = []
+        self._idle = queue.Queue()
+        self._splitter = ThreadPoolExecutor(max_workers=self.size, thread_name_prefix="embedding-pool")
+        self._closed = False
+
+        self._stats_lock = threading.Lock()
+        self._batches = 0
+        self._texts = 0
+        self._busy_seconds = 0.0
+        self._errors = 0
+        self._respawns = 0
+
+        for _ in range(self.size):
+            self._workers.append(self._start_worker())
+
+        for index, worker in enumerate(self._workers):
+            if not self._wait_ready(worker):
+                self.close()
+                raise RuntimeError(f"Embedding worker {index} did not start within {startup_timeout}s")
+            self._idle.put(index)
+
+        atexit.register(self.close)
+        print(f"Embedding process pool ready: {self.size} workers")
+
+    def encode(self, texts: List[str], show_progress_bar: bool = False) -> np.ndarray:
+        """
+        Encode texts on the pool
+
+        Args:
+            texts: List of text strings
+            show_progress_bar: Ignored; workers encode silently
+
+        Returns:
+            float32 array of normalized vectors, in input order
+        """
+        if not texts:
+            return np.zeros((0, self.dimension), dtype=np.float32)
+        chunks = [
+            texts[start:start + self.max_batch_size]
+            for start in range(0, len(texts), self.max_batch_size)
+        ]
+        if len(chunks) == 1:
+            return self._encode_chunk(chunks[0])
+        return np.vstack(list(self._splitter.map(self._encode_chunk, chunks)))
+
+    def get_stats(self) -> dict:
+        """
+        Report pool utilization
+
+        Returns:
+            Dictionary with worker counts and throughput counters
+        """
+        with self._stats_lock:
+            return {
+                "workers": self.size,
+                "idle_workers": self._idle.qsize(),
+                "alive_workers": sum(1 for w in self._workers if w.process.is_alive()),
+                "batches": self._batches,
+                "texts": self._texts,
+                "busy_seconds": round(self._busy_seconds, 3),
+                "errors": self._errors,
+                "respawns": self._respawns
+            }
+
+    def close(self):
+        """Stop the workers and release shared memory"""
+        if self._closed:
+            return
+        self._closed = True
+        self._splitter.shutdown(wait=False)
+        for worker in self._workers:
+            try:
+                worker.conn.send(None)
+            except (BrokenPipeError, OSError):
+                pass
+        for worker in self._workers:
+            self._release(worker)
+
+    def _start_worker(self) -> _Worker:
+        """Start one worker process with its own shared-memory block"""
+        engine, model_name, onnx_dir, max_batch_size, dimension, threads = self._worker_args
+        shm = shared_memory.SharedMemory(create=True, size=max_batch_size * dimension * 4)
+        parent_conn, child_conn = self._ctx.Pipe()
+        process = self._ctx.Process(
+            target=_worker_main,
+            args=(engine, model_name, onnx_dir, shm.name, max_batch_size, dimension, threads, child_conn),
+            daemon=True
+        )
+        process.start()
+        # Only the child holds its end now, so recv() raises EOFError if it dies
+        child_conn.close()
+        out = np.ndarray((max_batch_size, dimension), dtype=np.float32, buffer=shm.buf)
+        return _Worker(process, parent_conn, shm, out)
+
+    def _wait_ready(self, worker: _Worker) -> bool:
+        """Wait for a worker to load its model"""
+        try:
+            if not worker.conn.poll(self.startup_timeout):
+                return False
+            worker.conn.recv()
+            return True
+        except (EOFError, OSError):
+            return False
+
+    @staticmethod
+    def _release(worker: _Worker):
+        """Stop a worker (if still running) and free its pipe and shared memory"""
+        if worker.shm is None:
+            return
+        worker.process.join(timeout=5)
+        if worker.process.is_alive():
+            worker.process.terminate()
+            worker.process.join(timeout=5)
+        worker.conn.close()
+        worker.out = None
+        worker.shm.close()
+        worker.shm.unlink()
+        worker.shm = None
+
+    def _replace_worker(self, index: int):
+        """Swap a dead worker for a fresh one (the caller holds its slot)"""
+        self._release(self._workers[index])
+        worker = self._start_worker()
+        if not self._wait_ready(worker):
+            self._release(worker)
+            raise RuntimeError(f"Replacement embedding worker {index} did not start")
+        self._workers[index] = worker
+        with self._stats_lock:
+            self._respawns += 1
+        print(f"⚠️ Embedding worker {index} had exited; started a replacement")
+
+    def _encode_chunk(self, texts: List[str]) -> np.ndarray:
+        """Run one batch (<= max_batch_size texts) on an idle worker"""
+        index = self._idle.get()
+        try:
+            if not self._workers[index].process.is_alive():
+                self._replace_worker(index)
+            worker = self._workers[index]
+            started = time.perf_counter()
+            try:
+                worker.conn.send(list(texts))
+                status, payload = worker.conn.recv()
+            except (EOFError, OSError) as e:
+                # Died mid-batch; a replacement is started below
+                worker.process.join(timeout=5)
+                raise RuntimeError(f"Embedding worker {index} exited mid-batch") from e
+            if status != "ok":
+                raise RuntimeError(f"Embedding worker {index} failed: {payload}")
+            vectors = worker.out[:payload].copy()
+        except Exception:
+            with self._stats_lock:
+                self._errors += 1
+            raise
+        finally:
+            try:
+                if not self._closed and not self._workers[index].process.is_alive():
+                    self._replace_worker(index)
+            except Exception as e:
+                print(f"⚠️ Could not replace embedding worker {index}: {e}")
+            self._idle.put(index)
+
+        with self._stats_lock:
+            self._batches += 1
+            self._texts += len(texts)
+            self._busy_seconds += time.perf_counter() - started
+        return vectors
@@ -0,0 +1,341 @@
+"""
+Embedding Queue
+Postgres-backed outbox for embedding work: write paths insert their row and
+an embedding job in one transaction, and worker threads embed pending rows
+in batches after the request has returned
+"""
+
+import threading
+from typing import Dict, List
+
+from psycopg2.extras import execute_values
+
+from ..core.config import settings
+from ..core.database import Database
+from ..core.vector_search import vector_search
+from .complaint_neighbors import complaint_neighbors
+from .embedding_backfill import EMBEDDED_TABLES
+from .embedding_service import embedding_service
+from .search_cache import search_cache
+
+EMBEDDING_JOBS_TABLE_SQL = """
+    CREATE TABLE IF NOT EXISTS embedding_jobs (
+        id BIGSERIAL PRIMARY KEY,
+        table_name VARCHAR(100) NOT NULL,
+        row_id BIGINT NOT NULL,
+        status VARCHAR(20) NOT NULL DEFAULT 'pending',
+        attempts INTEGER NOT NULL DEFAULT 0,
+        last_error TEXT,
+        available_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+        created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+        UNIQUE (table_name, row_id)
+    );
+    CREATE INDEX IF NOT EXISTS idx_embedding_jobs_pending
+        ON embedding_jobs (available_at) WHERE status = 'pending';
+"""
+
+
+class EmbeddingQueue:
+    """
+    Outbox consumer for embedding_jobs
+
+    Workers claim a batch with FOR UPDATE SKIP LOCKED and immediately push its
+    available_at forward by `lease_seconds`, so no transaction or connection
+    is held during inference and a crashed worker's jobs become visible again
+    once the lease runs out. Failed jobs are retried with exponential backoff
+    and marked 'failed' after `max_attempts`.
+    """
+
+    def __init__(
+        self,
+        workers: int = 1,
+        batch_size: int = 64,
+        max_attempts: int = 5,
+        poll_seconds: float = 1.0,
+        lease_seconds: int = 300
+    ):
+        """
+        Args:
+            workers: Consumer threads started by start() (0 = do not consume here)
+            batch_size: Jobs claimed and encoded per batch
+            max_attempts: Attempts before a job is marked failed
+            poll_seconds: Idle wait between polls when the queue is empty
+            lease_seconds: How long a claimed job stays invisible to other workers
+        """
+        self.workers = workers
+        self.batch_size = batch_size
+        self.max_attempts = max_attempts
+        self.poll_seconds = poll_seconds
+        self.lease_seconds = lease_seconds
+
+        self._threads = []
+        self._stop = threading.Event()
+        self._wakeup = threading.Event()
+        self._lock = threading.Lock()
+        self.processed = 0
+        self.retried = 0
+        self.failed = 0
+        self.batches = 0
+
+    @staticmethod
+    def enqueue(cursor, table: str, row_id: int):
+        """
+        Add an embedding job in the caller's transaction
+
+        Args:
+            cursor: Cursor of the transaction that wrote the row
+            table: Table name (key of EMBEDDED_TABLES)
+            row_id: Primary key of the row to embed
+        """
+        for sql, params in EmbeddingQueue._enqueue_statements(table, row_id):
+            cursor.execute(sql, params)
+
+    @staticmethod
+    async def enqueue_async(cursor, table: str, row_id: int):
+        """enqueue() for async (psycopg 3) cursors"""
+        for sql, params in EmbeddingQueue._enqueue_statements(table, row_id):
+            await cursor.execute(sql, params)
+
+    @staticmethod
+    def complete(cursor, table: str, row_id: int, embedding):
+        """
+        Store an embedding computed by the write path itself and drop its job
+
+        Args:
+            cursor: Database cursor
+            table: Table name
+            row_id: Primary key of the row
+            embedding: Vector for the row's text
+        """
+        for sql, params in EmbeddingQueue._complete_statements(table, row_id, embedding):
+            cursor.execute(sql, params)
+
+    @staticmethod
+    async def complete_async(cursor, table: str, row_id: int, embedding):
+        """complete() for async (psycopg 3) cursors"""
+        for sql, params in EmbeddingQueue._complete_statements(table, row_id, embedding):
+            await cursor.execute(sql, params)
+
+    @staticmethod
+    def _enqueue_statements(table: str, row_id: int) -> list:
+        """SQL for enqueue(), shared by the sync and async variants"""
+        if table not in EMBEDDED_TABLES:
+            raise ValueError(f"No embedding source defined for table: {table}")
+        return [(
+            """
+            INSERT INTO embedding_jobs (table_name, row_id)
+            VALUES (%s, %s)
+            ON CONFLICT (table_name, row_id) DO UPDATE
+            SET status = 'pending', attempts = 0, last_error = NULL,
+                available_at = CURRENT_TIMESTAMP
+            """,
+            (table, row_id)
+        )]
+
+    @staticmethod
+    def _complete_statements(table: str, row_id: int, embedding) -> list:
+        """SQL for complete(), shared by the sync and async variants"""
+        return [
+            (
+                f"UPDATE {table} SET embedding = %s::{vector_search.column_type}, embedding_model = %s WHERE id = %s",
+                (embedding, embedding_service.version, row_id)
+            ),
+            (
+                "DELETE FROM embedding_jobs WHERE table_name = %s AND row_id = %s",
+                (table, row_id)
+            )
+        ]
+
+    def notify(self):
+        """Wake an idle worker (call after committing an enqueue)"""
+        self._wakeup.set()
+
+    def start(self):
+        """Start the consumer threads"""
+        if self._threads or self.workers <= 0:
+            return
+        self._stop.clear()
+        for i in range(self.workers):
+            thread = threading.Thread(
+                target=self._run,
+                name=f"embedding-queue-{i}",
+                daemon=True
+            )
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self, timeout: float = 10.0):
+        """Stop the consumer threads after their current batch"""
+        self._stop.set()
+        self._wakeup.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def _run(self):
+        """Worker loop: drain the queue, then wait for a notify or the poll interval"""
+        while not self._stop.is_set():
+            try:
+                claimed = self.process_batch()
+            except Exception as e:
+                print(f"❌ Embedding queue error: {e}")
+                claimed = 0
+            if claimed < self.batch_size:
+                self._wakeup.wait(self.poll_seconds)
+                self._wakeup.clear()
+
+    def process_batch(self) -> int:
+        """
+        Claim, encode and store one batch of pending jobs
+
+        Returns:
+            Number of jobs claimed
+        """
+        jobs = self._claim()
+        if not jobs:
+            return 0
+
+        by_table: Dict[str, List[dict]] = {}
+        for job in jobs:
+            by_table.setdefault(job['table_name'], []).append(job)
+        for table, table_jobs in by_table.items():
+            try:
+                self._process_table(table, table_jobs)
+            except Exception as e:
+                self._fail(table_jobs, str(e))
+
+        with self._lock:
+            self.batches += 1
+        return len(jobs)
+
+    def _claim(self) -> List[dict]:
+        """Lease up to batch_size due jobs to this worker"""
+        with Database.get_cursor() as cursor:
+            cursor.execute(
+                """
+                UPDATE embedding_jobs
+                SET attempts = attempts + 1,
+                    available_at = CURRENT_TIMESTAMP + make_interval(secs => %s)
+                WHERE id IN (
+                    SELECT id FROM embedding_jobs
+                    WHERE status = 'pending' AND available_at <= CURRENT_TIMESTAMP
+                    ORDER BY available_at
+                    LIMIT %s
+                    FOR UPDATE SKIP LOCKED
+                )
+                RETURNING id, table_name, row_id, attempts
+                """,
+                (self.lease_seconds, self.batch_size)
+            )
+            return cursor.fetchall()
+
+    def _process_table(self, table: str, jobs: List[dict]):
+        """Embed the rows behind one table's jobs and write them back"""
+        with Database.get_cursor() as cursor:
+            cursor.execute(
+                f"SELECT id, {EMBEDDED_TABLES[table]} AS text FROM {table} WHERE id = ANY(%s)",
+                ([job['row_id'] for job in jobs],)
+            )
+            texts = {row['id']: row['text'] or "" for row in cursor.fetchall()}
+
+        # Inference runs with no connection checked out
+        ids = list(texts)
+        vectors = embedding_service.get_embeddings_batch(
+            [texts[row_id] for row_id in ids],
+            use_cache=False,
+            show_progress_bar=False
+        ) if ids else []
+
+        # Rows deleted since they were enqueued just drop their job
+        with Database.get_cursor() as cursor:
+            if ids:
+                execute_values(
+                    cursor,
+                    f"""
+                    UPDATE {table} AS t
+                    SET embedding = v.embedding::{vector_search.column_type},
+                        embedding_model = v.embedding_model
+                    FROM (VALUES %s) AS v(id, embedding, embedding_model)
+                    WHERE t.id = v.id
+                    """,
+                    [(row_id, vector, embedding_service.version) for row_id, vector in zip(ids, vectors)],
+                    page_size=len(ids)
+                )
+                if table == "complaints":
+                    # Same transaction, so a row is never embedded without its list
+                    complaint_neighbors.refresh(cursor, ids)
+            cursor.execute(
+                "DELETE FROM embedding_jobs WHERE id = ANY(%s)",
+                ([job['id'] for job in jobs],)
+            )
+        # Newly embedded rows change vector search results in any ward
+        if ids:
+            search_cache.invalidate(table)
+        with self._lock:
+            self.processed += len(jobs)
+
+    def _fail(self, jobs: List[dict], error: str):
+        """Schedule a retry with exponential backoff, or give up after max_attempts"""
+        retry = [job['id'] for job in jobs if job['attempts'] < self.max_attempts]
+        give_up = [job['id'] for job in jobs if job['attempts'] >= self.max_attempts]
+        with Database.get_cursor() as cursor:
+            if retry:
+                cursor.execute(
+                    """
+                    UPDATE embedding_jobs
+                    SET last_error = %s,
+                        available_at = CURRENT_TIMESTAMP
+                            + make_interval(secs => power(2, least(attempts, 10)))
+                    WHERE id = ANY(%s)
+                    """,
+                    (error, retry)
+                )
+            if give_up:
+                cursor.execute(
+                    "UPDATE embedding_jobs SET status = 'failed', last_error = %s WHERE id = ANY(%s)",
+                    (error, give_up)
+                )
+        print(f"⚠️ Embedding jobs failed ({len(retry)} will retry, {len(give_up)} gave up): {error}")
+        with self._lock:
+            self.retried += len(retry)
+            self.failed += len(give_up)
+
+    def get_stats(self) -> dict:
+        """
+        Report queue depth and lag
+
+        Returns:
+            Dictionary with pending/failed counts, age of the oldest pending
+            job in seconds and this process's consumer counters
+        """
+        with Database.get_cursor() as cursor:
+            cursor.execute(
+                """
+                SELECT count(*) FILTER (WHERE status = 'pending') AS pending,
+                       count(*) FILTER (WHERE status = 'failed') AS failed,
+                       extract(epoch FROM CURRENT_TIMESTAMP - min(created_at)
+                           FILTER (WHERE status = 'pending')) AS lag_seconds
+                FROM embedding_jobs
+                """
+            )
+            row = cursor.fetchone()
+        with self._lock:
+            return {
+                "pending": row['pending'],
+                "failed": row['failed'],
+                "lag_seconds": float(row['lag_seconds'] or 0.0),
+                "workers": len(self._threads),
+                "processed": self.processed,
+                "retried": self.retried,
+                "gave_up": self.failed,
+                "batches": self.batches
+            }
+
+
+# Create global embedding queue instance
+embedding_queue = EmbeddingQueue(
+    workers=settings.EMBEDDING_QUEUE_WORKERS,
+    batch_size=settings.EMBEDDING_QUEUE_BATCH_SIZE,
+    max_attempts=settings.EMBEDDING_QUEUE_MAX_ATTEMPTS,
+    poll_seconds=settings.EMBEDDING_QUEUE_POLL_SECONDS
+)
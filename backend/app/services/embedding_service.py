@@ -3,8 +3,17 @@ Embedding Service
 Handles AI-powered text embeddings using SentenceTransformers
 """
 
-from sentence_transformers import SentenceTransformer
+import asyncio
+import threading
+import time
 import numpy as np
+from ..core.config import settings
+from ..core.executors import executors
+from ..core.vector import to_vector_literal
+from .embedding_batcher import EmbeddingBatcher
+from .embedding_cache import EmbeddingCache
+from .embedding_engines import create_engine
+from .embedding_pool import ProcessPoolEncoder
 
 class EmbeddingService:
     """
@@ -12,17 +21,138 @@ class EmbeddingService:
     Converts text to 384-dimensional vectors for semantic search
     """
     
-    def __init__(self, model_name: str = "all-MiniLM-L6-v2"):
+    def __init__(self, model_name: str = settings.EMBEDDING_MODEL_NAME, batching: bool = None):
         """
-        Initialize the embedding model
-        Model is loaded once and cached for all requests
+        Initialize the embedding service
+        The model is not loaded here: it loads on first use, or in the
+        background once start_warmup() is called from the app lifespan
+        
+        Args:
+            model_name: SentenceTransformers model to load
+            batching: Coalesce concurrent get_embedding calls (defaults to settings)
         """
-        print(f"Loading embedding model: {model_name}")
-        self.model = SentenceTransformer(model_name)
+        self.model_name = model_name
+        self.engine_name = settings.EMBEDDING_ENGINE
+        # Written to embedding_model with every stored vector
+        self.version = settings.EMBEDDING_VERSION
         self.dimension = 384  # Output vector dimension
-        print(f"Model loaded successfully. Vector dimension: {self.dimension}")
+        
+        self._engine = None
+        self._load_lock = threading.Lock()
+        self._warmup_thread = None
+        self.load_error = None
+        self.load_seconds = None
+        
+        if batching is None:
+            batching = settings.EMBEDDING_BATCHING_ENABLED
+        self.batcher = EmbeddingBatcher(
+            self._encode_batch,
+            max_batch_size=settings.EMBEDDING_BATCH_MAX_SIZE,
+            max_wait_ms=settings.EMBEDDING_BATCH_MAX_WAIT_MS,
+            concurrency=max(settings.EMBEDDING_WORKERS, 1)
+        ) if batching else None
+        
+        # Engines differ slightly numerically, so they never share cache entries
+        self.cache = EmbeddingCache(
+            f"{model_name}:{self.engine_name}",
+            max_entries=settings.EMBEDDING_CACHE_SIZE,
+            disk_path=settings.EMBEDDING_CACHE_PATH or None
+        ) if settings.EMBEDDING_CACHE_SIZE > 0 else None
+    
+    @property
+    def engine(self):
+        """Embedding engine, loaded on first access"""
+        if self._engine is None:
+            self._load()
+        return self._engine
+    
+    @property
+    def is_ready(self) -> bool:
+        """True once the model is loaded and can serve requests"""
+        return self._engine is not None
+    
+    @property
+    def status(self) -> str:
+        """Model state: cold, warming, ready or failed"""
+        if self._engine is not None:
+            return "ready"
+        if self.load_error is not None:
+            return "failed"
+        if self._warmup_thread is not None and self._warmup_thread.is_alive():
+            return "warming"
+        return "cold"
+    
+    def start_warmup(self):
+        """
+        Load the model and run a first encode on a background thread
+        Lets the API start serving (and pass liveness checks) immediately
+        """
+        if self._engine is not None or self._warmup_thread is not None:
+            return
+        self._warmup_thread = threading.Thread(
+            target=self._warmup,
+            name="embedding-warmup",
+            daemon=True
+        )
+        self._warmup_thread.start()
+    
+    def _warmup(self):
+        """Background warmup task"""
+        try:
+            self.engine.encode(["warmup"])
+            print(f"🤖 AI Model ready: {self.dimension}D embeddings ({self.load_seconds:.1f}s)")
+        except Exception as e:
+            print(f"❌ AI Model warmup failed: {e}")
+    
+    def _load(self):
+        """Load the configured engine exactly once (torch imports happen here)"""
+        with self._load_lock:
+            if self._engine is not None:
+                return
+            started = time.perf_counter()
+            try:
+                if settings.EMBEDDING_WORKERS > 0:
+                    # Each worker process holds its own model; the API process holds none
+                    print(f"Starting {settings.EMBEDDING_WORKERS} {self.engine_name} embedding workers: {self.model_name}")
+                    engine = ProcessPoolEncoder(
+                        self.model_name,
+                        settings.EMBEDDING_WORKERS,
+                        engine=self.engine_name,
+                        onnx_dir=settings.EMBEDDING_ONNX_DIR,
+                        dimension=self.dimension,
+                        max_batch_size=max(settings.EMBEDDING_BATCH_MAX_SIZE, 64),
+                        threads=settings.EMBEDDING_WORKER_THREADS
+                    )
+                else:
+                    print(f"Loading embedding model: {self.model_name} ({self.engine_name})")
+                    engine = create_engine(
+                        self.engine_name,
+                        self.model_name,
+                        onnx_dir=settings.EMBEDDING_ONNX_DIR
+                    )
+            except Exception as e:
+                self.load_error = str(e)
+                raise
+            self.load_seconds = time.perf_counter() - started
+            self.load_error = None
+            self._engine = engine
+            print(f"Model loaded successfully. Vector dimension: {self.dimension}")
+    
+    def _encode_batch(self, texts: list, show_progress_bar: bool = False) -> list:
+        """
+        Encode a batch of texts in a single model call
+        
+        Args:
+            texts: List of text strings
+            show_progress_bar: Display encoding progress where the engine supports it
+            
+        Returns:
+            List of float32 embedding arrays, in input order
+        """
+        embeddings = self.engine.encode(texts, show_progress_bar=show_progress_bar)
+        return list(embeddings)
     
-    def get_embedding(self, text: str) -> list:
+    def get_embedding(self, text: str) -> np.ndarray:
         """
         Convert text to embedding vector
         
@@ -30,32 +160,87 @@ class EmbeddingService:
             text: Input text string
             
         Returns:
-            384-dimensional vector as list of floats
+            384-dimensional float32 NumPy array (pass it straight to
+            psycopg2; app.core.vector adapts it to pgvector)
         """
         text = text.strip()
         if not text:
-            return [0.0] * self.dimension
+            return np.zeros(self.dimension, dtype=np.float32)
         
-        # Generate normalized embedding
-        embedding = self.model.encode(text, normalize_embeddings=True)
-        return embedding.tolist()
+        # Repeated texts (popular queries, re-checked descriptions) skip the model
+        if self.cache is not None:
+            cached = self.cache.get(text)
+            if cached is not None:
+                return cached
+        
+        # Concurrent callers share one model call through the batcher
+        if self.batcher is not None:
+            embedding = self.batcher.embed(text)
+        else:
+            # Generate normalized embedding
+            embedding = self._encode_batch([text])[0]
+        
+        if self.cache is not None:
+            self.cache.put(text, embedding)
+        return embedding
+    
+    async def get_embedding_async(self, text: str) -> np.ndarray:
+        """
+        Convert text to embedding vector without blocking the event loop
+        Request handlers await the batcher's Future, so concurrent requests
+        on one worker share model calls instead of queueing behind each other
+        
+        Args:
+            text: Input text string
+            
+        Returns:
+            384-dimensional float32 NumPy array
+        """
+        text = text.strip()
+        if not text:
+            return np.zeros(self.dimension, dtype=np.float32)
+        
+        if self.cache is not None:
+            cached = self.cache.get(text)
+            if cached is not None:
+                return cached
+        
+        # Both paths are bounded by the inference executor (503 when saturated)
+        if self.batcher is not None:
+            async with executors["inference"].admit():
+                embedding = await asyncio.wrap_future(self.batcher.submit(text))
+        else:
+            embedding = (await executors.run("inference", self._encode_batch, [text]))[0]
+        
+        if self.cache is not None:
+            self.cache.put(text, embedding)
+        return embedding
     
-    def get_embeddings_batch(self, texts: list) -> list:
+    def get_embeddings_batch(self, texts: list, use_cache: bool = True, show_progress_bar: bool = True) -> list:
         """
         Generate embeddings for multiple texts efficiently
         
         Args:
             texts: List of text strings
+            use_cache: Consult and fill the embedding cache (bulk jobs that see
+                each text once should pass False to avoid churning it)
+            show_progress_bar: Display encoding progress
             
         Returns:
-            List of embedding vectors
+            List of float32 embedding arrays
         """
-        embeddings = self.model.encode(
-            texts, 
-            normalize_embeddings=True, 
-            show_progress_bar=True
-        )
-        return [emb.tolist() for emb in embeddings]
+        if self.cache is None or not use_cache:
+            return self._encode_batch(texts, show_progress_bar=show_progress_bar)
+        
+        # Only encode texts the cache has not seen
+        results = self.cache.get_many(texts)
+        missing = [i for i, vector in enumerate(results) if vector is None]
+        if missing:
+            vectors = self._encode_batch([texts[i] for i in missing], show_progress_bar=show_progress_bar)
+            self.cache.put_many([texts[i] for i in missing], vectors)
+            for i, vector in zip(missing, vectors):
+                results[i] = vector
+        return results
     
     def compute_similarity(self, text1: str, text2: str) -> float:
         """
@@ -75,17 +260,37 @@ class EmbeddingService:
         similarity = np.dot(emb1, emb2)
         return float(similarity)
     
-    def embedding_to_postgres_string(self, embedding: list) -> str:
+    def embedding_to_postgres_string(self, embedding) -> str:
         """
-        Convert embedding list to PostgreSQL vector format
+        Convert embedding to PostgreSQL vector format
+        Prefer passing the NumPy array directly as a query parameter
         
         Args:
-            embedding: List of floats
+            embedding: NumPy array or list of floats
             
         Returns:
             String formatted for PostgreSQL vector type
         """
-        return "[" + ",".join(map(str, embedding)) + "]"
+        return to_vector_literal(embedding)
+    
+    def get_stats(self) -> dict:
+        """
+        Report embedding service metrics
+        
+        Returns:
+            Dictionary with model info, batching and cache statistics
+        """
+        return {
+            "model": self.model_name,
+            "engine": self.engine_name,
+            "version": self.version,
+            "status": self.status,
+            "load_seconds": self.load_seconds,
+            "dimension": self.dimension,
+            "batching": self.batcher.get_stats() if self.batcher else None,
+            "cache": self.cache.get_stats() if self.cache else None,
+            "process_pool": self._engine.get_stats() if isinstance(self._engine, ProcessPoolEncoder) else None
+        }
 
 # Create global embedding service instance
 embedding_service = EmbeddingService()
@@ -0,0 +1,180 @@
+"""
+Search Result Cache
+Short-lived cache of search responses with per-ward invalidation and
+coalescing of concurrent identical searches
+"""
+
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Hashable, Optional
+
+from ..core.cache import TTLCache
+from ..core.config import settings
+
+
+def normalize_query(query: str) -> str:
+    """Cache key form of a query: lowercased with whitespace collapsed"""
+    return " ".join(query.lower().split())
+
+
+class SearchCache:
+    """
+    Search responses keyed by namespace (the searched table), ward and the
+    caller's own key (normalized query, role scope, limit, ...)
+
+    Invalidation is generation-based: every key embeds the current
+    generation of its ward, so bumping a ward's generation orphans all of
+    its entries at once and they age out of the LRU. Searches not scoped to
+    one ward use the namespace-wide generation, which every write bumps. A
+    write with no ward (a city-wide announcement) bumps the namespace epoch
+    and so invalidates every entry in the namespace.
+
+    Concurrent misses for the same key share one computation: the first
+    caller computes and the others await its result.
+
+    Invalidation is in-process. Writes made by other API workers become
+    visible within `ttl_seconds`.
+    """
+
+    def __init__(self, max_entries: int = 5000, ttl_seconds: float = 30.0):
+        """
+        Args:
+            max_entries: Maximum cached responses (0 disables caching)
+            ttl_seconds: Lifetime of a cached response
+        """
+        self.enabled = max_entries > 0
+        self._cache = TTLCache(max_entries, ttl_seconds)
+        self._lock = threading.Lock()
+        self._generations = {}   # (namespace, ward) -> int; ward None = unscoped searches
+        self._epochs = {}        # namespace -> int
+        self._inflight = {}      # key -> asyncio.Future of the computing caller
+        self._counters = {}      # namespace -> {"hits", "misses", "coalesced", "invalidations"}
+
+    def _count(self, namespace: str, counter: str):
+        with self._lock:
+            counters = self._counters.setdefault(
+                namespace, {"hits": 0, "misses": 0, "coalesced": 0, "invalidations": 0}
+            )
+            counters[counter] += 1
+
+    def _key(self, namespace: str, ward: Optional[int], key: Hashable) -> tuple:
+        with self._lock:
+            generation = (self._epochs.get(namespace, 0), self._generations.get((namespace, ward), 0))
+        return (namespace, ward, key, generation)
+
+    async def get_or_compute(
+        self,
+        namespace: str,
+        ward: Optional[int],
+        key: Hashable,
+        compute: Callable[[], Awaitable[Any]]
+    ) -> tuple:
+        """
+        Return a cached response, or compute and cache it
+
+        Args:
+            namespace: Searched table, e.g. "complaints"
+            ward: Ward the search is restricted to (None = all wards)
+            key: Everything else that determines the response
+            compute: Coroutine function producing the response
+
+        Returns:
+            (response, cached) where cached is True for a cache hit or a
+            coalesced wait. The response is shared; do not mutate it.
+        """
+        if not self.enabled:
+            return await compute(), False
+
+        full_key = self._key(namespace, ward, key)
+        value = self._cache.get(full_key)
+        if value is not None:
+            self._count(namespace, "hits")
+            return value, True
+
+        future = self._inflight.get(full_key)
+        if future is not None:
+            self._count(namespace, "coalesced")
+            try:
+                # Shielded so one waiter disconnecting does not cancel the shared work
+                return await asyncio.shield(future), True
+            except asyncio.CancelledError:
+                if not future.cancelled():
+                    raise
+                # The computing request was cancelled; compute for ourselves
+                return await compute(), False
+
+        self._count(namespace, "misses")
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[full_key] = future
+        try:
+            value = await compute()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # Waiters re-raise it; don't log it as unretrieved
+            raise
+        finally:
+            self._inflight.pop(full_key, None)
+        future.set_result(value)
+        self._cache.put(full_key, value)
+        return value, False
+
+    def invalidate(self, namespace: str, ward: Optional[int] = None):
+        """
+        Invalidate responses that a write to `ward` could change
+
+        Call after the write has committed.
+
+        Args:
+            namespace: Table written to
+            ward: Ward of the written row (None = every entry in the namespace)
+        """
+        with self._lock:
+            if ward is None:
+                self._epochs[namespace] = self._epochs.get(namespace, 0) + 1
+            else:
+                for scope in (ward, None):
+                    self._generations[(namespace, scope)] = self._generations.get((namespace, scope), 0) + 1
+        self._count(namespace, "invalidations")
+
+    def clear(self):
+        """Drop every cached response"""
+        self._cache.clear()
+
+    def get_stats(self) -> dict:
+        """
+        Report hit rates per namespace
+
+        Returns:
+            Dictionary with storage metrics and per-namespace hits, misses,
+            coalesced waits, invalidations and hit rate
+        """
+        cache = self._cache.get_stats()
+        stats = {
+            "enabled": self.enabled,
+            "entries": cache["entries"],
+            "max_entries": cache["max_entries"],
+            "ttl_seconds": cache["ttl_seconds"],
+            "expirations": cache["expirations"],
+            "evictions": cache["evictions"],
+            "inflight": len(self._inflight),
+            "namespaces": {}
+        }
+        with self._lock:
+            for namespace, counters in self._counters.items():
+                lookups = counters["hits"] + counters["coalesced"] + counters["misses"]
+                served = counters["hits"] + counters["coalesced"]
+                stats["namespaces"][namespace] = {
+                    **counters,
+                    "hit_rate": served / lookups if lookups else 0.0
+                }
+        return stats
+
+
+# Create global search cache instance
+search_cache = SearchCache(
+    max_entries=settings.SEARCH_CACHE_SIZE,
+    ttl_seconds=settings.SEARCH_CACHE_TTL_SECONDS
+)
@@ -0,0 +1,271 @@
+"""
+Bulk User Import
+Loads citizens from a CSV stream: passwords are hashed on a process pool,
+emails are deduplicated set-wise and rows are written with COPY
+"""
+
+import csv
+import io
+import multiprocessing as mp
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Iterable, List, Optional, TextIO
+
+from ..core.database import Database
+from ..core.security import pwd_context
+
+VALID_ROLES = ("citizen", "officer", "admin")
+REQUIRED_COLUMNS = ("name", "email", "password")
+
+# Column limits from the citizens table, checked up front so one bad row
+# does not fail the COPY for its whole chunk
+MAX_LENGTHS = {"name": 100, "email": 100, "phone": 15, "zone": 50}
+
+STAGING_TABLE_SQL = """
+    CREATE TEMP TABLE citizen_import (
+        line INTEGER,
+        name VARCHAR(100),
+        email VARCHAR(100),
+        phone VARCHAR(15),
+        ward_number INTEGER,
+        zone VARCHAR(50),
+        address TEXT,
+        role VARCHAR(20),
+        password_hash VARCHAR(255)
+    ) ON COMMIT DROP
+"""
+STAGING_COLUMNS = ("line", "name", "email", "phone", "ward_number", "zone", "address", "role", "password_hash")
+
+
+def _hash_password(password: str) -> str:
+    """Worker-process entry point (module level so it pickles)"""
+    return pwd_context.hash(password)
+
+
+class PasswordHashPool:
+    """
+    bcrypt on every core
+
+    bcrypt is CPU-bound by design (~0.25s per hash at the default cost), so
+    hashing tens of thousands of passwords serially takes hours. Worker
+    processes are spawned rather than forked, as for the embedding pool,
+    so the pool is safe to start from the threaded API process.
+    """
+
+    def __init__(self, workers: int = 0):
+        """
+        Args:
+            workers: Worker processes (0 = one per CPU core)
+        """
+        self.workers = workers or os.cpu_count() or 1
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=mp.get_context("spawn")
+        )
+
+    def hash_many(self, passwords: List[str]) -> List[str]:
+        """
+        Hash passwords in parallel, preserving order
+
+        Args:
+            passwords: Plain-text passwords
+
+        Returns:
+            bcrypt hashes
+        """
+        if not passwords:
+            return []
+        chunksize = max(1, len(passwords) // (self.workers * 4))
+        return list(self._executor.map(_hash_password, passwords, chunksize=chunksize))
+
+    def close(self):
+        """Stop the worker processes"""
+        self._executor.shutdown(wait=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _validate(line: int, row: dict, seen_emails: set) -> tuple:
+    """
+    Normalize one CSV row
+
+    Returns:
+        (record, None) for a valid row, or (None, error message)
+    """
+    record = {key: (row.get(key) or "").strip() for key in ("name", "email", "phone", "zone", "address", "role")}
+    password = row.get("password") or ""
+
+    for column in REQUIRED_COLUMNS:
+        if not (password if column == "password" else record[column]):
+            return None, f"missing {column}"
+    if "@" not in record["email"] or " " in record["email"]:
+        return None, "invalid email"
+    for column, limit in MAX_LENGTHS.items():
+        if len(record[column]) > limit:
+            return None, f"{column} longer than {limit} characters"
+
+    record["role"] = record["role"].lower() or "citizen"
+    if record["role"] not in VALID_ROLES:
+        return None, f"invalid role '{record['role']}'"
+
+    ward = (row.get("ward_number") or row.get("ward") or "").strip()
+    try:
+        record["ward_number"] = int(ward) if ward else None
+    except ValueError:
+        return None, f"invalid ward_number '{ward}'"
+
+    if record["email"] in seen_emails:
+        return None, "duplicate email in file"
+    seen_emails.add(record["email"])
+
+    for column in ("phone", "zone", "address"):
+        record[column] = record[column] or None
+    record["line"] = line
+    record["password"] = password
+    return record, None
+
+
+def _chunks(reader: Iterable[dict], size: int):
+    """Yield (line number of the first row, rows) batches from a DictReader"""
+    batch = []
+    start = 2  # line 1 is the header
+    for line, row in enumerate(reader, start=2):
+        if not batch:
+            start = line
+        batch.append(row)
+        if len(batch) >= size:
+            yield start, batch
+            batch = []
+    if batch:
+        yield start, batch
+
+
+def _load_chunk(records: List[dict]) -> set:
+    """
+    Write hashed records with COPY in one transaction
+
+    Returns:
+        Emails actually inserted (others were registered concurrently)
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for record in records:
+        writer.writerow(["" if record[column] is None else record[column] for column in STAGING_COLUMNS])
+    buffer.seek(0)
+
+    with Database.get_cursor() as cursor:
+        cursor.execute(STAGING_TABLE_SQL)
+        cursor.copy_expert(
+            f"COPY citizen_import ({', '.join(STAGING_COLUMNS)}) FROM STDIN WITH (FORMAT csv)",
+            buffer
+        )
+        cursor.execute("""
+            INSERT INTO citizens (name, email, phone, ward_number, zone, address, role, password_hash)
+            SELECT name, email, phone, ward_number, zone, address, role, password_hash
+            FROM citizen_import
+            ORDER BY line
+            ON CONFLICT (email) DO NOTHING
+            RETURNING email
+        """)
+        return {row['email'] for row in cursor.fetchall()}
+
+
+def import_users(
+    csv_file: TextIO,
+    workers: int = 0,
+    chunk_size: int = 5000,
+    max_errors: Optional[int] = 1000,
+    progress: Optional[Callable[[dict], None]] = None
+) -> dict:
+    """
+    Import citizens from CSV
+
+    The file is read in chunks, so memory stays flat for large files. For
+    each chunk: rows are validated, emails already registered are found
+    with one `email = ANY(...)` query (and are never hashed), the remaining
+    passwords are hashed on the process pool, and the rows are COPYed into
+    a staging table and inserted in one statement. Each chunk commits on
+    its own; a failed chunk is reported and the import continues.
+
+    Columns: name, email, password (required); ward_number (or ward),
+    zone, phone, address, role (citizen/officer/admin, default citizen).
+
+    Args:
+        csv_file: Text stream positioned at the header row
+        workers: Hashing processes (0 = one per CPU core)
+        chunk_size: Rows per dedupe/hash/COPY round
+        max_errors: Per-row errors kept in the report (all are counted; None = keep all)
+        progress: Called with the running report after every chunk
+
+    Returns:
+        Report with rows, imported, duplicates, failed, errors and seconds
+    """
+    started = time.perf_counter()
+    report = {"rows": 0, "imported": 0, "duplicates": 0, "failed": 0, "errors": [], "errors_truncated": False}
+
+    def error(line: int, email: str, message: str, duplicate: bool = False):
+        report["duplicates" if duplicate else "failed"] += 1
+        if max_errors is None or len(report["errors"]) < max_errors:
+            report["errors"].append({"line": line, "email": email, "error": message})
+        else:
+            report["errors_truncated"] = True
+
+    reader = csv.DictReader(csv_file)
+    missing = [column for column in REQUIRED_COLUMNS if column not in (reader.fieldnames or [])]
+    if missing:
+        raise ValueError(f"CSV header is missing required column(s): {', '.join(missing)}")
+
+    seen_emails = set()
+    with PasswordHashPool(workers) as hasher:
+        for first_line, rows in _chunks(reader, chunk_size):
+            report["rows"] += len(rows)
+
+            records = []
+            for offset, row in enumerate(rows):
+                record, message = _validate(first_line + offset, row, seen_emails)
+                if message:
+                    error(first_line + offset, (row.get("email") or "").strip(), message,
+                          duplicate=message == "duplicate email in file")
+                else:
+                    records.append(record)
+            if not records:
+                continue
+
+            # One set-based lookup per chunk; registered emails skip hashing
+            with Database.get_cursor() as cursor:
+                cursor.execute(
+                    "SELECT email FROM citizens WHERE email = ANY(%s)",
+                    ([record["email"] for record in records],)
+                )
+                registered = {row['email'] for row in cursor.fetchall()}
+            for record in records:
+                if record["email"] in registered:
+                    error(record["line"], record["email"], "email already registered", duplicate=True)
+            records = [record for record in records if record["email"] not in registered]
+
+            try:
+                hashes = hasher.hash_many([record.pop("password") for record in records])
+                for record, password_hash in zip(records, hashes):
+                    record["password_hash"] = password_hash
+                inserted = _load_chunk(records)
+            except Exception as e:
+                for record in records:
+                    error(record["line"], record["email"], f"chunk failed: {e}")
+                continue
+
+            report["imported"] += len(inserted)
+            for record in records:
+                if record["email"] not in inserted:
+                    error(record["line"], record["email"], "email already registered", duplicate=True)
+
+            if progress is not None:
+                progress(report)
+
+    report["errors"].sort(key=lambda entry: entry["line"])
+    report["seconds"] = round(time.perf_counter() - started, 2)
+    return report
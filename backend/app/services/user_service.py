@@ -5,15 +5,18 @@ Business logic for user authentication and management
 
 from typing import Optional
 from fastapi import HTTPException, status
-from ..core.database import Database
+from ..core.async_database import AsyncDatabase
+from ..core.executors import executors
 from ..core.security import security_service
 from ..models.user import UserRegister, UserLogin, UserResponse, LoginResponse
+from .complaint_neighbors import complaint_neighbors
+from .search_cache import search_cache
 
 class UserService:
     """Handle user-related operations"""
     
     @staticmethod
-    def register_user(user_data: UserRegister) -> dict:
+    async def register_user(user_data: UserRegister) -> dict:
         """
         Register a new user
         
@@ -23,38 +26,47 @@ class UserService:
         Returns:
             Dictionary with success message and user_id
         """
-        with Database.get_cursor() as cursor:
-            # Check if email already exists
-            cursor.execute(
+        # Turn duplicates away before paying for a bcrypt hash
+        async with AsyncDatabase.get_cursor() as cursor:
+            await cursor.execute(
                 "SELECT id FROM citizens WHERE email = %s",
                 (user_data.email,)
             )
-            if cursor.fetchone():
+            if await cursor.fetchone():
                 raise HTTPException(
                     status_code=status.HTTP_400_BAD_REQUEST,
                     detail="Email already registered"
                 )
-            
-            # Hash password and insert user
-            hashed_pwd = security_service.hash_password(user_data.password)
-            cursor.execute(
+        
+        # bcrypt is deliberately slow; hash in the crypto executor with no connection held
+        hashed_pwd = await executors.run("crypto", security_service.hash_password, user_data.password)
+        
+        async with AsyncDatabase.get_cursor() as cursor:
+            # Insert user; ON CONFLICT catches a signup for the same email that raced past the check
+            await cursor.execute(
                 """
                 INSERT INTO citizens (name, ward_number, email, role, password_hash, phone, zone, address)
                 VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+                ON CONFLICT (email) DO NOTHING
                 RETURNING id
                 """,
                 (user_data.name, user_data.ward, user_data.email, user_data.role, hashed_pwd, 
                  getattr(user_data, 'phone', None), getattr(user_data, 'zone', None), getattr(user_data, 'address', None))
             )
-            user_id = cursor.fetchone()['id']
-            
-            return {
-                "message": "User registered successfully",
-                "user_id": user_id
-            }
+            inserted = await cursor.fetchone()
+        if inserted is None:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Email already registered"
+            )
+        
+        return {
+            "message": "User registered successfully",
+            "user_id": inserted['id']
+        }
     
     @staticmethod
-    def login_user(credentials: UserLogin) -> LoginResponse:
+    async def login_user(credentials: UserLogin) -> LoginResponse:
         """
         Authenticate user and return JWT token
         
@@ -64,46 +76,48 @@ class UserService:
         Returns:
             LoginResponse with token and user data
         """
-        with Database.get_cursor() as cursor:
+        async with AsyncDatabase.get_cursor() as cursor:
             # Fetch user by email
-            cursor.execute(
+            await cursor.execute(
                 "SELECT id, name, email, role, ward_number, password_hash FROM citizens WHERE email = %s",
                 (credentials.email,)
             )
-            db_user = cursor.fetchone()
-            
-            # Verify credentials
-            if not db_user or not security_service.verify_password(
-                credentials.password, 
-                db_user['password_hash']
-            ):
-                raise HTTPException(
-                    status_code=status.HTTP_401_UNAUTHORIZED,
-                    detail="Invalid credentials"
-                )
-            
-            # Create JWT token
-            token = security_service.create_access_token({
-                "user_id": db_user['id'],
-                "email": db_user['email'],
-                "role": db_user['role'],
-                "ward": db_user['ward_number']
-            })
-            
-            return LoginResponse(
-                access_token=token,
-                token_type="bearer",
-                user=UserResponse(
-                    id=db_user['id'],
-                    name=db_user['name'],
-                    email=db_user['email'],
-                    role=db_user['role'],
-                    ward=db_user['ward_number']
-                )
+            db_user = await cursor.fetchone()
+        
+        # Verify credentials (bcrypt runs in the crypto executor, with no connection held)
+        if not db_user or not await executors.run(
+            "crypto",
+            security_service.verify_password,
+            credentials.password,
+            db_user['password_hash']
+        ):
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Invalid credentials"
+            )
+        
+        # Create JWT token
+        token = security_service.create_access_token({
+            "user_id": db_user['id'],
+            "email": db_user['email'],
+            "role": db_user['role'],
+            "ward": db_user['ward_number']
+        })
+        
+        return LoginResponse(
+            access_token=token,
+            token_type="bearer",
+            user=UserResponse(
+                id=db_user['id'],
+                name=db_user['name'],
+                email=db_user['email'],
+                role=db_user['role'],
+                ward=db_user['ward_number']
             )
+        )
     
     @staticmethod
-    def get_user_by_id(user_id: int) -> Optional[dict]:
+    async def get_user_by_id(user_id: int) -> Optional[dict]:
         """
         Get user by ID
         
@@ -113,12 +127,43 @@ class UserService:
         Returns:
             User dictionary or None
         """
-        with Database.get_cursor() as cursor:
-            cursor.execute(
+        async with AsyncDatabase.get_cursor() as cursor:
+            await cursor.execute(
                 "SELECT id, name, email, role, ward_number FROM citizens WHERE id = %s",
                 (user_id,)
             )
-            return cursor.fetchone()
+            return await cursor.fetchone()
+    
+    @staticmethod
+    async def delete_user(user_id: int) -> dict:
+        """
+        Delete a user (their complaints, announcements and reports cascade)
+        
+        Args:
+            user_id: User ID
+            
+        Returns:
+            Dictionary with success message
+        """
+        async with AsyncDatabase.get_cursor() as cursor:
+            # Neighbour lists have no foreign keys to cascade through
+            await cursor.execute("SELECT id FROM complaints WHERE user_id = %s", (user_id,))
+            complaint_ids = [row['id'] for row in await cursor.fetchall()]
+            if complaint_ids:
+                await complaint_neighbors.remove_async(cursor, complaint_ids)
+            await cursor.execute("DELETE FROM citizens WHERE id = %s RETURNING id", (user_id,))
+            if not await cursor.fetchone():
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="User not found"
+                )
+        
+        # The delete trigger notifies the other workers; evict locally right away
+        security_service.invalidate_user(user_id)
+        # Their complaints (and, for officers, announcements) cascaded away
+        search_cache.invalidate("complaints")
+        search_cache.invalidate("announcements")
+        return {"message": "User deleted successfully"}
 
 # Create user service instance
 user_service = UserService()
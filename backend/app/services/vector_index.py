@@ -0,0 +1,528 @@
+"""
+In-process Vector Index
+Serves nearest-neighbour candidates for complaint and announcement search
+from memory, kept in sync with Postgres through a NOTIFY change feed
+"""
+
+import asyncio
+import threading
+import time
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from ..core.async_database import AsyncDatabase
+from ..core.config import settings
+from ..core.executors import ExecutorSaturatedError, executors
+from .embedding_service import embedding_service
+
+# Every insert, delete and embedding/ward/date change on an indexed table
+# sends "<table>:<id>" here. The table name is a trigger argument because
+# TG_TABLE_NAME would be the partition's name on complaints.
+VECTOR_CHANGES_CHANNEL = "vector_changes"
+VECTOR_CHANGES_TRIGGER_SQL = f"""
+    CREATE OR REPLACE FUNCTION notify_vector_change() RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP = 'DELETE' THEN
+            PERFORM pg_notify('{VECTOR_CHANGES_CHANNEL}', TG_ARGV[0] || ':' || OLD.id);
+        ELSE
+            PERFORM pg_notify('{VECTOR_CHANGES_CHANNEL}', TG_ARGV[0] || ':' || NEW.id);
+        END IF;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql;
+
+    DROP TRIGGER IF EXISTS complaints_notify_vector_change ON complaints;
+    CREATE TRIGGER complaints_notify_vector_change
+        AFTER INSERT OR DELETE OR UPDATE OF embedding, embedding_model, ward_number, date ON complaints
+        FOR EACH ROW EXECUTE FUNCTION notify_vector_change('complaints');
+
+    DROP TRIGGER IF EXISTS announcements_notify_vector_change ON announcements;
+    CREATE TRIGGER announcements_notify_vector_change
+        AFTER INSERT OR DELETE OR UPDATE OF embedding, embedding_model, ward_number, date ON announcements
+        FOR EACH ROW EXECUTE FUNCTION notify_vector_change('announcements');
+"""
+
+BACKENDS = ("auto", "numpy", "hnswlib")
+
+# hnswlib graph parameters (pgvector's defaults)
+HNSW_M = 16
+HNSW_EF_CONSTRUCTION = 64
+
+try:
+    import hnswlib
+except ImportError:
+    hnswlib = None
+
+
+class _Shard:
+    """
+    Vectors of one ward (or of ward NULL) in growable arrays
+
+    Vectors are stored L2-normalized, so cosine distance is 1 - dot
+    product. Deleting swaps the last row into the hole. When a snapshot
+    loads with hnswlib available, shards of hnsw_min_rows or more also get
+    an hnswlib graph, labelled by row id, which later changes keep current.
+    Searches and changes to a live shard hold its `lock`.
+    """
+
+    def __init__(self, dimension: int, capacity: int = 64):
+        self.size = 0
+        self.ids = np.zeros(capacity, dtype=np.int64)
+        self.vectors = np.zeros((capacity, dimension), dtype=np.float32)
+        self.dates = np.zeros(capacity, dtype=np.float64)
+        self.positions = {}
+        self.graph = None
+        self.lock = threading.Lock()
+
+    def _grow(self):
+        capacity = max(64, len(self.ids) * 2)
+        self.ids = np.resize(self.ids, capacity)
+        self.dates = np.resize(self.dates, capacity)
+        vectors = np.zeros((capacity, self.vectors.shape[1]), dtype=np.float32)
+        vectors[:self.size] = self.vectors[:self.size]
+        self.vectors = vectors
+
+    def upsert(self, row_id: int, vector: np.ndarray, timestamp: float):
+        position = self.positions.get(row_id)
+        if position is None:
+            if self.size == len(self.ids):
+                self._grow()
+            position = self.size
+            self.size += 1
+            self.positions[row_id] = position
+            self.ids[position] = row_id
+        self.vectors[position] = vector
+        self.dates[position] = timestamp
+        if self.graph is not None:
+            if self.graph.get_current_count() >= self.graph.get_max_elements():
+                self.graph.resize_index(self.graph.get_max_elements() * 2)
+            # An existing (or deleted) label is updated in place
+            self.graph.add_items(vector[None, :], np.array([row_id]))
+
+    def remove(self, row_id: int):
+        position = self.positions.pop(row_id, None)
+        if position is None:
+            return
+        last = self.size - 1
+        if position != last:
+            moved = int(self.ids[last])
+            self.ids[position] = moved
+            self.vectors[position] = self.vectors[last]
+            self.dates[position] = self.dates[last]
+            self.positions[moved] = position
+        self.size = last
+        if self.graph is not None:
+            self.graph.mark_deleted(row_id)
+
+    def build_graph(self, ef_search: int):
+        """Build the hnswlib graph over the current rows"""
+        graph = hnswlib.Index(space="ip", dim=self.vectors.shape[1])
+        graph.init_index(max_elements=max(self.size * 2, 1024), ef_construction=HNSW_EF_CONSTRUCTION, M=HNSW_M)
+        graph.add_items(self.vectors[:self.size], self.ids[:self.size])
+        graph.set_ef(ef_search)
+        self.graph = graph
+
+    def search(self, query: np.ndarray, k: int, since: Optional[float]) -> Tuple[np.ndarray, np.ndarray]:
+        """Up to k (ids, distances) nearest to a normalized query, closest first"""
+        if self.size == 0:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float32)
+        if self.graph is not None:
+            # Over-fetch when the date window will drop some of the candidates
+            fetch = min(self.size, k * 4 if since is not None else k)
+            try:
+                labels, distances = self.graph.knn_query(query, k=fetch)
+            except RuntimeError:
+                # hnswlib could not find `fetch` live neighbours; scan exactly
+                labels = None
+            if labels is not None:
+                labels, distances = labels[0].astype(np.int64), distances[0]
+                if since is not None:
+                    keep = self.dates[[self.positions[label] for label in labels]] >= since
+                    labels, distances = labels[keep], distances[keep]
+                if len(labels) >= min(k, self.size) or fetch == self.size:
+                    return labels[:k], distances[:k]
+            # Too few survived the window: scan the shard exactly
+
+        scores = self.vectors[:self.size] @ query
+        if since is not None:
+            scores = np.where(self.dates[:self.size] >= since, scores, -np.inf)
+        k = min(k, self.size)
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top], kind="stable")]
+        top = top[np.isfinite(scores[top])]
+        return self.ids[top], 1.0 - scores[top]
+
+
+class VectorIndex:
+    """
+    In-memory nearest-neighbour index over the embeddings of a few tables,
+    sharded by ward
+
+    Every API worker keeps its own copy. start() listens on
+    VECTOR_CHANGES_CHANNEL and loads a snapshot of every indexed table
+    (rows embedded with the active model only); changes that arrive while
+    the snapshot loads are applied right after it. Each notification
+    re-reads its row, so inserts, re-embeddings, ward moves and deletes
+    all converge to the table's state. Notifications missed while the
+    listener was disconnected cannot be replayed, so a reconnect reloads
+    the snapshot.
+
+    Searches scan the requested ward shards in the "vector" executor:
+    exact NumPy dot products by default, or an hnswlib graph for shards of
+    `hnsw_min_rows` or more when the backend allows it and hnswlib is
+    installed. Until the first snapshot is loaded search() returns None
+    and callers fall back to Postgres.
+    """
+
+    def __init__(
+        self,
+        tables: Sequence[str] = ("complaints", "announcements"),
+        backend: str = "auto",
+        hnsw_min_rows: int = 20000,
+        hnsw_ef_search: int = 100,
+        load_chunk_size: int = 5000
+    ):
+        """
+        Args:
+            tables: Tables to index (id, ward_number, date, embedding columns)
+            backend: auto (hnswlib for large shards if installed), numpy
+                (always exact) or hnswlib (requires the package)
+            hnsw_min_rows: Smallest shard given an hnswlib graph
+            hnsw_ef_search: hnswlib candidate list size
+            load_chunk_size: Rows fetched per snapshot query
+        """
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown vector index backend '{backend}' (expected one of: {', '.join(BACKENDS)})")
+        if backend == "hnswlib" and hnswlib is None:
+            raise ImportError("VECTOR_INDEX_BACKEND=hnswlib needs the hnswlib package (pip install hnswlib)")
+        self.tables = tuple(tables)
+        self.use_graphs = backend != "numpy" and hnswlib is not None
+        self.hnsw_min_rows = hnsw_min_rows
+        self.hnsw_ef_search = hnsw_ef_search
+        self.load_chunk_size = load_chunk_size
+
+        self._lock = threading.Lock()
+        self._shards: Dict[str, Dict[Optional[int], _Shard]] = {}
+        self._wards: Dict[str, Dict[int, Optional[int]]] = {}  # table -> id -> shard key
+        self._version = None
+        self._ready = False
+        self._reload = False
+        self._pending: Dict[str, set] = {table: set() for table in self.tables}
+        self._wakeup = None
+        self._task = None
+        self.loads = 0
+        self.load_seconds = None
+        self.changes_applied = 0
+        self.searches = 0
+        self.fallbacks = 0
+
+    @property
+    def ready(self) -> bool:
+        """True once the first snapshot is loaded"""
+        return self._ready
+
+    def start(self):
+        """Start the change listener and the initial load (app lifespan)"""
+        if self._task is None:
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.create_task(self._run())
+
+    def stop(self):
+        """Stop syncing (application shutdown)"""
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    def _on_connect(self):
+        # Anything missed while disconnected is picked up by a fresh snapshot
+        self._reload = True
+        self._wakeup.set()
+
+    def _on_notify(self, payload: str):
+        table, _, row_id = payload.partition(":")
+        try:
+            self._pending[table].add(int(row_id))
+        except (KeyError, ValueError):
+            return
+        self._wakeup.set()
+
+    async def _run(self):
+        """Listener plus the loop applying snapshots and queued changes"""
+        listener = asyncio.create_task(
+            AsyncDatabase.listen(VECTOR_CHANGES_CHANNEL, self._on_notify, on_connect=self._on_connect)
+        )
+        try:
+            while True:
+                await self._wakeup.wait()
+                self._wakeup.clear()
+                try:
+                    if self._reload:
+                        self._reload = False
+                        await self._load()
+                    if self._ready:
+                        await self._apply_pending()
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    print(f"⚠️ Vector index sync failed ({e}), reloading in 5s")
+                    self._reload = True
+                    await asyncio.sleep(5)
+                    self._wakeup.set()
+        finally:
+            listener.cancel()
+
+    async def _load(self):
+        """Replace the index with a snapshot of every table"""
+        started = time.perf_counter()
+        version = embedding_service.version
+        shards, wards = {}, {}
+        for table in self.tables:
+            shards[table], wards[table] = {}, {}
+            last_id = 0
+            while True:
+                async with AsyncDatabase.get_cursor() as cursor:
+                    await cursor.execute(
+                        f"""
+                        SELECT id, ward_number, date, embedding FROM {table}
+                        WHERE embedding_model = %s AND id > %s
+                        ORDER BY id LIMIT %s
+                        """,
+                        (version, last_id, self.load_chunk_size),
+                        binary=True
+                    )
+                    rows = await cursor.fetchall()
+                if not rows:
+                    break
+                for row in rows:
+                    self._add(shards[table], wards[table], row)
+                last_id = rows[-1]['id']
+
+        if self.use_graphs:
+            large = [shard for table_shards in shards.values() for shard in table_shards.values()
+                     if shard.size >= self.hnsw_min_rows]
+            for shard in large:
+                await asyncio.to_thread(shard.build_graph, self.hnsw_ef_search)
+
+        with self._lock:
+            self._shards, self._wards, self._version = shards, wards, version
+            self._ready = True
+        self.loads += 1
+        self.load_seconds = round(time.perf_counter() - started, 2)
+        rows = sum(len(table_wards) for table_wards in wards.values())
+        print(f"🧭 Vector index loaded: {rows} vectors in {self.load_seconds}s")
+
+    @staticmethod
+    def _normalized(embedding) -> np.ndarray:
+        vector = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm > 0 else vector
+
+    @staticmethod
+    def _add(shards: dict, wards: dict, row: dict):
+        """Insert or move one row into shards nobody else can see yet (snapshot loads)"""
+        ward = row['ward_number']
+        previous = wards.get(row['id'], ward)
+        if previous != ward:
+            shards[previous].remove(row['id'])
+        vector = VectorIndex._normalized(row['embedding'])
+        shard = shards.get(ward)
+        if shard is None:
+            shard = shards[ward] = _Shard(len(vector))
+        shard.upsert(row['id'], vector, row['date'].timestamp())
+        wards[row['id']] = ward
+
+    async def _apply_pending(self):
+        """Re-read the rows behind queued notifications and apply them"""
+        for table in self.tables:
+            ids = list(self._pending[table])
+            if not ids:
+                continue
+            self._pending[table].clear()
+            async with AsyncDatabase.get_cursor() as cursor:
+                await cursor.execute(
+                    f"""
+                    SELECT id, ward_number, date, embedding FROM {table}
+                    WHERE id = ANY(%s) AND embedding_model = %s
+                    """,
+                    (ids, self._version),
+                    binary=True
+                )
+                rows = await cursor.fetchall()
+            # Shard locks can be held by a running scan; wait for them off the event loop
+            await asyncio.to_thread(self._apply_rows, table, rows, ids)
+            self.changes_applied += len(ids)
+
+    def _apply_rows(self, table: str, rows: list, ids: list):
+        """
+        Apply re-read rows to the live shards; ids without a row are deleted
+
+        The index lock only covers the id -> shard bookkeeping, so searches
+        of other shards are not held up while one shard is being changed.
+        """
+        found = set()
+        for row in rows:
+            found.add(row['id'])
+            vector = self._normalized(row['embedding'])
+            ward = row['ward_number']
+            with self._lock:
+                shards, wards = self._shards[table], self._wards[table]
+                previous = shards.get(wards[row['id']]) if wards.get(row['id'], ward) != ward else None
+                shard = shards.get(ward)
+                if shard is None:
+                    shard = shards[ward] = _Shard(len(vector))
+                wards[row['id']] = ward
+            with shard.lock:
+                shard.upsert(row['id'], vector, row['date'].timestamp())
+            if previous is not None:
+                with previous.lock:
+                    previous.remove(row['id'])
+
+        for row_id in ids:
+            if row_id in found:
+                continue
+            with self._lock:
+                shards, wards = self._shards[table], self._wards[table]
+                shard = shards.get(wards.pop(row_id)) if row_id in wards else None
+            if shard is not None:
+                with shard.lock:
+                    shard.remove(row_id)
+
+    def _search(self, table: str, query: np.ndarray, k: int,
+                wards: Optional[Sequence], since: Optional[float]) -> List[Tuple[int, float]]:
+        """Blocking search over the selected shards (runs in the vector executor)"""
+        norm = np.linalg.norm(query)
+        query = (query / norm if norm > 0 else query).astype(np.float32)
+        with self._lock:
+            shards = self._shards.get(table, {})
+            keys = list(shards) if wards is None else [ward for ward in wards if ward in shards]
+            selected = [shards[key] for key in keys]
+        # Scan outside the index lock; each shard only blocks changes to itself
+        found = []
+        for shard in selected:
+            with shard.lock:
+                found.append(shard.search(query, k, since))
+        if not found:
+            return []
+        ids = np.concatenate([shard_ids for shard_ids, _ in found])
+        distances = np.concatenate([shard_distances for _, shard_distances in found])
+
+        # A row moving between wards can briefly be in two shards
+        results, seen = [], set()
+        for i in np.argsort(distances, kind="stable"):
+            row_id = int(ids[i])
+            if row_id not in seen:
+                seen.add(row_id)
+                results.append((row_id, float(distances[i])))
+                if len(results) == k:
+                    break
+        return results
+
+    async def search(
+        self,
+        table: str,
+        query_embedding,
+        k: int,
+        wards: Optional[Sequence] = None,
+        since: Optional[datetime] = None
+    ) -> Optional[List[Tuple[int, float]]]:
+        """
+        Nearest rows of one table to a query embedding
+
+        Args:
+            table: Indexed table
+            query_embedding: Query vector from the active model
+            k: Rows to return
+            wards: Ward shards to search (None is a valid ward: city-wide
+                announcements); None searches every shard
+            since: Only rows dated at or after this
+
+        Returns:
+            [(id, cosine distance)] closest first, or None when the index
+            cannot answer (disabled table, still loading, executor full)
+            and the caller should query Postgres instead
+        """
+        if not self.ready or table not in self.tables:
+            self.fallbacks += 1
+            return None
+        try:
+            results = await executors.run(
+                "vector",
+                self._search,
+                table,
+                np.asarray(query_embedding, dtype=np.float32),
+                k,
+                None if wards is None else [None if ward is None else int(ward) for ward in wards],
+                since.timestamp() if since is not None else None
+            )
+        except ExecutorSaturatedError:
+            self.fallbacks += 1
+            return None
+        self.searches += 1
+        return results
+
+    @staticmethod
+    def candidates_sql(table: str, ranked: List[Tuple[int, float]], where: str = "TRUE",
+                       params: Sequence = ()) -> Tuple[str, List]:
+        """
+        Subquery shaped like VectorSearch.nearest() for rows found by search()
+
+        Joins the ranked ids back to the table (the primary key lookup also
+        re-checks `where`, so rows changed since the index saw them drop out).
+
+        Args:
+            table: Table searched
+            ranked: Result of search()
+            where: Filter applied to the joined rows, with %s placeholders
+            params: Parameters for `where`
+
+        Returns:
+            (sql, params) where sql is a parenthesised subquery selecting all
+            of the table's columns plus `distance`
+        """
+        sql = f"""(
+            SELECT {table}.*, ranked.distance
+            FROM unnest(%s::integer[], %s::float8[]) AS ranked(id, distance)
+            JOIN {table} ON {table}.id = ranked.id
+            WHERE {where}
+        )"""
+        return sql, [[row_id for row_id, _ in ranked], [distance for _, distance in ranked], *params]
+
+    def get_stats(self) -> dict:
+        """
+        Report index size and usage
+
+        Returns:
+            Dictionary with readiness, per-table vector and shard counts,
+            graph-backed shards and search/fallback counters
+        """
+        with self._lock:
+            tables = {
+                table: {
+                    "vectors": len(self._wards.get(table, {})),
+                    "shards": len(shards),
+                    "hnsw_shards": sum(1 for shard in shards.values() if shard.graph is not None)
+                }
+                for table, shards in self._shards.items()
+            }
+        return {
+            "ready": self.ready,
+            "backend": "hnswlib" if self.use_graphs else "numpy",
+            "tables": tables,
+            "loads": self.loads,
+            "load_seconds": self.load_seconds,
+            "changes_applied": self.changes_applied,
+            "pending": sum(len(ids) for ids in self._pending.values()),
+            "searches": self.searches,
+            "fallbacks": self.fallbacks
+        }
+
+
+# Create global vector index instance
+vector_index = VectorIndex(
+    tables=settings.VECTOR_INDEX_TABLES,
+    backend=settings.VECTOR_INDEX_BACKEND,
+    hnsw_min_rows=settings.VECTOR_INDEX_HNSW_MIN_ROWS,
+    hnsw_ef_search=settings.VECTOR_INDEX_HNSW_EF_SEARCH
+)
@@ -0,0 +1,114 @@
+"""
+Pagination Helpers
+Opaque cursor tokens and date/id keyset predicates for paging through
+listings newest first without OFFSET
+"""
+
+import base64
+import binascii
+import hashlib
+import json
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+from fastapi import HTTPException, status
+
+
+class InvalidCursorError(HTTPException):
+    """Raised for a cursor that is malformed or belongs to another query"""
+
+    def __init__(self, detail: str = "Invalid pagination cursor"):
+        super().__init__(status_code=status.HTTP_400_BAD_REQUEST, detail=detail)
+
+
+def encode_cursor(values: dict) -> str:
+    """
+    Pack cursor values into an opaque URL-safe token
+
+    Args:
+        values: JSON-serializable position (datetimes are stored as ISO strings)
+
+    Returns:
+        Token to hand back to the client
+    """
+    payload = json.dumps(values, separators=(",", ":"), default=lambda value: value.isoformat())
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(token: str, fields: Tuple[str, ...]) -> dict:
+    """
+    Unpack a token produced by encode_cursor()
+
+    Args:
+        token: Cursor from the client
+        fields: Keys the token must contain
+
+    Returns:
+        Cursor values
+
+    Raises:
+        InvalidCursorError: If the token is not one of ours
+    """
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise InvalidCursorError()
+    if not isinstance(values, dict) or any(field not in values for field in fields):
+        raise InvalidCursorError()
+    return values
+
+
+def query_fingerprint(*parts) -> str:
+    """Short digest tying a cursor to the query that produced it"""
+    return hashlib.sha256(repr(parts).encode()).hexdigest()[:16]
+
+
+def keyset_after(
+    cursor: Optional[str],
+    date_column: str = "date",
+    id_column: str = "id"
+) -> Tuple[str, List]:
+    """
+    WHERE predicate for the rows after a date/id cursor, in
+    ORDER BY date DESC, id DESC order
+
+    The `date <= %s` conjunct is what lets the planner start a backward
+    scan of the date index at the cursor, so every page costs the same as
+    the first; the OR only breaks ties between equal dates.
+
+    Args:
+        cursor: Token from a previous page, or None for the first page
+        date_column: Sort timestamp column (qualified if needed)
+        id_column: Tie-breaking id column
+
+    Returns:
+        (sql, params); ("TRUE", []) for the first page
+    """
+    if not cursor:
+        return "TRUE", []
+    values = decode_cursor(cursor, ("date", "id"))
+    try:
+        date = datetime.fromisoformat(values["date"])
+        row_id = int(values["id"])
+    except (TypeError, ValueError):
+        raise InvalidCursorError()
+    sql = f"({date_column} <= %s AND ({date_column} < %s OR {id_column} < %s))"
+    return sql, [date, date, row_id]
+
+
+def next_page(rows: list, limit: int) -> Tuple[list, Optional[str]]:
+    """
+    Split a `LIMIT limit + 1` fetch into the page and the next cursor
+
+    Args:
+        rows: Rows with `date` and `id`, newest first
+        limit: Page size
+
+    Returns:
+        (page rows, cursor for the next page or None on the last page)
+    """
+    if len(rows) <= limit:
+        return rows, None
+    last = rows[limit - 1]
+    return rows[:limit], encode_cursor({"date": last['date'], "id": last['id']})
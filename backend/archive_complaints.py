@@ -0,0 +1,100 @@
+"""
+Complaint Archival Script
+Keeps the monthly complaint partitions in shape: creates upcoming months
+and moves months older than COMPLAINTS_RETENTION_MONTHS whose complaints
+are all closed (resolved or rejected) into the COMPLAINTS_ARCHIVE_SCHEMA schema
+
+Run it monthly (e.g. from cron). Archived months drop out of every API
+query and index but keep their data; --restore attaches one again.
+
+Usage:
+    python archive_complaints.py --status                   # partitions and archive
+    python archive_complaints.py --dry-run                  # what would be archived
+    python archive_complaints.py                            # premake + archive
+    python archive_complaints.py --restore complaints_2023_01
+"""
+
+import argparse
+
+import psycopg2
+from psycopg2.extras import RealDictCursor
+
+from app.core.config import settings
+from app.services.complaint_partitions import complaint_partitions, is_partitioned
+
+
+def print_status(cursor):
+    """Attached and archived partitions"""
+    print(f"Attached partitions (retention {complaint_partitions.retention_months} months):")
+    for partition in complaint_partitions.partitions(cursor):
+        print(f"  {partition['name']:24}{partition['rows']:>10} rows (estimate)")
+    archived = complaint_partitions.archived(cursor)
+    print(f"Archived in schema {complaint_partitions.archive_schema}: {', '.join(archived) or 'none'}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Create upcoming complaint partitions and archive old ones")
+    parser.add_argument("--status", action="store_true", help="List partitions and exit")
+    parser.add_argument("--dry-run", action="store_true", help="Report without archiving")
+    parser.add_argument("--restore", metavar="PARTITION", help="Re-attach an archived month")
+    args = parser.parse_args()
+
+    conn = psycopg2.connect(
+        host=settings.DB_HOST,
+        database=settings.DB_NAME,
+        user=settings.DB_USER,
+        password=settings.DB_PASSWORD,
+        port=settings.DB_PORT
+    )
+    cursor = conn.cursor(cursor_factory=RealDictCursor)
+
+    if not is_partitioned(cursor):
+        raise SystemExit("❌ complaints is not partitioned; run `python partition_complaints.py` first")
+
+    if args.status:
+        print_status(cursor)
+        return
+
+    if args.restore:
+        try:
+            complaint_partitions.restore(cursor, args.restore)
+        except ValueError as e:
+            raise SystemExit(f"❌ {e}")
+        conn.commit()
+        print(f"✅ {args.restore} restored. Rebuild its similar-complaint lists with")
+        print("`python build_complaint_neighbors.py --stale-only`.")
+        return
+
+    print("=" * 60)
+    print("COMPLAINT ARCHIVAL" + (" (dry run)" if args.dry_run else ""))
+    print("=" * 60)
+
+    if not args.dry_run:
+        created = complaint_partitions.ensure_partitions(cursor)
+        print(f"  created: {', '.join(created) or 'no new partitions'}")
+
+    report = complaint_partitions.archive(cursor, dry_run=args.dry_run)
+    for entry in report:
+        detail = f", {entry['open']} still open" if entry["open"] else ""
+        print(f"  {entry['partition']:24}{entry['rows']:>8} rows{detail}: {entry['action']}")
+    if not report:
+        print("  nothing older than the retention window")
+    conn.commit()
+
+    cursor.close()
+    conn.close()
+    if args.dry_run:
+        pending = sum(1 for entry in report if entry["action"] == "would archive")
+        print(f"\n{pending} partition(s) would be archived")
+        return
+    archived = sum(1 for entry in report if entry["action"] == "archived")
+    print(f"\n✅ {archived} partition(s) archived to schema {complaint_partitions.archive_schema}")
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except Exception as e:
+        print(f"\n❌ Error archiving complaints: {e}")
+        import traceback
+        traceback.print_exc()
@@ -0,0 +1,85 @@
+"""
+Embedding Backfill Script
+Generates embeddings for every row that does not have one yet, or migrates
+stored vectors to the active EMBEDDING_VERSION
+
+Progress is checkpointed per table in embedding_backfill_state, so an
+interrupted run picks up where it stopped; a run that finishes clears its
+checkpoint, so the next one starts again from the first id.
+
+Usage:
+    python backfill_embeddings.py                       # all embedded tables
+    python backfill_embeddings.py --tables complaints announcements
+    python backfill_embeddings.py --workers 4 --chunk-size 10000
+    python backfill_embeddings.py --restart             # ignore checkpoints
+    python backfill_embeddings.py --reembed --rate 200  # throttled model migration
+    python backfill_embeddings.py --status              # vectors per model version
+"""
+
+import argparse
+import time
+
+from app.services.embedding_backfill import EMBEDDED_TABLES, get_version_counts, run_backfill
+from app.services.embedding_service import embedding_service
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Backfill missing embeddings")
+    parser.add_argument("--tables", nargs="+", choices=sorted(EMBEDDED_TABLES),
+                        help="Tables to process (default: all)")
+    parser.add_argument("--workers", type=int, default=2, help="Tables processed in parallel")
+    parser.add_argument("--chunk-size", type=int, default=None,
+                        help="Rows per fetch/write transaction (default: 5000, 500 with --reembed)")
+    parser.add_argument("--batch-size", type=int, default=64, help="Texts per model call")
+    parser.add_argument("--restart", action="store_true", help="Ignore saved checkpoints")
+    parser.add_argument("--reembed", action="store_true",
+                        help="Also rewrite vectors produced by other model versions")
+    parser.add_argument("--rate", type=float, default=0.0,
+                        help="Maximum rows per second per table (default: unlimited)")
+    parser.add_argument("--status", action="store_true", help="Show vectors per model version and exit")
+    args = parser.parse_args()
+
+    if args.status:
+        print(f"Active embedding version: {embedding_service.version}")
+        for table, versions in get_version_counts(args.tables).items():
+            print(f"  {table}:")
+            for version, rows in versions.items():
+                marker = "*" if version == embedding_service.version else " "
+                print(f"    {marker} {version}: {rows}")
+        return
+
+    # Smaller transactions keep row locks short while the API is serving
+    chunk_size = args.chunk_size or (500 if args.reembed else 5000)
+
+    print("=" * 60)
+    print("EMBEDDING RE-EMBED" if args.reembed else "EMBEDDING BACKFILL")
+    print("=" * 60)
+    print(f"Target version: {embedding_service.version}")
+    started = time.perf_counter()
+
+    counts = run_backfill(
+        tables=args.tables,
+        workers=args.workers,
+        chunk_size=chunk_size,
+        batch_size=args.batch_size,
+        restart=args.restart,
+        reembed=args.reembed,
+        rate_limit=args.rate
+    )
+
+    elapsed = time.perf_counter() - started
+    print("\n" + "=" * 60)
+    print(f"✅ Backfill complete in {elapsed:.1f}s")
+    for table, count in counts.items():
+        if count:
+            print(f"  - {table}: {count} rows")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except Exception as e:
+        print(f"\n❌ Error during backfill: {e}")
+        import traceback
+        traceback.print_exc()
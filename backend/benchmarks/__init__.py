@@ -0,0 +1,4 @@
+"""
+Performance benchmarks
+Run from the backend directory, e.g. `python -m benchmarks.embedding_engines`
+"""
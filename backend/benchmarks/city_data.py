@@ -0,0 +1,312 @@
+"""
+Synthetic City Data Generator
+Loads complaint and announcement corpora of any size (up to tens of
+millions of rows) into the configured database, for the search benchmarks
+
+Texts are built from the descriptions, categories, wards and announcements
+in populate_data.py, placed in Bangalore localities. A few thousand
+distinct texts are embedded with the active model and every row gets its
+text's vector plus a little Gaussian noise, so rows form the near-duplicate
+clusters real complaint streams have without embedding each row. Wards
+follow a Zipf-like size distribution, dates spread over the last `months`
+months, and older complaints are more likely to be resolved.
+
+Rows are streamed with binary COPY in chunks, each chunk its own
+transaction. Loading into the HNSW-indexed tables is bounded by index
+inserts; at 10M rows expect hours. Point DB_NAME at a scratch database:
+--replace truncates complaints and announcements.
+
+Usage:
+    python -m benchmarks.city_data --complaints 1000000 [--announcements 20000] [--replace]
+"""
+
+import argparse
+import asyncio
+import random
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+from psycopg2.extras import execute_values
+
+from app.core.async_database import AsyncDatabase
+from app.core.database import Database
+from app.core.vector_search import vector_search
+from app.services.complaint_partitions import complaint_partitions, is_partitioned, month_start
+from app.services.embedding_service import embedding_service
+from app.services.user_import import PasswordHashPool
+from benchmarks.ward_search import ward_assignments
+from populate_data import ANNOUNCEMENTS, COMPLAINT_DESCRIPTIONS, WARDS, ZONES
+
+LOCALITIES = [
+    "Koramangala", "Indiranagar", "Jayanagar", "Whitefield", "HSR Layout", "Malleshwaram",
+    "Basavanagudi", "Rajajinagar", "BTM Layout", "Hebbal", "Yelahanka", "Marathahalli",
+    "Banashankari", "JP Nagar", "Electronic City", "Frazer Town", "Vijayanagar", "RT Nagar"
+]
+LANDMARKS = [
+    "near the bus stop", "opposite the temple", "behind the market", "next to the government school",
+    "at the main junction", "on the 3rd cross road", "near the metro station", "outside the apartment gate"
+]
+DURATIONS = ["", " since last week", " for over a month", " again after last repair"]
+
+# Category of each COMPLAINT_DESCRIPTIONS entry, in order (values from CATEGORIES)
+DESCRIPTION_CATEGORIES = [
+    "Roads & Infrastructure", "Street Lights", "Water Supply", "Garbage Collection",
+    "Sanitation & Drainage", "Roads & Infrastructure", "Water Supply", "Street Lights",
+    "Sanitation & Drainage", "Parks & Recreation", "Traffic Management", "Parks & Recreation",
+    "Sanitation & Drainage", "Electricity", "Roads & Infrastructure", "Public Transport",
+    "Traffic Management", "Others", "Others", "Sanitation & Drainage"
+]
+
+BENCH_EMAIL_DOMAIN = "bench.smartcity.example"
+BENCH_PASSWORD = "benchmark123"
+
+
+def complaint_texts(count: int, seed: int = 42) -> list:
+    """
+    Distinct complaint texts as (description, category) pairs
+
+    Args:
+        count: Texts wanted (capped by the number of combinations)
+        seed: Sampling seed; different seeds give different (overlapping) sets
+    """
+    combinations = len(COMPLAINT_DESCRIPTIONS) * len(LOCALITIES) * len(LANDMARKS) * len(DURATIONS)
+    picks = random.Random(seed).sample(range(combinations), min(count, combinations))
+    texts = []
+    for pick in picks:
+        pick, duration = divmod(pick, len(DURATIONS))
+        pick, landmark = divmod(pick, len(LANDMARKS))
+        template, locality = divmod(pick, len(LOCALITIES))
+        texts.append((
+            f"{COMPLAINT_DESCRIPTIONS[template]} {LANDMARKS[landmark]} in {LOCALITIES[locality]}{DURATIONS[duration]}",
+            DESCRIPTION_CATEGORIES[template]
+        ))
+    return texts
+
+
+def announcement_texts(count: int, seed: int = 42) -> list:
+    """Distinct announcement texts as (title, body) pairs, localized from ANNOUNCEMENTS"""
+    combinations = len(ANNOUNCEMENTS) * len(LOCALITIES)
+    picks = random.Random(seed).sample(range(combinations), min(count, combinations))
+    texts = []
+    for pick in picks:
+        template, locality = divmod(pick, len(LOCALITIES))
+        title, body, _ = ANNOUNCEMENTS[template]
+        texts.append((f"{title} - {LOCALITIES[locality]}", f"{body} Applies to {LOCALITIES[locality]}."))
+    return texts
+
+
+def embed(texts: list) -> np.ndarray:
+    """L2-normalized float32 embeddings of texts from the active model"""
+    vectors = np.vstack(embedding_service.get_embeddings_batch(
+        texts,
+        use_cache=False,
+        show_progress_bar=False
+    )).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def jitter(base: np.ndarray, rng: np.random.Generator, noise: float) -> np.ndarray:
+    """Copies of base vectors with Gaussian noise, re-normalized"""
+    noisy = base + rng.normal(0.0, noise, base.shape).astype(np.float32)
+    return noisy / np.linalg.norm(noisy, axis=1, keepdims=True)
+
+
+def ward_numbers(count: int, skew: float, seed: int) -> np.ndarray:
+    """Ward number per row, from WARDS, with Zipf-like ward sizes"""
+    return np.asarray(WARDS)[ward_assignments(count, len(WARDS), skew, seed=seed) - 1]
+
+
+def random_dates(count: int, months: int, rng: np.random.Generator) -> np.ndarray:
+    """Timestamps spread evenly over the last `months` months"""
+    offsets = (rng.random(count) * months * 30.44 * 86400).astype("timedelta64[s]")
+    return np.datetime64(datetime.now(), "s") - offsets
+
+
+def statuses_by_age(dates: np.ndarray, rng: np.random.Generator) -> list:
+    """Complaint statuses, resolved more often the older the complaint"""
+    age_years = (np.datetime64(datetime.now(), "s") - dates).astype(np.float64) / (365 * 86400)
+    resolved = np.clip(0.1 + 0.45 * age_years, 0.0, 0.95)
+    draw = rng.random(len(dates))
+    return np.where(
+        draw < resolved, "resolved",
+        np.where(draw < resolved + 0.3 * (1 - resolved), "in_progress", "pending")
+    ).tolist()
+
+
+def prepare_tables(months: int, citizens: int, replace: bool) -> list:
+    """
+    Premake partitions, clear old data when asked, and create the citizens
+    who file the generated complaints
+
+    Returns:
+        Citizen ids
+    """
+    with Database.get_cursor() as cursor:
+        if replace:
+            print("Clearing complaints and announcements...")
+            cursor.execute("TRUNCATE TABLE complaints, complaint_neighbors, announcements RESTART IDENTITY")
+            cursor.execute("DELETE FROM embedding_jobs WHERE table_name IN ('complaints', 'announcements')")
+
+        if is_partitioned(cursor):
+            first = month_start(datetime.now() - timedelta(days=months * 31))
+            created = complaint_partitions.ensure_partitions(cursor, since=first)
+            if created:
+                print(f"Created {len(created)} complaint partitions")
+
+        with PasswordHashPool() as hasher:
+            password_hash = hasher.hash_many([BENCH_PASSWORD])[0]
+        rng = random.Random(7)
+        execute_values(
+            cursor,
+            """
+            INSERT INTO citizens (name, email, phone, ward_number, zone, role, password_hash)
+            VALUES %s
+            ON CONFLICT (email) DO NOTHING
+            """,
+            [
+                (f"Benchmark Citizen {i + 1}", f"citizen{i + 1}@{BENCH_EMAIL_DOMAIN}", f"+91 90000{i:05d}",
+                 rng.choice(WARDS), rng.choice(ZONES), "citizen", password_hash)
+                for i in range(citizens)
+            ],
+            page_size=1000
+        )
+        cursor.execute(
+            "SELECT id FROM citizens WHERE email LIKE %s ORDER BY id LIMIT %s",
+            (f"%@{BENCH_EMAIL_DOMAIN}", citizens)
+        )
+        return [row['id'] for row in cursor.fetchall()]
+
+
+async def copy_rows(table: str, columns: list, types: list, rows: list):
+    """
+    Append rows to a table through a binary COPY into a temporary table
+
+    The temporary table takes the embedding as a plain vector, which the
+    INSERT casts to the configured storage type (e.g. halfvec).
+    """
+    async with AsyncDatabase.get_cursor() as cursor:
+        await cursor.execute("SELECT 'vector'::regtype::oid AS oid")
+        vector_oid = (await cursor.fetchone())['oid']
+        definitions = ", ".join(f"{column} {type_name}" for column, type_name in zip(columns, types))
+        await cursor.execute(
+            f"CREATE TEMP TABLE bench_load ({definitions}, embedding vector({vector_search.dimension})) ON COMMIT DROP"
+        )
+        async with cursor.copy("COPY bench_load FROM STDIN (FORMAT BINARY)") as copy:
+            copy.set_types([*types, vector_oid])
+            for row in rows:
+                await copy.write_row(row)
+        column_list = ", ".join(columns)
+        await cursor.execute(
+            f"""
+            INSERT INTO {table} ({column_list}, embedding, embedding_model)
+            SELECT {column_list}, embedding::{vector_search.column_type}, %s FROM bench_load
+            """,
+            (embedding_service.version,)
+        )
+
+
+async def load_complaints(count: int, user_ids: list, args):
+    """Generate and load `count` complaints in chunks"""
+    texts = complaint_texts(args.distinct_texts, seed=args.seed)
+    print(f"Embedding {len(texts)} distinct complaint texts...")
+    base = embed([description for description, _ in texts])
+    rng = np.random.default_rng(args.seed)
+    ward_of = ward_numbers(count, args.skew, args.seed)
+
+    started = time.perf_counter()
+    for start in range(0, count, args.chunk_size):
+        size = min(args.chunk_size, count - start)
+        picks = rng.integers(0, len(texts), size)
+        vectors = jitter(base[picks], rng, args.noise)
+        dates = random_dates(size, args.months, rng)
+        statuses = statuses_by_age(dates, rng)
+        users = rng.choice(user_ids, size)
+        rows = [
+            (int(users[i]), int(ward_of[start + i]), texts[picks[i]][1], texts[picks[i]][0],
+             statuses[i], dates[i].astype(datetime), vectors[i])
+            for i in range(size)
+        ]
+        await copy_rows(
+            "complaints",
+            ["user_id", "ward_number", "category", "description", "status", "date"],
+            ["int4", "int4", "text", "text", "text", "timestamp"],
+            rows
+        )
+        done = start + size
+        rate = done / (time.perf_counter() - started)
+        print(f"  complaints: {done}/{count} ({rate:,.0f} rows/s)")
+
+
+async def load_announcements(count: int, args):
+    """Generate and load `count` announcements; a --city-wide share has no ward"""
+    texts = announcement_texts(args.distinct_texts, seed=args.seed)
+    print(f"Embedding {len(texts)} distinct announcement texts...")
+    base = embed([f"{title}. {body}" for title, body in texts])
+    rng = np.random.default_rng(args.seed + 1)
+    ward_of = ward_numbers(count, args.skew, args.seed + 1)
+    city_wide = rng.random(count) < args.city_wide
+
+    for start in range(0, count, args.chunk_size):
+        size = min(args.chunk_size, count - start)
+        picks = rng.integers(0, len(texts), size)
+        vectors = jitter(base[picks], rng, args.noise)
+        dates = random_dates(size, args.months, rng)
+        rows = [
+            (None if city_wide[start + i] else int(ward_of[start + i]), texts[picks[i]][0], texts[picks[i]][1],
+             dates[i].astype(datetime), vectors[i])
+            for i in range(size)
+        ]
+        await copy_rows(
+            "announcements",
+            ["ward_number", "title", "body", "date"],
+            ["int4", "text", "text", "timestamp"],
+            rows
+        )
+        print(f"  announcements: {start + size}/{count}")
+
+
+async def main(args):
+    user_ids = prepare_tables(args.months, args.citizens, args.replace)
+    await AsyncDatabase.open_pool()
+    started = time.perf_counter()
+    try:
+        if args.complaints:
+            await load_complaints(args.complaints, user_ids, args)
+        if args.announcements:
+            await load_announcements(args.announcements, args)
+    finally:
+        await AsyncDatabase.close_pool()
+
+    with Database.get_cursor() as cursor:
+        cursor.execute("ANALYZE complaints")
+        cursor.execute("ANALYZE announcements")
+        cursor.execute("SELECT (SELECT count(*) FROM complaints) AS complaints, "
+                       "(SELECT count(*) FROM announcements) AS announcements")
+        totals = cursor.fetchone()
+
+    print("\n" + "=" * 60)
+    print(f"✅ Loaded in {time.perf_counter() - started:.1f}s: "
+          f"{totals['complaints']} complaints, {totals['announcements']} announcements in total")
+    print("=" * 60)
+    print("Generated complaints have no similar-complaint lists yet; build them with")
+    print("`python build_complaint_neighbors.py --stale-only`, and refresh per-ward")
+    print("indexes with `python manage_ward_indexes.py`.")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load a synthetic complaint and announcement corpus")
+    parser.add_argument("--complaints", type=int, default=100000)
+    parser.add_argument("--announcements", type=int, default=2000)
+    parser.add_argument("--citizens", type=int, default=1000, help="Benchmark citizens filing the complaints")
+    parser.add_argument("--months", type=int, default=24, help="Spread dates over this many months")
+    parser.add_argument("--skew", type=float, default=1.0, help="Zipf exponent of ward sizes")
+    parser.add_argument("--city-wide", type=float, default=0.3, help="Share of announcements without a ward")
+    parser.add_argument("--distinct-texts", type=int, default=5000, help="Texts embedded per table")
+    parser.add_argument("--noise", type=float, default=0.02, help="Per-dimension noise added to text vectors")
+    parser.add_argument("--chunk-size", type=int, default=20000, help="Rows per COPY transaction")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--replace", action="store_true", help="Truncate complaints and announcements first")
+    args = parser.parse_args()
+
+    asyncio.run(main(args))
@@ -0,0 +1,83 @@
+"""
+Cold Start Benchmark
+Measures how long a fresh API process takes to import, become live and
+become ready to embed
+
+Every run happens in a clean subprocess. Run it on two git revisions to
+compare before/after, e.g.:
+    git stash; python -m benchmarks.cold_start --json before.json; git stash pop
+    python -m benchmarks.cold_start --json after.json
+
+Usage:
+    python -m benchmarks.cold_start [--runs 3] [--json results.json]
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+
+# Runs inside the child process; prints one JSON line
+PROBE = r"""
+import json, time
+t0 = time.perf_counter()
+import main
+t_import = time.perf_counter() - t0
+
+from app.services.embedding_service import embedding_service
+if hasattr(embedding_service, "start_warmup"):
+    embedding_service.start_warmup()
+
+t1 = time.perf_counter()
+embedding_service.get_embedding("street light not working")
+t_first = time.perf_counter() - t1
+
+t2 = time.perf_counter()
+embedding_service.get_embedding("garbage not collected for three days")
+t_warm = time.perf_counter() - t2
+
+print(json.dumps({
+    "import_seconds": t_import,
+    "first_embedding_seconds": t_first,
+    "ready_seconds": t_import + t_first,
+    "warm_embedding_ms": t_warm * 1000.0,
+}))
+"""
+
+
+def measure_once() -> dict:
+    """Start a fresh interpreter and time the probe"""
+    output = subprocess.run(
+        [sys.executable, "-c", PROBE],
+        check=True,
+        capture_output=True,
+        text=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure API cold start")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--json", help="Write results to this file")
+    args = parser.parse_args()
+
+    runs = [measure_once() for _ in range(args.runs)]
+    summary = {
+        key: round(statistics.median(run[key] for run in runs), 4)
+        for key in runs[0]
+    }
+
+    print("\n" + "=" * 60)
+    print("COLD START (median of %d runs)" % args.runs)
+    print("=" * 60)
+    print(f"Import main (liveness possible): {summary['import_seconds']:.2f}s")
+    print(f"First embedding after import:    {summary['first_embedding_seconds']:.2f}s")
+    print(f"Process start -> model ready:    {summary['ready_seconds']:.2f}s")
+    print(f"Warm embedding latency:          {summary['warm_embedding_ms']:.1f}ms")
+    print("=" * 60)
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"runs": runs, "median": summary}, f, indent=2)
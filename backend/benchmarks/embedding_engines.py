@@ -0,0 +1,167 @@
+"""
+Embedding Engine Benchmark
+Compares the torch and int8 ONNX engines on latency, throughput, RSS and
+cosine agreement
+
+Each engine runs in its own subprocess so peak RSS is measured in isolation.
+
+Usage:
+    python -m benchmarks.embedding_engines [--engines torch onnx] [--batch-size 32]
+"""
+
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from app.core.config import settings
+from app.services.embedding_engines import ONNX_COSINE_TOLERANCE, create_engine
+from populate_data import COMPLAINT_DESCRIPTIONS
+
+QUERY_PREFIXES = ["", "Urgent: ", "Since last week ", "In our street, ", "Please help - "]
+
+
+def sample_texts(count: int) -> list:
+    """Build a deterministic corpus of complaint-like texts"""
+    texts = []
+    for i in range(count):
+        prefix = QUERY_PREFIXES[i % len(QUERY_PREFIXES)]
+        base = COMPLAINT_DESCRIPTIONS[i % len(COMPLAINT_DESCRIPTIONS)]
+        texts.append(f"{prefix}{base} near ward {i % 198 + 1}")
+    return texts
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process (Linux reports KB)"""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0
+
+
+def run_engine(engine_name: str, texts: list, batch_size: int, vectors_path: str) -> dict:
+    """
+    Measure one engine inside the current process
+
+    Returns:
+        Dictionary of load time, RSS, single-text latency and batch throughput
+    """
+    rss_before = peak_rss_mb()
+    started = time.perf_counter()
+    engine = create_engine(engine_name, settings.EMBEDDING_MODEL_NAME, onnx_dir=settings.EMBEDDING_ONNX_DIR)
+    load_seconds = time.perf_counter() - started
+    rss_loaded = peak_rss_mb()
+
+    # Warm up kernels before timing
+    engine.encode(texts[:8])
+
+    latencies = []
+    for text in texts[:200]:
+        t0 = time.perf_counter()
+        engine.encode([text])
+        latencies.append((time.perf_counter() - t0) * 1000.0)
+    latencies.sort()
+
+    vectors = []
+    t0 = time.perf_counter()
+    for start in range(0, len(texts), batch_size):
+        vectors.append(engine.encode(texts[start:start + batch_size]))
+    batch_seconds = time.perf_counter() - t0
+    np.save(vectors_path, np.vstack(vectors))
+
+    return {
+        "engine": engine_name,
+        "load_seconds": round(load_seconds, 3),
+        "rss_model_mb": round(rss_loaded - rss_before, 1),
+        "rss_peak_mb": round(peak_rss_mb(), 1),
+        "single_ms_p50": round(latencies[len(latencies) // 2], 3),
+        "single_ms_p95": round(latencies[int(len(latencies) * 0.95) - 1], 3),
+        "batch_size": batch_size,
+        "throughput_texts_per_sec": round(len(texts) / batch_seconds, 1)
+    }
+
+
+def compare(engines: list, count: int, batch_size: int) -> dict:
+    """Run every engine in a subprocess and compare the results"""
+    workdir = tempfile.mkdtemp(prefix="embedding-bench-")
+    results = {}
+    for engine_name in engines:
+        result_path = os.path.join(workdir, f"{engine_name}.json")
+        subprocess.run(
+            [
+                sys.executable, "-m", "benchmarks.embedding_engines",
+                "--run-engine", engine_name,
+                "--count", str(count),
+                "--batch-size", str(batch_size),
+                "--output", result_path
+            ],
+            check=True
+        )
+        with open(result_path) as f:
+            results[engine_name] = json.load(f)
+
+    report = {"engines": results}
+    if "torch" in engines and "onnx" in engines:
+        reference = np.load(os.path.join(workdir, "torch.npy"))
+        candidate = np.load(os.path.join(workdir, "onnx.npy"))
+        cosines = np.sum(reference * candidate, axis=1)
+        report["onnx_vs_torch"] = {
+            "cosine_min": round(float(cosines.min()), 5),
+            "cosine_mean": round(float(cosines.mean()), 5),
+            "tolerance": ONNX_COSINE_TOLERANCE,
+            "within_tolerance": bool(cosines.min() >= 1.0 - ONNX_COSINE_TOLERANCE)
+        }
+    return report
+
+
+def print_report(report: dict):
+    """Print a side-by-side summary"""
+    print("\n" + "=" * 60)
+    print("EMBEDDING ENGINE BENCHMARK")
+    print("=" * 60)
+    fields = [
+        ("load_seconds", "Load time (s)"),
+        ("rss_model_mb", "Model RSS (MB)"),
+        ("rss_peak_mb", "Peak RSS (MB)"),
+        ("single_ms_p50", "Single text p50 (ms)"),
+        ("single_ms_p95", "Single text p95 (ms)"),
+        ("throughput_texts_per_sec", "Batch throughput (texts/s)")
+    ]
+    engines = list(report["engines"])
+    print(f"{'':28}" + "".join(f"{name:>14}" for name in engines))
+    for key, label in fields:
+        print(f"{label:28}" + "".join(f"{report['engines'][name][key]:>14}" for name in engines))
+
+    agreement = report.get("onnx_vs_torch")
+    if agreement:
+        status = "✅" if agreement["within_tolerance"] else "❌"
+        print(f"\n{status} ONNX vs torch cosine: min {agreement['cosine_min']}, "
+              f"mean {agreement['cosine_mean']} (tolerance {agreement['tolerance']})")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark embedding engines")
+    parser.add_argument("--engines", nargs="+", default=["torch", "onnx"])
+    parser.add_argument("--count", type=int, default=2000, help="Texts to encode per engine")
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--json", help="Write the comparison report to this file")
+    parser.add_argument("--run-engine", help=argparse.SUPPRESS)
+    parser.add_argument("--output", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run_engine:
+        # Child mode: measure a single engine and write its results
+        vectors_path = os.path.join(os.path.dirname(args.output), f"{args.run_engine}.npy")
+        result = run_engine(args.run_engine, sample_texts(args.count), args.batch_size, vectors_path)
+        with open(args.output, "w") as f:
+            json.dump(result, f)
+    else:
+        report = compare(args.engines, args.count, args.batch_size)
+        print_report(report)
+        if args.json:
+            with open(args.json, "w") as f:
+                json.dump(report, f, indent=2)
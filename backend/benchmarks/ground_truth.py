@@ -0,0 +1,309 @@
+"""
+Exact kNN Ground Truth
+Brute-force nearest neighbours over the stored embeddings, and the query
+workloads the search benchmarks are scored against
+
+exact_knn() streams a table's vectors from Postgres in id order (binary,
+as float32 NumPy arrays) and merges every query's running top-k chunk by
+chunk, so memory stays at one chunk however large the table is. Queries
+that share a filter share one pass over the table.
+
+build_workload() draws queries for each searched path and stores them with
+their exact neighbours under the filters the service applies:
+
+    search_complaints   free-text queries, city-wide or for one ward,
+                        within the default SEARCH_RECENT_MONTHS window
+    similar_complaints  stored complaints; neighbours from the same ward,
+                        excluding the complaint itself
+    announcements       free-text queries, city-wide or for one ward
+                        (whose results include city-wide announcements)
+
+Building ground truth reads every vector once per filter group, so build a
+workload once per corpus and reuse the file across benchmark runs.
+
+Usage:
+    python -m benchmarks.ground_truth --output workload.json [--queries 200] [--k 10]
+"""
+
+import argparse
+import asyncio
+import json
+import random
+from collections import defaultdict
+from datetime import datetime
+from typing import List, Optional, Sequence
+
+import numpy as np
+
+from app.core.async_database import AsyncDatabase
+from app.core.config import settings
+from app.services.complaint_partitions import recent_window_start
+from app.services.embedding_service import embedding_service
+from benchmarks.city_data import announcement_texts, complaint_texts, embed
+from benchmarks.embedding_engines import QUERY_PREFIXES
+
+WORKLOADS = ("search_complaints", "similar_complaints", "announcements")
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.where(norms > 0, norms, 1.0)
+
+
+async def exact_knn(
+    table: str,
+    queries: np.ndarray,
+    k: int,
+    where: str = "TRUE",
+    params: Sequence = (),
+    exclude: Optional[Sequence[int]] = None,
+    chunk_size: int = 20000
+) -> List[list]:
+    """
+    Exact cosine nearest neighbours of each query among a table's rows
+
+    Args:
+        table: Table with an `embedding` column
+        queries: Query vectors, one per row
+        k: Neighbours per query
+        where: Filter on the table's rows, with %s placeholders
+        params: Parameters for `where`
+        exclude: Per query, a row id to leave out (e.g. the query's own row)
+        chunk_size: Rows fetched and scored at a time
+
+    Returns:
+        Per query, [(id, cosine distance)] closest first
+    """
+    queries = _normalize(np.asarray(queries, dtype=np.float32))
+    count = len(queries)
+    excluded = np.asarray(exclude if exclude is not None else [-1] * count, dtype=np.int64)
+    best_ids = np.zeros((count, 0), dtype=np.int64)
+    best_scores = np.zeros((count, 0), dtype=np.float32)
+    last_id = 0
+    while True:
+        async with AsyncDatabase.get_cursor() as cursor:
+            await cursor.execute(
+                f"SELECT id, embedding FROM {table} WHERE ({where}) AND id > %s ORDER BY id LIMIT %s",
+                (*params, last_id, chunk_size),
+                binary=True
+            )
+            rows = await cursor.fetchall()
+        if not rows:
+            break
+        ids = np.fromiter((row['id'] for row in rows), dtype=np.int64, count=len(rows))
+        scores = queries @ _normalize(np.vstack([row['embedding'] for row in rows])).T
+        scores[ids[None, :] == excluded[:, None]] = -np.inf
+
+        # Merge the chunk into each query's running top-k
+        merged_ids = np.hstack([best_ids, np.broadcast_to(ids, (count, len(ids)))])
+        merged_scores = np.hstack([best_scores, scores])
+        keep = min(k, merged_scores.shape[1])
+        top = np.argpartition(-merged_scores, keep - 1, axis=1)[:, :keep]
+        best_ids = np.take_along_axis(merged_ids, top, axis=1)
+        best_scores = np.take_along_axis(merged_scores, top, axis=1)
+        last_id = int(ids[-1])
+
+    order = np.argsort(-best_scores, axis=1, kind="stable")
+    results = []
+    for row_ids, row_scores, row_order in zip(best_ids, best_scores, order):
+        results.append([
+            (int(row_ids[i]), float(1.0 - row_scores[i])) for i in row_order if np.isfinite(row_scores[i])
+        ])
+    return results
+
+
+def recall_at_k(found: list, entry: dict, k: int, tolerance: float = 1e-4) -> Optional[float]:
+    """
+    Share of a query's exact top-k that a search returned
+
+    A result as close as the k-th exact neighbour counts as found, so
+    equidistant rows (duplicate complaints) do not read as misses.
+
+    Args:
+        found: Search results as [(id, cosine distance or None)]
+        entry: Workload entry with `neighbors` and `distances`
+        k: Cut-off
+
+    Returns:
+        Recall in [0, 1], or None when the query has no neighbours at all
+    """
+    truth = entry["neighbors"][:k]
+    if not truth:
+        return None
+    expected = set(truth)
+    kth_distance = entry["distances"][len(truth) - 1]
+    hits = sum(
+        1 for row_id, distance in found[:k]
+        if row_id in expected or (distance is not None and distance <= kth_distance + tolerance)
+    )
+    return min(hits, len(truth)) / len(truth)
+
+
+async def _ward_weights(table: str, version: str) -> tuple:
+    """Wards with vectors in a table and their row counts"""
+    async with AsyncDatabase.get_cursor() as cursor:
+        await cursor.execute(
+            f"""
+            SELECT ward_number, count(*) AS rows FROM {table}
+            WHERE embedding_model = %s AND ward_number IS NOT NULL
+            GROUP BY ward_number
+            """,
+            (version,)
+        )
+        rows = await cursor.fetchall()
+    return [row['ward_number'] for row in rows], [row['rows'] for row in rows]
+
+
+async def _with_truth(table: str, entries: list, vectors: np.ndarray, k: int, filters) -> list:
+    """
+    Fill in each entry's exact neighbours, one pass per distinct filter
+
+    `filters(entry)` returns the (where, params) a query is answered under.
+    """
+    groups = defaultdict(list)
+    for index, entry in enumerate(entries):
+        where, params = filters(entry)
+        groups[(where, tuple(params))].append(index)
+    for (where, params), members in groups.items():
+        exclude = [entries[i].get("complaint_id", -1) for i in members]
+        found = await exact_knn(table, vectors[members], k, where, params, exclude=exclude)
+        for index, neighbors in zip(members, found):
+            entries[index]["neighbors"] = [row_id for row_id, _ in neighbors]
+            entries[index]["distances"] = [round(distance, 6) for _, distance in neighbors]
+    return entries
+
+
+async def _stored_complaints(count: int, version: str, rng: random.Random) -> tuple:
+    """Random stored complaints with vectors, as (entries, vectors)"""
+    async with AsyncDatabase.get_cursor() as cursor:
+        await cursor.execute("SELECT min(id) AS first, max(id) AS last FROM complaints")
+        bounds = await cursor.fetchone()
+        if bounds['first'] is None:
+            return [], np.zeros((0, 0), dtype=np.float32)
+        # Probe random ids rather than ORDER BY random(), which reads the whole table
+        probes = [rng.randint(bounds['first'], bounds['last']) for _ in range(count * 4)]
+        await cursor.execute(
+            "SELECT id, ward_number, embedding FROM complaints WHERE id = ANY(%s) AND embedding_model = %s",
+            (probes, version),
+            binary=True
+        )
+        rows = await cursor.fetchall()
+    rng.shuffle(rows)
+    rows = rows[:count]
+    entries = [{"complaint_id": row['id'], "ward": row['ward_number']} for row in rows]
+    vectors = np.vstack([row['embedding'] for row in rows]) if rows else np.zeros((0, 0), dtype=np.float32)
+    return entries, vectors
+
+
+async def build_workload(count: int, k: int, ward_share: float = 0.5, seed: int = 7) -> dict:
+    """
+    Draw queries for every searched path and compute their exact neighbours
+
+    Args:
+        count: Queries per path
+        k: Neighbours stored per query
+        ward_share: Share of text queries restricted to one ward (wards
+            drawn in proportion to their size)
+        seed: Sampling seed
+
+    Returns:
+        Workload dictionary (JSON-serializable)
+    """
+    version = embedding_service.version
+    since = recent_window_start(settings.SEARCH_RECENT_MONTHS)
+    rng = random.Random(seed)
+
+    async def pick_ward(table: str):
+        wards, weights = await _ward_weights(table, version)
+        return lambda: rng.choices(wards, weights)[0] if wards and rng.random() < ward_share else None
+
+    # Free-text complaint searches
+    pick = await pick_ward("complaints")
+    texts = [
+        f"{QUERY_PREFIXES[i % len(QUERY_PREFIXES)]}{description}"
+        for i, (description, _) in enumerate(complaint_texts(count, seed=seed))
+    ]
+    complaint_queries = [{"query": text, "ward": pick()} for text in texts]
+
+    def complaint_filter(entry):
+        conditions, params = ["embedding_model = %s"], [version]
+        if entry["ward"] is not None:
+            conditions.append("ward_number = %s")
+            params.append(entry["ward"])
+        if since is not None:
+            conditions.append("date >= %s")
+            params.append(since)
+        return " AND ".join(conditions), params
+
+    print(f"Ground truth for {len(complaint_queries)} complaint searches...")
+    await _with_truth("complaints", complaint_queries, embed(texts), k, complaint_filter)
+
+    # Similar complaints of stored complaints
+    similar, vectors = await _stored_complaints(count, version, rng)
+    print(f"Ground truth for {len(similar)} similar-complaint lookups...")
+    await _with_truth(
+        "complaints", similar, vectors, k,
+        lambda entry: ("embedding_model = %s AND ward_number = %s", [version, entry["ward"]])
+    )
+
+    # Announcement searches
+    pick = await pick_ward("announcements")
+    texts = [
+        f"{QUERY_PREFIXES[i % len(QUERY_PREFIXES)]}{title}"
+        for i, (title, _) in enumerate(announcement_texts(count, seed=seed))
+    ]
+    announcement_queries = [{"query": text, "ward": pick()} for text in texts]
+    print(f"Ground truth for {len(announcement_queries)} announcement searches...")
+    await _with_truth(
+        "announcements", announcement_queries, embed(texts), k,
+        lambda entry: (
+            ("embedding_model = %s AND (ward_number = %s OR ward_number IS NULL)", [version, entry["ward"]])
+            if entry["ward"] is not None else ("embedding_model = %s", [version])
+        )
+    )
+
+    async with AsyncDatabase.get_cursor() as cursor:
+        await cursor.execute(
+            "SELECT (SELECT count(*) FROM complaints WHERE embedding_model = %s) AS complaints, "
+            "(SELECT count(*) FROM announcements WHERE embedding_model = %s) AS announcements",
+            (version, version)
+        )
+        rows = await cursor.fetchone()
+
+    return {
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "embedding_model": version,
+        "k": k,
+        "since": since.isoformat() if since else None,
+        "rows": {"complaints": rows['complaints'], "announcements": rows['announcements']},
+        "workloads": {
+            "search_complaints": complaint_queries,
+            "similar_complaints": similar,
+            "announcements": announcement_queries
+        }
+    }
+
+
+async def main(args) -> dict:
+    await AsyncDatabase.open_pool()
+    try:
+        return await build_workload(args.queries, args.k, ward_share=args.ward_share, seed=args.seed)
+    finally:
+        await AsyncDatabase.close_pool()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build a search workload with exact kNN ground truth")
+    parser.add_argument("--output", required=True, help="Write the workload to this file")
+    parser.add_argument("--queries", type=int, default=200, help="Queries per searched path")
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--ward-share", type=float, default=0.5, help="Share of text queries scoped to one ward")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    workload = asyncio.run(main(args))
+    with open(args.output, "w") as f:
+        json.dump(workload, f)
+    print(f"\n✅ Wrote {sum(len(entries) for entries in workload['workloads'].values())} queries "
+          f"({workload['rows']['complaints']} complaints, {workload['rows']['announcements']} "
+          f"announcements) to {args.output}")
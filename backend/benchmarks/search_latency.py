@@ -0,0 +1,243 @@
+"""
+Search Latency and Recall Benchmark
+Runs a ground-truth workload (benchmarks.ground_truth) through the three
+vector search paths and reports p50/p95/p99 latency and recall@k:
+
+    search_complaints   ComplaintService.search_complaints (cache cleared
+                        before every query, so each one reaches the database)
+    similar_complaints  ComplaintService._find_similar_internal
+    announcements       announcement search
+
+Latency is end to end for the call, query embedding included. The report
+records the git commit, corpus size and search settings next to the
+numbers; pass an earlier report as --compare to flag regressions (the run
+exits non-zero when a latency percentile grows by more than
+--latency-tolerance or recall drops by more than --recall-tolerance).
+With VECTOR_INDEX_ENABLED=true the in-process index is loaded first and
+answers the searches it covers.
+
+Usage:
+    python -m benchmarks.search_latency --workload workload.json [--json results.json] [--compare baseline.json]
+"""
+
+import argparse
+import asyncio
+import json
+import subprocess
+import time
+from datetime import datetime
+from types import SimpleNamespace
+
+import numpy as np
+
+from app.core.async_database import AsyncDatabase
+from app.core.config import settings
+from app.routes.announcements import AnnouncementSearchQuery, _search_announcements
+from app.services.complaint_service import SEARCH_MODES, ComplaintService, complaint_service
+from app.services.search_cache import search_cache
+from app.services.vector_index import vector_index
+from app.utils.stats import percentile
+from benchmarks.ground_truth import WORKLOADS, build_workload, recall_at_k
+
+PERCENTILES = (50, 95, 99)
+
+# Settings that change which plan answers a search
+REPORTED_SETTINGS = (
+    "VECTOR_STORAGE", "VECTOR_BINARY_PREFILTER", "VECTOR_RERANK_FACTOR", "VECTOR_WARD_EXACT_MAX_ROWS",
+    "VECTOR_WARD_PARTIAL_INDEX_MIN_ROWS", "VECTOR_EF_SEARCH_MAX", "VECTOR_INDEX_ENABLED",
+    "VECTOR_INDEX_BACKEND", "SEARCH_RECENT_MONTHS", "EMBEDDING_ENGINE"
+)
+
+
+def git_commit() -> str:
+    """Short hash of the checked-out commit, or None outside a git checkout"""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def search_complaints(entry: dict, k: int, mode: str) -> list:
+    """One complaint search as an admin; distances only exist in vector mode"""
+    search_cache.clear()
+    query = SimpleNamespace(
+        query=entry["query"], ward=entry["ward"], limit=k, mode=mode, cursor=None, include_history=False
+    )
+    response = await complaint_service.search_complaints(query, "admin", 0, None)
+    return [
+        (result.id, 1.0 - result.relevance_score if mode == "vector" else None)
+        for result in response["results"]
+    ]
+
+
+async def similar_complaints(entry: dict, k: int, embedding: np.ndarray) -> list:
+    """Similar complaints of one stored complaint"""
+    async with AsyncDatabase.get_cursor() as cursor:
+        results = await ComplaintService._find_similar_internal(
+            cursor, embedding, entry["ward"], exclude_id=entry["complaint_id"], limit=k
+        )
+    return [(result.id, 1.0 - result.similarity_score) for result in results]
+
+
+async def search_announcements(entry: dict, k: int) -> list:
+    """One announcement search"""
+    response = await _search_announcements(
+        AnnouncementSearchQuery(query=entry["query"], ward=entry["ward"], limit=k)
+    )
+    return [(result["id"], 1.0 - result["relevance_score"]) for result in response["results"]]
+
+
+async def stored_embeddings(entries: list) -> dict:
+    """Embeddings of the complaints a similar-complaints workload starts from"""
+    async with AsyncDatabase.get_cursor() as cursor:
+        await cursor.execute(
+            "SELECT id, embedding FROM complaints WHERE id = ANY(%s)",
+            ([entry["complaint_id"] for entry in entries],),
+            binary=True
+        )
+        return {row['id']: row['embedding'] for row in await cursor.fetchall()}
+
+
+async def run_target(target: str, entries: list, search, k: int, warmup: int) -> dict:
+    """Time every query of one workload and score it against its ground truth"""
+    for entry in entries[:warmup]:
+        await search(entry)
+    latencies, recalls = [], []
+    for entry in entries:
+        started = time.perf_counter()
+        found = await search(entry)
+        latencies.append((time.perf_counter() - started) * 1000.0)
+        recall = recall_at_k(found, entry, k)
+        if recall is not None:
+            recalls.append(recall)
+    latencies.sort()
+
+    result = {"target": target, "queries": len(entries)}
+    for pct in PERCENTILES:
+        result[f"latency_ms_p{pct}"] = round(percentile(latencies, pct), 2)
+    result["latency_ms_mean"] = round(float(np.mean(latencies)), 2) if latencies else 0.0
+    result[f"recall_at_{k}"] = round(float(np.mean(recalls)), 4) if recalls else None
+    return result
+
+
+async def main(args) -> dict:
+    await AsyncDatabase.open_pool()
+    try:
+        if args.workload:
+            with open(args.workload) as f:
+                workload = json.load(f)
+        else:
+            workload = await build_workload(args.queries, args.k)
+        k = args.k or workload["k"]
+        if k > workload["k"]:
+            raise SystemExit(f"❌ The workload has ground truth for k <= {workload['k']}")
+
+        if settings.VECTOR_INDEX_ENABLED:
+            vector_index.start()
+            while not vector_index.ready:
+                await asyncio.sleep(0.2)
+
+        report = {
+            "created_at": datetime.now().isoformat(timespec="seconds"),
+            "git_commit": git_commit(),
+            "embedding_model": workload["embedding_model"],
+            "rows": workload["rows"],
+            "k": k,
+            "mode": args.mode,
+            "settings": {name: getattr(settings, name, None) for name in REPORTED_SETTINGS},
+            "results": []
+        }
+        searches = {
+            "search_complaints": lambda entry: search_complaints(entry, k, args.mode),
+            "announcements": lambda entry: search_announcements(entry, k),
+        }
+        if "similar_complaints" in args.targets:
+            embeddings = await stored_embeddings(workload["workloads"]["similar_complaints"])
+            searches["similar_complaints"] = lambda entry: similar_complaints(
+                entry, k, embeddings[entry["complaint_id"]]
+            )
+
+        for target in args.targets:
+            # Complaints deleted since the workload was built cannot be looked up
+            entries = [
+                entry for entry in workload["workloads"][target]
+                if target != "similar_complaints" or entry["complaint_id"] in embeddings
+            ]
+            print(f"Measuring {target} ({len(entries)} queries)...")
+            report["results"].append(await run_target(target, entries, searches[target], k, args.warmup))
+    finally:
+        vector_index.stop()
+        await AsyncDatabase.close_pool()
+    return report
+
+
+def compare(report: dict, baseline: dict, latency_tolerance: float, recall_tolerance: float) -> list:
+    """
+    Metrics that got worse than the baseline report by more than the tolerances
+
+    Returns:
+        [(target, metric, baseline value, current value)]
+    """
+    recall_key = f"recall_at_{report['k']}"
+    previous = {result["target"]: result for result in baseline.get("results", [])}
+    regressions = []
+    for result in report["results"]:
+        before = previous.get(result["target"])
+        if before is None:
+            continue
+        for pct in PERCENTILES:
+            metric = f"latency_ms_p{pct}"
+            if before.get(metric) and result[metric] > before[metric] * (1 + latency_tolerance):
+                regressions.append((result["target"], metric, before[metric], result[metric]))
+        if before.get(recall_key) is not None and result[recall_key] is not None \
+                and result[recall_key] < before[recall_key] - recall_tolerance:
+            regressions.append((result["target"], recall_key, before[recall_key], result[recall_key]))
+    return regressions
+
+
+def print_report(report: dict):
+    """Print one row per search path"""
+    recall_key = f"recall_at_{report['k']}"
+    print("\n" + "=" * 78)
+    print(f"SEARCH LATENCY AND RECALL ({report['rows']['complaints']} complaints, "
+          f"{report['rows']['announcements']} announcements, k={report['k']}, {report['mode']} mode)")
+    print("=" * 78)
+    print(f"{'target':22}{'queries':>9}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'mean ms':>10}{'recall':>9}")
+    for result in report["results"]:
+        print(f"{result['target']:22}{result['queries']:>9}{result['latency_ms_p50']:>10}"
+              f"{result['latency_ms_p95']:>10}{result['latency_ms_p99']:>10}"
+              f"{result['latency_ms_mean']:>10}{result[recall_key]!s:>9}")
+    print("=" * 78)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark search latency and recall against exact kNN")
+    parser.add_argument("--workload", help="Workload from benchmarks.ground_truth (default: build one now)")
+    parser.add_argument("--queries", type=int, default=100, help="Queries per path when building a workload")
+    parser.add_argument("--k", type=int, default=None, help="Cut-off (default: the workload's k, else 10)")
+    parser.add_argument("--targets", nargs="+", choices=WORKLOADS, default=list(WORKLOADS))
+    parser.add_argument("--mode", choices=SEARCH_MODES, default="vector", help="Complaint search mode")
+    parser.add_argument("--warmup", type=int, default=5, help="Untimed queries per path first")
+    parser.add_argument("--json", help="Write the report to this file")
+    parser.add_argument("--compare", help="Earlier report to check for regressions")
+    parser.add_argument("--latency-tolerance", type=float, default=0.2, help="Allowed relative latency growth")
+    parser.add_argument("--recall-tolerance", type=float, default=0.01, help="Allowed absolute recall drop")
+    args = parser.parse_args()
+    if not args.workload and args.k is None:
+        args.k = 10
+
+    report = asyncio.run(main(args))
+    print_report(report)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(report, json.load(f), args.latency_tolerance, args.recall_tolerance)
+        for target, metric, before, after in regressions:
+            print(f"⚠️ {target} {metric}: {before} -> {after}")
+        if regressions:
+            raise SystemExit(1)
+        print("✅ No regressions against the baseline")
@@ -0,0 +1,112 @@
+"""
+Complaint Search Mode Benchmark
+Compares vector, text and hybrid search on per-stage latency and known-item
+recall
+
+Each mode runs the same queries through ComplaintService.search_complaints
+and reports p50/p95/p99 of the stage timings it returns (embedding, SQL,
+total). Known-item queries take stored complaints' own descriptions; a hit
+is the complaint appearing in the top `limit` results, which is what an
+officer re-running a search for a specific road or ticket expects.
+
+Usage:
+    python -m benchmarks.search_modes [--queries 200] [--limit 10] [--ward 3]
+"""
+
+import argparse
+import asyncio
+import json
+import random
+from types import SimpleNamespace
+
+from app.core.async_database import AsyncDatabase
+from app.services.complaint_service import SEARCH_MODES, complaint_service
+from app.utils.stats import percentile
+from benchmarks.embedding_engines import sample_texts
+
+STAGES = ("embed_ms", "query_ms", "total_ms")
+
+
+async def known_items(count: int, ward: int, seed: int = 42) -> list:
+    """Random stored complaints as (id, description) pairs"""
+    async with AsyncDatabase.get_cursor() as cursor:
+        await cursor.execute(
+            "SELECT id, description FROM complaints WHERE ward_number = %s OR %s::integer IS NULL ORDER BY id",
+            (ward, ward)
+        )
+        rows = await cursor.fetchall()
+    random.Random(seed).shuffle(rows)
+    return [(row['id'], row['description']) for row in rows[:count]]
+
+
+async def run_mode(mode: str, queries: list, items: list, limit: int, ward: int) -> dict:
+    """Run free-text and known-item queries through one mode"""
+    timings = {stage: [] for stage in STAGES}
+    hits = 0
+
+    async def search(text: str) -> dict:
+        query = SimpleNamespace(query=text, ward=ward, limit=limit, mode=mode)
+        response = await complaint_service.search_complaints(query, "admin", 0, None)
+        for stage, value in response["timings"].items():
+            timings[stage].append(value)
+        return response
+
+    for text in queries:
+        await search(text)
+    for complaint_id, description in items:
+        response = await search(description)
+        hits += any(result.id == complaint_id for result in response["results"])
+
+    report = {"mode": mode, "queries": len(queries) + len(items)}
+    for stage in STAGES:
+        values = sorted(timings[stage])
+        if values:
+            for pct in (50, 95, 99):
+                report[f"{stage}_p{pct}"] = round(percentile(values, pct), 2)
+    report["known_item_recall"] = round(hits / len(items), 3) if items else None
+    return report
+
+
+async def main(args) -> dict:
+    await AsyncDatabase.open_pool()
+    try:
+        queries = sample_texts(args.queries)
+        items = await known_items(args.known_items, args.ward)
+        report = {"ward": args.ward, "limit": args.limit, "runs": []}
+        for mode in args.modes:
+            print(f"Measuring {mode}...")
+            report["runs"].append(await run_mode(mode, queries, items, args.limit, args.ward))
+    finally:
+        await AsyncDatabase.close_pool()
+    return report
+
+
+def print_report(report: dict):
+    """Print one row per mode"""
+    print("\n" + "=" * 82)
+    print(f"COMPLAINT SEARCH MODES (ward {report['ward'] or 'all'}, top {report['limit']})")
+    print("=" * 82)
+    print(f"{'mode':8}{'embed p50':>11}{'sql p50':>10}{'sql p95':>10}"
+          f"{'total p50':>11}{'total p95':>11}{'total p99':>11}{'known-item':>12}")
+    for run in report["runs"]:
+        print(f"{run['mode']:8}{run.get('embed_ms_p50', '-'):>11}{run['query_ms_p50']:>10}"
+              f"{run['query_ms_p95']:>10}{run['total_ms_p50']:>11}{run['total_ms_p95']:>11}"
+              f"{run['total_ms_p99']:>11}{run['known_item_recall']!s:>12}")
+    print("=" * 82)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark complaint search modes")
+    parser.add_argument("--modes", nargs="+", choices=SEARCH_MODES, default=list(SEARCH_MODES))
+    parser.add_argument("--queries", type=int, default=200, help="Free-text queries per mode")
+    parser.add_argument("--known-items", type=int, default=100, help="Stored descriptions searched for per mode")
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument("--ward", type=int, default=None, help="Restrict to one ward (default: all)")
+    parser.add_argument("--json", help="Write the report to this file")
+    args = parser.parse_args()
+
+    report = asyncio.run(main(args))
+    print_report(report)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
@@ -0,0 +1,164 @@
+"""
+Complaint Submit Benchmark
+Compares the original submit path with the single-round-trip pipeline on
+end-to-end latency, throughput and connection hold time
+
+legacy:   borrow a connection, embed, INSERT, embed the same text again,
+          run the similarity query (two inferences, connection held throughout)
+pipeline: ComplaintService.submit_complaint (embed once with no connection
+          held, then one INSERT ... RETURNING + top-k CTE statement)
+
+The embedding cache is disabled so both paths pay for every inference, as
+they would for new complaint text. Inserted complaints are deleted afterwards.
+
+Usage:
+    python -m benchmarks.submit_pipeline [--requests 200] [--concurrency 1 8]
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from datetime import datetime
+
+from app.core.async_database import AsyncDatabase
+from app.core.vector_search import vector_search
+from app.models.complaint import ComplaintSubmit
+from app.services.complaint_service import complaint_service
+from app.services.embedding_service import embedding_service
+from app.utils.stats import percentile
+from benchmarks.embedding_engines import sample_texts
+
+BENCH_CATEGORY = "Benchmark"
+
+
+async def legacy_submit(complaint: ComplaintSubmit, user_id: int) -> int:
+    """The submit path as it was before the pipeline rework"""
+    async with AsyncDatabase.get_cursor() as cursor:
+        embedding = await embedding_service.get_embedding_async(complaint.description)
+        await cursor.execute(
+            f"""
+            INSERT INTO complaints
+                (user_id, ward_number, category, description, status, date, embedding, embedding_model)
+            VALUES (%s, %s, %s, %s, %s, %s, %s::{vector_search.column_type}, %s)
+            RETURNING id
+            """,
+            (user_id, complaint.ward, complaint.category, complaint.description, 'pending',
+             datetime.now(), embedding, embedding_service.version)
+        )
+        complaint_id = (await cursor.fetchone())['id']
+
+        # _find_similar_internal used to re-encode the description
+        query_embedding = await embedding_service.get_embedding_async(complaint.description)
+        nearest_sql, params = vector_search.nearest(
+            "complaints",
+            query_embedding,
+            5,
+            where="ward_number = %s AND embedding_model = %s AND id != %s",
+            params=[complaint.ward, embedding_service.version, complaint_id]
+        )
+        await cursor.execute(
+            f"SELECT id, 1 - distance AS similarity_score FROM {nearest_sql} AS nearest ORDER BY distance",
+            params
+        )
+        await cursor.fetchall()
+        return complaint_id
+
+
+async def pipeline_submit(complaint: ComplaintSubmit, user_id: int) -> int:
+    """The current single-round-trip path"""
+    response = await complaint_service.submit_complaint(complaint, user_id)
+    return response.complaint_id
+
+
+PATHS = {"legacy": legacy_submit, "pipeline": pipeline_submit}
+
+
+async def run_path(name: str, texts: list, concurrency: int, user_id: int, ward: int) -> dict:
+    """Submit every text through one path with `concurrency` requests in flight"""
+    submit = PATHS[name]
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def one(text: str):
+        complaint = ComplaintSubmit(ward=ward, category=BENCH_CATEGORY, description=text)
+        async with semaphore:
+            started = time.perf_counter()
+            await submit(complaint, user_id)
+            latencies.append((time.perf_counter() - started) * 1000.0)
+
+    pool_before = AsyncDatabase.get_pool_stats()
+    started = time.perf_counter()
+    await asyncio.gather(*(one(text) for text in texts))
+    elapsed = time.perf_counter() - started
+    pool_after = AsyncDatabase.get_pool_stats()
+    held_ms = pool_after.get("usage_ms", 0) - pool_before.get("usage_ms", 0)
+
+    latencies.sort()
+    return {
+        "path": name,
+        "concurrency": concurrency,
+        "requests": len(texts),
+        "throughput_rps": round(len(texts) / elapsed, 1),
+        "latency_ms_p50": round(percentile(latencies, 50), 2),
+        "latency_ms_p95": round(percentile(latencies, 95), 2),
+        "latency_ms_p99": round(percentile(latencies, 99), 2),
+        # Time a pooled connection was checked out, per submission
+        "connection_held_ms": round(held_ms / len(texts), 2)
+    }
+
+
+async def main(args) -> dict:
+    await AsyncDatabase.open_pool()
+    try:
+        async with AsyncDatabase.get_cursor() as cursor:
+            await cursor.execute("SELECT id, ward_number FROM citizens ORDER BY id LIMIT 1")
+            user = await cursor.fetchone()
+        ward = args.ward or user['ward_number'] or 1
+
+        # Every path embeds for real
+        embedding_service.cache = None
+        embedding_service.get_embedding("warm up")
+
+        report = {"ward": ward, "runs": []}
+        texts = sample_texts(args.requests)
+        for name in args.paths:
+            for concurrency in args.concurrency:
+                print(f"Measuring {name} at concurrency {concurrency}...")
+                # Distinct text per run so batcher and path see fresh input
+                run_texts = [f"{text} ({name} {concurrency})" for text in texts]
+                report["runs"].append(await run_path(name, run_texts, concurrency, user['id'], ward))
+    finally:
+        async with AsyncDatabase.get_cursor() as cursor:
+            await cursor.execute("DELETE FROM complaints WHERE category = %s", (BENCH_CATEGORY,))
+        await AsyncDatabase.close_pool()
+    return report
+
+
+def print_report(report: dict):
+    """Print one row per path and concurrency level"""
+    print("\n" + "=" * 74)
+    print(f"COMPLAINT SUBMIT BENCHMARK (ward {report['ward']})")
+    print("=" * 74)
+    print(f"{'path':10}{'conc':>6}{'req/s':>9}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'conn held ms':>14}")
+    for run in report["runs"]:
+        print(f"{run['path']:10}{run['concurrency']:>6}{run['throughput_rps']:>9}"
+              f"{run['latency_ms_p50']:>10}{run['latency_ms_p95']:>10}{run['latency_ms_p99']:>10}"
+              f"{run['connection_held_ms']:>14}")
+    print("=" * 74)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the complaint submit path")
+    parser.add_argument("--paths", nargs="+", choices=list(PATHS), default=list(PATHS))
+    parser.add_argument("--requests", type=int, default=200, help="Submissions per path and concurrency level")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8])
+    parser.add_argument("--ward", type=int, default=None, help="Ward to submit into (default: first user's)")
+    parser.add_argument("--json", help="Write the report to this file")
+    args = parser.parse_args()
+
+    report = asyncio.run(main(args))
+    print_report(report)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
@@ -0,0 +1,165 @@
+"""
+Vector Storage Benchmark
+Compares float32 `vector`, float16 `halfvec` and the binary-quantized
+pre-filter on index size, build time, query latency and recall@k
+
+Each layout gets its own scratch table loaded with the same vectors; exact
+cosine neighbours computed in NumPy are the ground truth. Layouts that need
+pgvector >= 0.7 are skipped on older installs.
+
+Usage:
+    python -m benchmarks.vector_storage [--rows 50000] [--queries 200] [--k 10]
+"""
+
+import argparse
+import json
+import time
+
+import numpy as np
+from psycopg2.extras import execute_values
+
+from app.core.database import Database
+from app.core.vector_search import MIN_PGVECTOR_FOR_COMPACT, VectorSearch, pgvector_version
+from app.services.embedding_service import embedding_service
+from benchmarks.embedding_engines import sample_texts
+
+LAYOUTS = {
+    "vector": VectorSearch("vector"),
+    "halfvec": VectorSearch("halfvec"),
+    "vector+binary": VectorSearch("vector", binary_prefilter=True),
+    "halfvec+binary": VectorSearch("halfvec", binary_prefilter=True),
+}
+
+
+def build_corpus(rows: int, queries: int, seed: int = 42) -> tuple:
+    """
+    Embed a few thousand complaint-like texts and jitter them up to `rows`
+    vectors, plus held-out query vectors drawn the same way
+
+    Returns:
+        (corpus, queries) as L2-normalized float32 matrices
+    """
+    base = np.vstack(embedding_service.get_embeddings_batch(
+        sample_texts(min(rows, 2000)),
+        use_cache=False,
+        show_progress_bar=False
+    )).astype(np.float32)
+    rng = np.random.default_rng(seed)
+
+    def jitter(count: int) -> np.ndarray:
+        picks = base[rng.integers(0, len(base), count)]
+        noisy = picks + rng.normal(0.0, 0.03, picks.shape).astype(np.float32)
+        return noisy / np.linalg.norm(noisy, axis=1, keepdims=True)
+
+    return jitter(rows), jitter(queries)
+
+
+def exact_neighbors(corpus: np.ndarray, queries: np.ndarray, k: int) -> list:
+    """Ground-truth top-k ids (1-based, matching the scratch table) by cosine"""
+    scores = queries @ corpus.T
+    top = np.argpartition(-scores, k, axis=1)[:, :k]
+    return [set((row + 1).tolist()) for row in top]
+
+
+def run_layout(name: str, layout: VectorSearch, corpus: np.ndarray, queries: np.ndarray,
+               truth: list, k: int, ef_search: int) -> dict:
+    """Load, index and query one layout in a scratch table"""
+    table = f"bench_vectors_{name.replace('+', '_')}"
+    with Database.get_cursor() as cursor:
+        cursor.execute(f"DROP TABLE IF EXISTS {table}")
+        cursor.execute(f"CREATE TABLE {table} (id SERIAL PRIMARY KEY, embedding {layout.column_type})")
+        execute_values(
+            cursor,
+            f"INSERT INTO {table} (embedding) VALUES %s",
+            [(vector,) for vector in corpus],
+            template=f"(%s::{layout.column_type})",
+            page_size=1000
+        )
+
+    # The binary layout is measured the way it is deployed: without the full index
+    started = time.perf_counter()
+    with Database.get_cursor() as cursor:
+        for statement in layout.index_statements(table, full_index=not layout.binary_prefilter):
+            cursor.execute(statement)
+    build_seconds = time.perf_counter() - started
+
+    with Database.get_cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT pg_relation_size(%s::regclass) / 1048576.0 AS table_mb,
+                   coalesce(sum(pg_relation_size(indexrelid)), 0) / 1048576.0 AS index_mb
+            FROM pg_index
+            WHERE indrelid = %s::regclass AND NOT indisprimary
+            """,
+            (table, table)
+        )
+        sizes = cursor.fetchone()
+
+        cursor.execute("SET hnsw.ef_search = %s", (ef_search,))
+        latencies = []
+        recalls = []
+        for query, expected in zip(queries, truth):
+            nearest_sql, params = layout.nearest(table, query, k)
+            started = time.perf_counter()
+            cursor.execute(f"SELECT id FROM {nearest_sql} AS nearest ORDER BY distance", params)
+            found = {row['id'] for row in cursor.fetchall()}
+            latencies.append((time.perf_counter() - started) * 1000.0)
+            recalls.append(len(found & expected) / k)
+        cursor.execute(f"DROP TABLE {table}")
+
+    latencies.sort()
+    return {
+        "layout": name,
+        "table_mb": round(float(sizes['table_mb']), 1),
+        "index_mb": round(float(sizes['index_mb']), 1),
+        "index_build_seconds": round(build_seconds, 2),
+        "query_ms_p50": round(latencies[len(latencies) // 2], 3),
+        "query_ms_p95": round(latencies[int(len(latencies) * 0.95) - 1], 3),
+        f"recall_at_{k}": round(float(np.mean(recalls)), 4)
+    }
+
+
+def print_report(report: dict):
+    """Print one row per layout"""
+    print("\n" + "=" * 60)
+    print(f"VECTOR STORAGE BENCHMARK ({report['rows']} rows, k={report['k']})")
+    print("=" * 60)
+    recall_key = f"recall_at_{report['k']}"
+    print(f"{'layout':16}{'table MB':>10}{'index MB':>10}{'p50 ms':>9}{'p95 ms':>9}{'recall':>8}")
+    for result in report["layouts"]:
+        print(f"{result['layout']:16}{result['table_mb']:>10}{result['index_mb']:>10}"
+              f"{result['query_ms_p50']:>9}{result['query_ms_p95']:>9}{result[recall_key]:>8}")
+    for name in report["skipped"]:
+        print(f"{name:16}  skipped (needs pgvector >= 0.7)")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark embedding storage layouts")
+    parser.add_argument("--layouts", nargs="+", choices=list(LAYOUTS), default=list(LAYOUTS))
+    parser.add_argument("--rows", type=int, default=50000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--ef-search", type=int, default=40, help="hnsw.ef_search for every layout")
+    parser.add_argument("--json", help="Write the report to this file")
+    args = parser.parse_args()
+
+    with Database.get_cursor() as cursor:
+        version = pgvector_version(cursor)
+
+    corpus, queries = build_corpus(args.rows, args.queries)
+    truth = exact_neighbors(corpus, queries, args.k)
+
+    report = {"rows": args.rows, "k": args.k, "ef_search": args.ef_search, "layouts": [], "skipped": []}
+    for name in args.layouts:
+        layout = LAYOUTS[name]
+        if layout.requires_compact_support and version < MIN_PGVECTOR_FOR_COMPACT:
+            report["skipped"].append(name)
+            continue
+        print(f"Measuring {name}...")
+        report["layouts"].append(run_layout(name, layout, corpus, queries, truth, args.k, args.ef_search))
+
+    print_report(report)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
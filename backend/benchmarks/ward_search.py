@@ -0,0 +1,179 @@
+"""
+Ward-filtered Vector Search Benchmark
+Measures recall@k and latency of each ward search strategy across small,
+medium and large wards
+
+A scratch table is loaded with vectors spread over wards of skewed
+(Zipf-like) sizes, with the same HNSW index layout as complaints. Per
+ward, held-out queries are answered by:
+
+    global          the global HNSW index with the default ef_search (the
+                    behaviour before ward-aware planning)
+    exact           exact scan of the ward's rows
+    filtered_hnsw   global index with ef_search widened by ward share
+    partial_index   per-ward partial HNSW index (large wards only)
+    auto            whatever WardSearch picks for the ward
+
+Exact cosine neighbours computed in NumPy are the ground truth.
+
+Usage:
+    python -m benchmarks.ward_search [--rows 50000] [--wards 60] [--k 10]
+"""
+
+import argparse
+import json
+import time
+
+import numpy as np
+from psycopg2.extras import execute_values
+
+from app.core.database import Database
+from app.core.vector_search import vector_search
+from app.core.ward_search import WardSearch
+from app.utils.stats import percentile
+from benchmarks.vector_storage import build_corpus
+
+TABLE = "bench_ward_vectors"
+METHODS = ("global", "exact", "filtered_hnsw", "partial_index", "auto")
+
+
+def ward_assignments(rows: int, wards: int, skew: float, seed: int = 7) -> np.ndarray:
+    """Ward number (1-based) per row, with ward sizes falling off as rank^-skew"""
+    weights = 1.0 / np.arange(1, wards + 1) ** skew
+    rng = np.random.default_rng(seed)
+    return rng.choice(np.arange(1, wards + 1), size=rows, p=weights / weights.sum())
+
+
+def load_table(corpus: np.ndarray, wards: np.ndarray):
+    """Create and index the scratch table"""
+    with Database.get_cursor() as cursor:
+        cursor.execute(f"DROP TABLE IF EXISTS {TABLE}")
+        cursor.execute(
+            f"CREATE TABLE {TABLE} (id SERIAL PRIMARY KEY, ward_number INTEGER, "
+            f"embedding {vector_search.column_type})"
+        )
+        execute_values(
+            cursor,
+            f"INSERT INTO {TABLE} (ward_number, embedding) VALUES %s",
+            [(int(ward), vector) for ward, vector in zip(wards, corpus)],
+            template=f"(%s, %s::{vector_search.column_type})",
+            page_size=1000
+        )
+        cursor.execute(f"CREATE INDEX ON {TABLE} (ward_number)")
+        for statement in vector_search.index_statements(TABLE):
+            cursor.execute(statement)
+        cursor.execute(f"ANALYZE {TABLE}")
+
+
+def pick_wards(sizes: dict, planner: WardSearch) -> list:
+    """A few wards from each size class: exact-sized, mid-sized and indexed"""
+    ordered = sorted(sizes, key=sizes.get)
+    small = [ward for ward in ordered if sizes[ward] <= planner.exact_max_rows]
+    large = [ward for ward in ordered if sizes[ward] >= planner.partial_index_min_rows]
+    medium = [ward for ward in ordered if ward not in small and ward not in large]
+    picked = []
+    for group in (small, medium, large):
+        if group:
+            picked += [group[0], group[len(group) // 2], group[-1]]
+    return sorted(set(picked), key=sizes.get)
+
+
+def search(planner: WardSearch, method: str, query: np.ndarray, ward: int, k: int) -> tuple:
+    """One query in its own transaction, so SET LOCAL settings do not leak"""
+    with Database.get_cursor() as cursor:
+        started = time.perf_counter()
+        if method == "global":
+            nearest_sql, params = vector_search.nearest(TABLE, query, k, where="ward_number = %s", params=[ward])
+        else:
+            strategy = None if method == "auto" else method
+            nearest_sql, params = planner.nearest(cursor, query, ward, k, strategy=strategy)
+        cursor.execute(f"SELECT id FROM {nearest_sql} AS nearest ORDER BY distance", params)
+        found = [row['id'] for row in cursor.fetchall()]
+        return found, (time.perf_counter() - started) * 1000.0
+
+
+def main(args) -> dict:
+    corpus, queries = build_corpus(args.rows, args.queries)
+    wards = ward_assignments(args.rows, args.wards, args.skew)
+    print(f"Loading {args.rows} vectors into {args.wards} wards...")
+    load_table(corpus, wards)
+
+    planner = WardSearch(
+        TABLE,
+        exact_max_rows=args.exact_max_rows,
+        partial_index_min_rows=args.partial_index_min_rows,
+        ef_search_max=args.ef_search_max,
+        stats_ttl_seconds=3600
+    )
+    with Database.get_cursor() as cursor:
+        planner.refresh(cursor)
+        for ward in planner.wards_needing_index():
+            for statement in vector_search.ward_index_statements(TABLE, ward):
+                cursor.execute(statement)
+        planner.refresh(cursor)
+    sizes = planner.ward_sizes()
+
+    report = {"rows": args.rows, "wards": args.wards, "k": args.k, "results": []}
+    try:
+        for ward in pick_wards(sizes, planner):
+            members = np.flatnonzero(wards == ward)
+            # Ground truth: exact neighbours among the ward's rows (ids are 1-based)
+            scores = queries @ corpus[members].T
+            top = np.argsort(-scores, axis=1)[:, :args.k]
+            truth = [set((members[row] + 1).tolist()) for row in top]
+            chosen = planner.plan(ward, args.k)["strategy"]
+
+            for method in METHODS:
+                if method == "partial_index" and ward not in planner.get_stats()["partial_index_wards"]:
+                    continue
+                latencies, recalls = [], []
+                for query, expected in zip(queries, truth):
+                    found, elapsed = search(planner, method, query, ward, args.k)
+                    latencies.append(elapsed)
+                    recalls.append(len(expected & set(found)) / min(args.k, len(members)))
+                latencies.sort()
+                report["results"].append({
+                    "ward": int(ward),
+                    "ward_rows": sizes[ward],
+                    "method": method if method != "auto" else f"auto ({chosen})",
+                    "latency_ms_p50": round(percentile(latencies, 50), 3),
+                    "latency_ms_p95": round(percentile(latencies, 95), 3),
+                    f"recall_at_{args.k}": round(float(np.mean(recalls)), 4)
+                })
+    finally:
+        with Database.get_cursor() as cursor:
+            cursor.execute(f"DROP TABLE IF EXISTS {TABLE}")
+    return report
+
+
+def print_report(report: dict):
+    """Print one row per ward and method"""
+    recall_key = f"recall_at_{report['k']}"
+    print("\n" + "=" * 72)
+    print(f"WARD-FILTERED SEARCH ({report['rows']} rows, {report['wards']} wards, k={report['k']})")
+    print("=" * 72)
+    print(f"{'ward':>5}{'rows':>8}  {'method':28}{'p50 ms':>9}{'p95 ms':>9}{'recall':>9}")
+    for result in report["results"]:
+        print(f"{result['ward']:>5}{result['ward_rows']:>8}  {result['method']:28}"
+              f"{result['latency_ms_p50']:>9}{result['latency_ms_p95']:>9}{result[recall_key]:>9}")
+    print("=" * 72)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark ward-filtered vector search strategies")
+    parser.add_argument("--rows", type=int, default=50000)
+    parser.add_argument("--wards", type=int, default=60)
+    parser.add_argument("--skew", type=float, default=1.0, help="Zipf exponent of ward sizes")
+    parser.add_argument("--queries", type=int, default=50, help="Queries per ward")
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--exact-max-rows", type=int, default=2000)
+    parser.add_argument("--partial-index-min-rows", type=int, default=5000)
+    parser.add_argument("--ef-search-max", type=int, default=1000)
+    parser.add_argument("--json", help="Write the report to this file")
+    args = parser.parse_args()
+
+    report = main(args)
+    print_report(report)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
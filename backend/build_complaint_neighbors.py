@@ -0,0 +1,65 @@
+"""
+Complaint Neighbour Build Script
+Precomputes the similar-complaints list of every embedded complaint
+
+Run it once after setup_database.py, and after backfill_embeddings.py or a
+model migration (lists built for another EMBEDDING_VERSION are not served).
+New complaints keep their lists current on their own.
+
+Usage:
+    python build_complaint_neighbors.py                  # every complaint
+    python build_complaint_neighbors.py --stale-only     # missing or outdated lists
+    python build_complaint_neighbors.py --ward 42
+    python build_complaint_neighbors.py --status         # list coverage
+"""
+
+import argparse
+import time
+
+from app.services.complaint_neighbors import complaint_neighbors
+from app.services.embedding_service import embedding_service
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build precomputed similar-complaint lists")
+    parser.add_argument("--ward", type=int, default=None, help="Only rebuild this ward")
+    parser.add_argument("--stale-only", action="store_true",
+                        help="Only complaints whose list is missing or built for another model")
+    parser.add_argument("--chunk-size", type=int, default=500, help="Complaints per transaction")
+    parser.add_argument("--status", action="store_true", help="Show list coverage and exit")
+    args = parser.parse_args()
+
+    if args.status:
+        stats = complaint_neighbors.get_stats()
+        print(f"Active embedding version: {embedding_service.version}")
+        print(f"  embedded complaints: {stats['embedded']}")
+        print(f"  lists built (k={stats['k']}): {stats['built']}")
+        print(f"  stale: {stats['stale']}")
+        return
+
+    print("=" * 60)
+    print("COMPLAINT NEIGHBOUR BUILD")
+    print("=" * 60)
+    started = time.perf_counter()
+
+    def progress(done: int, total: int):
+        print(f"  {done}/{total} complaints")
+
+    count = complaint_neighbors.build_all(
+        ward=args.ward,
+        stale_only=args.stale_only,
+        chunk_size=args.chunk_size,
+        progress=progress
+    )
+
+    elapsed = time.perf_counter() - started
+    print(f"\n✅ Built {count} neighbour lists in {elapsed:.1f}s")
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except Exception as e:
+        print(f"\n❌ Error during build: {e}")
+        import traceback
+        traceback.print_exc()
@@ -0,0 +1,79 @@
+"""
+ONNX Export Script
+Exports all-MiniLM-L6-v2 to ONNX and quantizes it to int8 for the onnx embedding engine
+
+Usage:
+    python export_onnx_model.py [--output models/all-MiniLM-L6-v2-onnx-int8]
+"""
+
+import argparse
+import os
+
+from app.core.config import settings
+
+HF_MODEL_ID = f"sentence-transformers/{settings.EMBEDDING_MODEL_NAME}"
+
+
+def export_onnx_model(output_dir: str, model_id: str = HF_MODEL_ID, opset: int = 14):
+    """
+    Export the transformer to ONNX, then apply dynamic int8 quantization
+
+    Args:
+        output_dir: Directory to write model_int8.onnx and tokenizer.json into
+        model_id: Hugging Face model id
+        opset: ONNX opset version
+    """
+    import torch
+    from transformers import AutoModel, AutoTokenizer
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+
+    os.makedirs(output_dir, exist_ok=True)
+    fp32_path = os.path.join(output_dir, "model_fp32.onnx")
+    int8_path = os.path.join(output_dir, "model_int8.onnx")
+
+    print(f"1. Loading {model_id}...")
+    tokenizer = AutoTokenizer.from_pretrained(model_id)
+    model = AutoModel.from_pretrained(model_id)
+    model.eval()
+
+    print("2. Exporting ONNX graph...")
+    sample = tokenizer(["street light not working"], return_tensors="pt")
+    dynamic_axes = {name: {0: "batch", 1: "sequence"} for name in sample.keys()}
+    dynamic_axes["last_hidden_state"] = {0: "batch", 1: "sequence"}
+    with torch.no_grad():
+        torch.onnx.export(
+            model,
+            tuple(sample[name] for name in sample.keys()),
+            fp32_path,
+            input_names=list(sample.keys()),
+            output_names=["last_hidden_state"],
+            dynamic_axes=dynamic_axes,
+            opset_version=opset,
+            do_constant_folding=True
+        )
+
+    print("3. Quantizing weights to int8...")
+    quantize_dynamic(fp32_path, int8_path, weight_type=QuantType.QInt8)
+    os.remove(fp32_path)
+
+    print("4. Saving tokenizer...")
+    tokenizer.backend_tokenizer.save(os.path.join(output_dir, "tokenizer.json"))
+
+    size_mb = os.path.getsize(int8_path) / (1024 * 1024)
+    print(f"\n✅ Exported {int8_path} ({size_mb:.1f} MB)")
+    print("Set EMBEDDING_ENGINE=onnx to use it, and run")
+    print("`python -m benchmarks.embedding_engines` to check it against torch.")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export an int8 ONNX embedding model")
+    parser.add_argument("--output", default=settings.EMBEDDING_ONNX_DIR)
+    parser.add_argument("--model-id", default=HF_MODEL_ID)
+    args = parser.parse_args()
+
+    try:
+        export_onnx_model(args.output, args.model_id)
+    except Exception as e:
+        print(f"\n❌ Error exporting model: {e}")
+        import traceback
+        traceback.print_exc()
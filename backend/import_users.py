@@ -0,0 +1,71 @@
+"""
+Bulk User Import Script
+Onboards citizens from a municipal CSV export
+
+Passwords are hashed on every core, emails already registered are skipped,
+and rows are loaded with COPY in chunks that commit independently. Rows that
+fail validation are listed with their line number.
+
+Usage:
+    python import_users.py ward_42.csv
+    python import_users.py ward_42.csv --workers 8 --chunk-size 2000
+    python import_users.py ward_42.csv --errors errors.csv
+
+CSV columns: name, email, password (required); ward_number (or ward), zone,
+phone, address, role (citizen/officer/admin, default citizen).
+"""
+
+import argparse
+import csv
+
+from app.services.user_import import import_users
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import citizens from a CSV file")
+    parser.add_argument("csv_path", help="CSV file with a header row")
+    parser.add_argument("--workers", type=int, default=0, help="Hashing processes (default: one per core)")
+    parser.add_argument("--chunk-size", type=int, default=5000, help="Rows per dedupe/hash/COPY round")
+    parser.add_argument("--errors", help="Write every rejected row to this CSV file")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("BULK USER IMPORT")
+    print("=" * 60)
+
+    def progress(report: dict):
+        print(f"  {report['rows']} rows read, {report['imported']} imported, "
+              f"{report['duplicates']} duplicates, {report['failed']} failed")
+
+    with open(args.csv_path, newline="", encoding="utf-8-sig") as f:
+        report = import_users(
+            f,
+            workers=args.workers,
+            chunk_size=args.chunk_size,
+            max_errors=None if args.errors else 20,
+            progress=progress
+        )
+
+    print(f"\n✅ Imported {report['imported']} of {report['rows']} rows in {report['seconds']}s")
+    if report["duplicates"] or report["failed"]:
+        print(f"⚠️ {report['duplicates']} duplicate email(s), {report['failed']} invalid row(s)")
+    if args.errors:
+        with open(args.errors, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=["line", "email", "error"])
+            writer.writeheader()
+            writer.writerows(report["errors"])
+        print(f"   Rejected rows written to {args.errors}")
+    else:
+        for error in report["errors"]:
+            print(f"   line {error['line']}: {error['email'] or '-'}: {error['error']}")
+        if report["errors_truncated"]:
+            print("   ... (use --errors FILE for the full list)")
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except Exception as e:
+        print(f"\n❌ Error during import: {e}")
+        import traceback
+        traceback.print_exc()
@@ -3,19 +3,28 @@ SmartCity InsightHub Backend - Main Application Entry Point
 FastAPI application with clean modular architecture
 """
 
+import asyncio
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 from contextlib import asynccontextmanager
 
 # Import configuration and database
 from app.core.config import settings
 from app.core.database import Database
+from app.core.async_database import AsyncDatabase
+from app.core.executors import executors
+from app.core.security import security_service, verified_tokens, verified_users
+from app.core.ward_search import ward_search
 
 # Import all route modules
 from app.routes import auth, complaints, dashboard, announcements
 
-# Import embedding service for initialization check
+# Import embedding service for background warmup (model loads lazily)
 from app.services.embedding_service import embedding_service
+from app.services.embedding_queue import embedding_queue
+from app.services.search_cache import search_cache
+from app.services.vector_index import vector_index
 
 
 @asynccontextmanager
@@ -29,22 +38,36 @@ async def lifespan(app: FastAPI):
     print("🚀 Starting SmartCity InsightHub Backend")
     print("=" * 60)
     
-    # Test database connection
+    # Open the async connection pool and test the database connection
     try:
-        with Database.get_connection() as conn:
+        await AsyncDatabase.open_pool()
+        async with AsyncDatabase.get_cursor() as cursor:
             print("✅ Database connection successful")
-            with conn.cursor() as cursor:
-                cursor.execute("SELECT version()")
-                db_version = cursor.fetchone()
-                # Handle dict result from RealDictCursor
-                version_str = db_version['version'] if isinstance(db_version, dict) else db_version[0]
-                print(f"📊 PostgreSQL: {version_str[:50]}...")
+            await cursor.execute("SELECT version()")
+            db_version = await cursor.fetchone()
+            # Handle dict result from the dict-row cursor
+            version_str = db_version['version'] if isinstance(db_version, dict) else db_version[0]
+            print(f"📊 PostgreSQL: {version_str[:50]}...")
     except Exception as e:
         print(f"❌ Database connection failed: {e}")
         raise
     
-    # Verify AI model loaded
-    print(f"🤖 AI Model loaded: {embedding_service.dimension}D embeddings")
+    # Load the AI model in the background so liveness checks pass immediately
+    embedding_service.start_warmup()
+    print(f"🤖 AI Model warming up in background ({embedding_service.model_name})")
+    
+    # Embed rows queued by write paths (announcements, deferred complaints)
+    embedding_queue.start()
+    if embedding_queue.workers > 0:
+        print(f"📬 Embedding queue: {embedding_queue.workers} worker(s)")
+    
+    # Evict cached user ids when citizens are deleted by any worker
+    user_listener = asyncio.create_task(security_service.listen_for_user_deletions())
+    
+    # Serve vector searches from memory once the snapshot has loaded
+    if settings.VECTOR_INDEX_ENABLED:
+        vector_index.start()
+        print(f"🧭 Vector index loading in background ({', '.join(vector_index.tables)})")
     
     print("=" * 60)
     print("✅ Backend initialization complete!")
@@ -56,6 +79,12 @@ async def lifespan(app: FastAPI):
     
     # Shutdown
     print("\n👋 Shutting down SmartCity InsightHub Backend...")
+    user_listener.cancel()
+    vector_index.stop()
+    embedding_queue.stop()
+    executors.shutdown()
+    await AsyncDatabase.close_pool()
+    Database.close_pool()
 
 
 # Create FastAPI application
@@ -84,6 +113,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],  # announcement feed paging
 )
 
 # Register all route modules
@@ -115,19 +145,18 @@ async def root():
 @app.get("/health")
 async def health_check():
     """
-    Detailed health check
-    Tests database connectivity
+    Detailed health check (liveness)
+    Tests database connectivity; does not wait for the AI model
     """
     try:
-        with Database.get_connection() as conn:
-            with conn.cursor() as cursor:
-                cursor.execute("SELECT 1")
-                cursor.fetchone()
+        async with AsyncDatabase.get_cursor() as cursor:
+            await cursor.execute("SELECT 1")
+            await cursor.fetchone()
         
         return {
             "status": "healthy",
             "database": "connected",
-            "ai_model": "loaded"
+            "ai_model": embedding_service.status
         }
     except Exception as e:
         return {
@@ -137,6 +166,53 @@ async def health_check():
         }
 
 
+# Readiness endpoint
+@app.get("/ready")
+async def readiness_check():
+    """
+    Readiness check
+    Returns 503 until the AI model has finished warming up
+    """
+    if embedding_service.is_ready:
+        return {"status": "ready", "ai_model": "ready"}
+    
+    model_status = embedding_service.status
+    return JSONResponse(
+        status_code=503,
+        content={
+            "status": "model warming" if model_status in ("warming", "cold") else "model failed",
+            "ai_model": model_status,
+            "error": embedding_service.load_error
+        }
+    )
+
+
+# Runtime metrics endpoint
+@app.get("/metrics")
+async def metrics():
+    """
+    Runtime performance metrics
+    Embedding batch sizes, queue depth and wait times, embedding job
+    backlog and lag, connection pool utilization, and offload executor
+    queue depth, wait times and rejections, authentication and search
+    cache hit rates, the ward-filtered vector search strategies chosen,
+    and the in-process vector index
+    """
+    return {
+        "async_db_pool": AsyncDatabase.get_pool_stats(),
+        "auth_token_cache": verified_tokens.get_stats() if verified_tokens is not None else {},
+        "auth_user_cache": verified_users.get_stats(),
+        "db_pool": Database.get_pool_stats(),
+        "embedding": embedding_service.get_stats(),
+        # Queries the sync pool, so keep it off the event loop
+        "embedding_queue": await executors.run("db", embedding_queue.get_stats),
+        "executors": executors.get_stats(),
+        "search_cache": search_cache.get_stats(),
+        "ward_search": ward_search.get_stats(),
+        "vector_index": vector_index.get_stats() if settings.VECTOR_INDEX_ENABLED else {"enabled": False}
+    }
+
+
 # Run application
 if __name__ == "__main__":
     import uvicorn
@@ -0,0 +1,100 @@
+"""
+Ward Index Management Script
+Creates per-ward partial HNSW indexes on complaints for wards large enough
+to need them, and shows which search strategy each ward gets
+
+Small wards are searched exactly and mid-sized wards through the global
+index with a widened ef_search (see app/core/ward_search.py); only wards of
+VECTOR_WARD_PARTIAL_INDEX_MIN_ROWS or more get their own index. Indexes are
+built CONCURRENTLY, so the API keeps serving, except on the partitioned
+complaints table, where Postgres builds them per partition while blocking
+writes. Re-run it as wards grow, and after migrate_vector_storage.py.
+
+Usage:
+    python manage_ward_indexes.py --status          # ward sizes and strategies
+    python manage_ward_indexes.py                   # create missing indexes
+    python manage_ward_indexes.py --wards 42 87     # index specific wards
+    python manage_ward_indexes.py --drop-small      # also drop indexes of wards that shrank
+"""
+
+import argparse
+
+import psycopg2
+from psycopg2.extras import RealDictCursor
+
+from app.core.config import settings
+from app.core.vector_search import vector_search
+from app.core.ward_search import ward_search
+from app.services.complaint_partitions import is_partitioned
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Manage per-ward partial HNSW indexes")
+    parser.add_argument("--status", action="store_true", help="Show ward sizes and strategies and exit")
+    parser.add_argument("--wards", type=int, nargs="+", help="Index these wards regardless of size")
+    parser.add_argument("--drop-small", action="store_true",
+                        help="Drop indexes of wards below half the partial index threshold")
+    args = parser.parse_args()
+
+    conn = psycopg2.connect(
+        host=settings.DB_HOST,
+        database=settings.DB_NAME,
+        user=settings.DB_USER,
+        password=settings.DB_PASSWORD,
+        port=settings.DB_PORT
+    )
+    # CREATE/DROP INDEX CONCURRENTLY cannot run inside a transaction block
+    conn.autocommit = True
+    cursor = conn.cursor(cursor_factory=RealDictCursor)
+    ward_search.refresh(cursor)
+    stats = ward_search.get_stats()
+    # Partitioned tables do not support CONCURRENTLY
+    concurrently = "" if is_partitioned(cursor) else " CONCURRENTLY"
+
+    if args.status:
+        print(f"{stats['embedded_rows']} embedded complaints in {stats['wards']} wards "
+              f"(iterative scan {'available' if stats['iterative_scan'] else 'unavailable'})")
+        print(f"{'ward':>6}{'rows':>10}  strategy (top 10)")
+        for ward, rows in sorted(ward_search.ward_sizes().items(), key=lambda item: -item[1]):
+            if ward is None:
+                continue
+            plan = ward_search.plan(ward, 10)
+            detail = f", ef_search {plan['ef_search']}" if plan["ef_search"] else ""
+            print(f"{ward:>6}{rows:>10}  {plan['strategy']}{detail}")
+        missing = ward_search.wards_needing_index()
+        if missing:
+            print(f"\n⚠️ Wards that should get a partial index: {', '.join(map(str, missing))}")
+        return
+
+    print("=" * 60)
+    print("WARD INDEX MANAGEMENT")
+    print("=" * 60)
+
+    wards = args.wards or ward_search.wards_needing_index()
+    for ward in wards:
+        for statement in vector_search.ward_index_statements("complaints", ward):
+            print(f"  ward {ward}: {statement}")
+            cursor.execute(statement.replace("CREATE INDEX", f"CREATE INDEX{concurrently}", 1))
+
+    if args.drop_small:
+        cutoff = ward_search.partial_index_min_rows // 2
+        sizes = ward_search.ward_sizes()
+        for ward in stats["partial_index_wards"]:
+            if sizes.get(ward, 0) < cutoff:
+                print(f"  ward {ward}: dropping partial index (below {cutoff} rows)")
+                for name in (f"idx_complaints_embedding_w{ward}", f"idx_complaints_embedding_bq_w{ward}"):
+                    cursor.execute(f"DROP INDEX{concurrently} IF EXISTS {name}")
+
+    cursor.close()
+    conn.close()
+    print(f"\n✅ {len(wards)} ward index(es) created. The API picks them up within "
+          f"{int(ward_search.stats_ttl_seconds)}s.")
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except Exception as e:
+        print(f"\n❌ Error managing ward indexes: {e}")
+        import traceback
+        traceback.print_exc()
@@ -0,0 +1,157 @@
+"""
+Vector Storage Migration Script
+Converts embedding columns between float32 `vector` and float16 `halfvec`
+and adds or removes the binary-quantized pre-filter index
+
+The column type change rewrites the table under an exclusive lock, so run it
+in a maintenance window; index builds use CONCURRENTLY (except on the
+partitioned complaints table, which does not support it). Set VECTOR_STORAGE /
+VECTOR_BINARY_PREFILTER to match before restarting the API.
+
+Usage:
+    python migrate_vector_storage.py --storage halfvec
+    python migrate_vector_storage.py --storage halfvec --binary-prefilter --drop-full-index
+    python migrate_vector_storage.py --storage vector            # back to float32
+"""
+
+import argparse
+
+import psycopg2
+from app.core.config import settings
+from app.core.vector_search import MIN_PGVECTOR_FOR_COMPACT, VectorSearch, pgvector_version
+from app.services.complaint_partitions import is_partitioned
+
+DEFAULT_TABLES = ["complaints", "announcements", "reports"]
+
+
+def index_sizes(cursor, table: str) -> dict:
+    """Size in MB of each embedding index on a table"""
+    cursor.execute(
+        """
+        SELECT indexname, pg_relation_size(quote_ident(indexname)::regclass) / 1048576.0 AS mb
+        FROM pg_indexes
+        WHERE schemaname = current_schema() AND tablename = %s
+          AND indexname LIKE %s
+        ORDER BY indexname
+        """,
+        (table, f"idx_{table}_embedding%")
+    )
+    return {name: round(float(mb), 1) for name, mb in cursor.fetchall()}
+
+
+def ward_index_names(cursor, table: str) -> list:
+    """Per-ward partial HNSW indexes on a table (see manage_ward_indexes.py)"""
+    cursor.execute(
+        """
+        SELECT indexname FROM pg_indexes
+        WHERE schemaname = current_schema() AND tablename = %s AND indexname LIKE %s
+        """,
+        (table, f"idx_{table}_embedding%_w%")
+    )
+    return [row[0] for row in cursor.fetchall()]
+
+
+def column_type(cursor, table: str) -> str:
+    """Current type of a table's embedding column, e.g. vector(384)"""
+    cursor.execute(
+        """
+        SELECT format_type(atttypid, atttypmod)
+        FROM pg_attribute
+        WHERE attrelid = %s::regclass AND attname = 'embedding' AND NOT attisdropped
+        """,
+        (table,)
+    )
+    row = cursor.fetchone()
+    return row[0] if row else None
+
+
+def migrate_table(cursor, table: str, layout: VectorSearch, drop_full_index: bool):
+    """Bring one table to the target layout"""
+    current = column_type(cursor, table)
+    if current is None:
+        print(f"  [{table}] skipped: no embedding column")
+        return
+    before = index_sizes(cursor, table)
+    concurrently = "" if is_partitioned(cursor, table) else " CONCURRENTLY"
+
+    if current != layout.column_type:
+        print(f"  [{table}] {current} -> {layout.column_type} (rewrites the table)...")
+        # The old HNSW indexes use the old type's operator class
+        cursor.execute(f"DROP INDEX IF EXISTS idx_{table}_embedding")
+        for name in ward_index_names(cursor, table):
+            cursor.execute(f"DROP INDEX IF EXISTS {name}")
+        cursor.execute(
+            f"ALTER TABLE {table} ALTER COLUMN embedding TYPE {layout.column_type} "
+            f"USING embedding::{layout.column_type}"
+        )
+
+    if not layout.binary_prefilter:
+        cursor.execute(f"DROP INDEX{concurrently} IF EXISTS idx_{table}_embedding_bq")
+    # Per-ward partial indexes follow the layout too; manage_ward_indexes.py rebuilds them
+    for name in ward_index_names(cursor, table):
+        cursor.execute(f"DROP INDEX{concurrently} IF EXISTS {name}")
+    if drop_full_index:
+        cursor.execute(f"DROP INDEX{concurrently} IF EXISTS idx_{table}_embedding")
+
+    for statement in layout.index_statements(table, full_index=not drop_full_index):
+        print(f"  [{table}] {statement}")
+        cursor.execute(statement.replace("CREATE INDEX", f"CREATE INDEX{concurrently}", 1))
+
+    print(f"  [{table}] index MB before {before or '-'}, after {index_sizes(cursor, table) or '-'}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Change the embedding storage layout")
+    parser.add_argument("--storage", choices=["vector", "halfvec"], required=True)
+    parser.add_argument("--binary-prefilter", action="store_true",
+                        help="Add the binary_quantize HNSW index used for pre-filtering")
+    parser.add_argument("--drop-full-index", action="store_true",
+                        help="Drop the full-precision HNSW index (requires --binary-prefilter)")
+    parser.add_argument("--tables", nargs="+", default=DEFAULT_TABLES)
+    args = parser.parse_args()
+
+    if args.drop_full_index and not args.binary_prefilter:
+        parser.error("--drop-full-index needs --binary-prefilter, or searches fall back to full scans")
+
+    layout = VectorSearch(storage=args.storage, binary_prefilter=args.binary_prefilter)
+
+    conn = psycopg2.connect(
+        host=settings.DB_HOST,
+        database=settings.DB_NAME,
+        user=settings.DB_USER,
+        password=settings.DB_PASSWORD,
+        port=settings.DB_PORT
+    )
+    # CREATE/DROP INDEX CONCURRENTLY cannot run inside a transaction block
+    conn.autocommit = True
+    cursor = conn.cursor()
+
+    version = pgvector_version(cursor)
+    if layout.requires_compact_support and version < MIN_PGVECTOR_FOR_COMPACT:
+        found = ".".join(map(str, version)) or "not installed"
+        required = ".".join(map(str, MIN_PGVECTOR_FOR_COMPACT))
+        raise SystemExit(f"❌ halfvec/binary_quantize need pgvector >= {required} (found {found})")
+
+    print("=" * 60)
+    print(f"VECTOR STORAGE MIGRATION -> {layout.column_type}"
+          f"{' + binary pre-filter' if layout.binary_prefilter else ''}")
+    print("=" * 60)
+    for table in args.tables:
+        migrate_table(cursor, table, layout, args.drop_full_index)
+
+    cursor.close()
+    conn.close()
+    print("\n✅ Migration complete. Set these before restarting the API:")
+    print(f"  VECTOR_STORAGE={args.storage}")
+    print(f"  VECTOR_BINARY_PREFILTER={'true' if args.binary_prefilter else 'false'}")
+    print("Per-ward indexes were dropped; recreate them with `python manage_ward_indexes.py`")
+    print("once these are set.")
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except Exception as e:
+        print(f"\n❌ Error during migration: {e}")
+        import traceback
+        traceback.print_exc()
@@ -0,0 +1,176 @@
+"""
+Complaint Partitioning Migration Script
+Converts an existing unpartitioned complaints table into the monthly
+range-partitioned layout created by setup_database.py
+
+Everything runs in one transaction under an exclusive lock on complaints,
+so run it in a maintenance window: rows are copied into the new table and
+all of its indexes (HNSW included) are rebuilt per partition. The new
+table takes every column of the old one (including any this application
+does not use, such as those of database/comprehensive_schema.sql), its
+foreign keys to other tables and its triggers. Ids and complaints_id_seq
+are kept. The foreign keys complaint_neighbors had on complaints are
+dropped (a partitioned table has no unique key on id alone).
+
+Usage:
+    python partition_complaints.py --dry-run    # show what would be created
+    python partition_complaints.py
+"""
+
+import argparse
+import time
+from datetime import date
+
+import psycopg2
+from psycopg2.extras import RealDictCursor
+
+from app.core.config import settings
+from app.core.text_search import text_search
+from app.core.vector_search import vector_search
+from app.services.complaint_partitions import (
+    COMPLAINT_INDEXES, COMPLAINTS_SEARCH_TEXT, add_months, complaint_partitions, is_partitioned,
+    month_start, partition_name, stored_columns
+)
+
+OLD_TABLE = "complaints_unpartitioned"
+
+
+def free_names(cursor):
+    """Drop the old table's indexes and the foreign keys pointing at it, so the new table can reuse their names"""
+    cursor.execute(
+        """
+        SELECT conrelid::regclass AS table_name, conname
+        FROM pg_constraint
+        WHERE confrelid = %s::regclass AND contype = 'f'
+        """,
+        (OLD_TABLE,)
+    )
+    for row in cursor.fetchall():
+        print(f"  dropping foreign key {row['table_name']}.{row['conname']}")
+        cursor.execute(f"ALTER TABLE {row['table_name']} DROP CONSTRAINT {row['conname']}")
+
+    cursor.execute(
+        """
+        SELECT con.conname
+        FROM pg_constraint con
+        WHERE con.conrelid = %s::regclass AND con.contype IN ('p', 'u', 'f')
+        """,
+        (OLD_TABLE,)
+    )
+    for row in cursor.fetchall():
+        cursor.execute(f"ALTER TABLE {OLD_TABLE} DROP CONSTRAINT {row['conname']}")
+
+    cursor.execute(
+        "SELECT indexname FROM pg_indexes WHERE schemaname = current_schema() AND tablename = %s",
+        (OLD_TABLE,)
+    )
+    for row in cursor.fetchall():
+        cursor.execute(f"DROP INDEX {row['indexname']}")
+
+
+def carried_over(cursor) -> tuple:
+    """
+    Foreign keys and triggers of complaints, to re-create on the new table
+
+    Read before the rename, so trigger definitions still name complaints.
+
+    Returns:
+        (foreign keys as "ADD CONSTRAINT ..." clauses, trigger definitions)
+    """
+    cursor.execute(
+        """
+        SELECT conname, pg_get_constraintdef(oid) AS definition
+        FROM pg_constraint
+        WHERE conrelid = 'complaints'::regclass AND contype = 'f'
+        """
+    )
+    foreign_keys = [f"ADD CONSTRAINT {row['conname']} {row['definition']}" for row in cursor.fetchall()]
+    cursor.execute(
+        """
+        SELECT pg_get_triggerdef(oid) AS definition
+        FROM pg_trigger
+        WHERE tgrelid = 'complaints'::regclass AND NOT tgisinternal
+        """
+    )
+    triggers = [row['definition'] for row in cursor.fetchall()]
+    return foreign_keys, triggers
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Partition the complaints table by month")
+    parser.add_argument("--dry-run", action="store_true", help="Show the partitions to create and exit")
+    args = parser.parse_args()
+
+    conn = psycopg2.connect(
+        host=settings.DB_HOST,
+        database=settings.DB_NAME,
+        user=settings.DB_USER,
+        password=settings.DB_PASSWORD,
+        port=settings.DB_PORT
+    )
+    cursor = conn.cursor(cursor_factory=RealDictCursor)
+
+    if is_partitioned(cursor):
+        print("✅ complaints is already partitioned; nothing to do")
+        return
+
+    cursor.execute("SELECT min(date) AS first, count(*) AS n FROM complaints")
+    row = cursor.fetchone()
+    current = month_start(date.today())
+    first = month_start(row['first']) if row['first'] else current
+    last = add_months(current, complaint_partitions.premake_months)
+    months = (last.year - first.year) * 12 + last.month - first.month + 1
+
+    print("=" * 60)
+    print("COMPLAINT PARTITIONING")
+    print("=" * 60)
+    print(f"  {row['n']} complaints, {months} monthly partitions "
+          f"({partition_name(first)} .. {partition_name(last)})")
+    if args.dry_run:
+        return
+
+    started = time.perf_counter()
+    cursor.execute("LOCK TABLE complaints IN ACCESS EXCLUSIVE MODE")
+    foreign_keys, triggers = carried_over(cursor)
+    cursor.execute(f"ALTER TABLE complaints RENAME TO {OLD_TABLE}")
+    free_names(cursor)
+
+    print("  creating partitioned table...")
+    for statement in complaint_partitions.like_statements(OLD_TABLE):
+        cursor.execute(statement)
+    complaint_partitions.ensure_partitions(cursor, since=first)
+
+    print("  copying rows...")
+    columns = ", ".join(stored_columns(cursor, OLD_TABLE))
+    cursor.execute(f"INSERT INTO complaints ({columns}) SELECT {columns} FROM {OLD_TABLE}")
+    cursor.execute(f"DROP TABLE {OLD_TABLE}")
+
+    for clause in foreign_keys:
+        print(f"  re-creating foreign key: {clause}")
+        cursor.execute(f"ALTER TABLE complaints {clause}")
+    for definition in triggers:
+        print(f"  re-creating trigger: {definition}")
+        cursor.execute(definition)
+
+    print("  building indexes...")
+    for statement in COMPLAINT_INDEXES + vector_search.index_statements("complaints"):
+        cursor.execute(statement)
+    for statement in text_search.column_statements("complaints", COMPLAINTS_SEARCH_TEXT):
+        cursor.execute(statement)
+    cursor.execute("ANALYZE complaints")
+    conn.commit()
+
+    cursor.close()
+    conn.close()
+    print(f"\n✅ complaints partitioned in {time.perf_counter() - started:.1f}s")
+    print("Per-ward indexes were dropped with the old table; recreate them with")
+    print("`python manage_ward_indexes.py`.")
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except Exception as e:
+        print(f"\n❌ Error partitioning complaints: {e}")
+        import traceback
+        traceback.print_exc()
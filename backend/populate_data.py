@@ -6,7 +6,73 @@ import psycopg2
 from datetime import datetime, timedelta
 import random
 from app.core.config import settings
-from app.core.security import security_service
+from app.services.user_import import PasswordHashPool
+
+COMPLAINT_DESCRIPTIONS = [
+    "Large pothole on main road causing traffic congestion",
+    "Street light not working for past week",
+    "Water supply disrupted since yesterday morning",
+    "Garbage not collected for 3 days",
+    "Drainage overflow near residential area",
+    "Road repair work incomplete and abandoned",
+    "No water supply in the morning hours",
+    "Streetlights remain on during daytime wasting electricity",
+    "Broken sewage pipe leaking on the street",
+    "Tree branches blocking road visibility",
+    "Illegal parking causing traffic jam",
+    "Public park gate broken and not repaired",
+    "Road flooding during rain due to poor drainage",
+    "Transformer making loud noise",
+    "Footpath damaged and dangerous for pedestrians",
+    "Bus stop shelter damaged",
+    "Signal light malfunction at junction",
+    "Stray dogs menace in the area",
+    "Street vendor encroachment blocking footpath",
+    "Public toilet not maintained properly"
+]
+
+WARDS = list(range(1, 199))  # Bangalore has 198 wards
+ZONES = ['East', 'West', 'South', 'North', 'Central', 'Mahadevapura', 'Bommanahalli', 'Yelahanka']
+
+CATEGORIES = [
+    'Roads & Infrastructure',
+    'Water Supply',
+    'Sanitation & Drainage',
+    'Electricity',
+    'Street Lights',
+    'Garbage Collection',
+    'Public Transport',
+    'Parks & Recreation',
+    'Traffic Management',
+    'Others'
+]
+
+STATUSES = ['pending', 'in_progress', 'resolved']
+
+# (title, body, ward_number); ward None is city-wide
+ANNOUNCEMENTS = [
+    ("Road Maintenance Work", "Major road repair work will be conducted on MG Road from Dec 1-15. Expect traffic diversions.", None),
+    ("Water Supply Disruption", "Water supply will be disrupted on Dec 5 from 10 AM to 4 PM due to pipeline maintenance.", 25),
+    ("Waste Collection Schedule Change", "Garbage collection timings changed to 6 AM - 8 AM starting next week.", None),
+    ("New Park Opening", "A new children's park will be inaugurated in Ward 42 on December 10.", 42),
+    ("Property Tax Deadline", "Last date to pay property tax without penalty is December 31, 2025.", None),
+    ("Street Light Repair Drive", "All non-functional street lights will be repaired in the next 2 weeks.", None),
+    ("Vaccination Drive", "Free vaccination camp organized at community center on December 8.", 18),
+    ("Traffic Rule Awareness", "Special drive against traffic violations from December 1-10. Follow rules to avoid penalties.", None),
+    ("Monsoon Preparedness", "BBMP has cleaned major drains in preparation for monsoon. Report clogged drains on our portal.", None),
+    ("E-Governance Initiative", "New mobile app launched for citizen services. Download from Play Store.", None),
+    ("Tree Plantation Drive", "Join us for tree plantation drive on December 15. Register at ward office.", 35),
+    ("Power Outage Notice", "Scheduled power maintenance on Dec 8, 9 AM - 2 PM in selected areas.", 67),
+    ("Community Hall Booking", "Community hall now available for booking online. Visit our website.", None),
+    ("Road Safety Week", "Road safety week from Dec 10-17. Special sessions in schools.", None),
+    ("Senior Citizen Health Camp", "Free health checkup camp for senior citizens on December 12.", None),
+    ("Pothole Repair Initiative", "Report potholes through our app. Repairs within 48 hours guaranteed.", None),
+    ("Public Toilet Facilities", "10 new public toilets constructed across the city.", None),
+    ("Festival Traffic Advisory", "Heavy traffic expected during festival season. Use public transport.", None),
+    ("Water Conservation", "Water conservation drive launched. Report water wastage on helpline.", None),
+    ("Building Permit Guidelines", "New simplified guidelines for building permits now available online.", None)
+]
+
 
 def populate_database():
     """Populate database with realistic sample data"""
@@ -27,25 +93,6 @@ def populate_database():
     print("1. Clearing existing data...")
     cursor.execute("TRUNCATE TABLE announcements, reports, complaints, citizens RESTART IDENTITY CASCADE;")
     
-    # Sample data
-    wards = list(range(1, 199))  # Bangalore has 198 wards
-    zones = ['East', 'West', 'South', 'North', 'Central', 'Mahadevapura', 'Bommanahalli', 'Yelahanka']
-    
-    categories = [
-        'Roads & Infrastructure',
-        'Water Supply',
-        'Sanitation & Drainage',
-        'Electricity',
-        'Street Lights',
-        'Garbage Collection',
-        'Public Transport',
-        'Parks & Recreation',
-        'Traffic Management',
-        'Others'
-    ]
-    
-    statuses = ['pending', 'in_progress', 'resolved']
-    
     # Sample citizen names
     first_names = ['Rajesh', 'Priya', 'Suresh', 'Anjali', 'Vikram', 'Kavya', 'Amit', 'Deepa', 
                    'Kiran', 'Sneha', 'Arjun', 'Divya', 'Ravi', 'Pooja', 'Sagar', 'Meera',
@@ -60,91 +107,55 @@ def populate_database():
     officer_ids = []
     admin_ids = []
     
+    # Build every account first so all passwords are hashed in one parallel pass
+    accounts = []
+    
     # Regular citizens
     for i in range(30):
         name = f"{random.choice(first_names)} {random.choice(last_names)}"
         email = f"citizen{i+1}@example.com"
-        ward = random.choice(wards)
-        zone = random.choice(zones)
-        phone = f"+91 {''.join([str(random.randint(0,9)) for _ in range(10)])}"
-        password_hash = security_service.hash_password("password123")
-        
-        cursor.execute("""
-            INSERT INTO citizens (name, email, phone, ward_number, zone, role, password_hash, created_at)
-            VALUES (%s, %s, %s, %s, %s, 'citizen', %s, %s)
-            RETURNING id
-        """, (name, email, phone, ward, zone, password_hash, datetime.now() - timedelta(days=random.randint(30, 365))))
-        
-        user_ids.append(cursor.fetchone()[0])
+        accounts.append((name, email, 'citizen', "password123", random.randint(30, 365)))
     
     # Officers
     for i in range(5):
         name = f"Officer {random.choice(first_names)} {random.choice(last_names)}"
         email = f"officer{i+1}@bangalore.gov.in"
-        ward = random.choice(wards)
-        zone = random.choice(zones)
-        phone = f"+91 {''.join([str(random.randint(0,9)) for _ in range(10)])}"
-        password_hash = security_service.hash_password("officer123")
-        
-        cursor.execute("""
-            INSERT INTO citizens (name, email, phone, ward_number, zone, role, password_hash, created_at)
-            VALUES (%s, %s, %s, %s, %s, 'officer', %s, %s)
-            RETURNING id
-        """, (name, email, phone, ward, zone, password_hash, datetime.now() - timedelta(days=random.randint(60, 400))))
-        
-        officer_ids.append(cursor.fetchone()[0])
+        accounts.append((name, email, 'officer', "officer123", random.randint(60, 400)))
     
     # Admins
     for i in range(2):
         name = f"Admin {random.choice(['Ramesh', 'Sudhir'])} {random.choice(last_names)}"
         email = f"admin{i+1}@bangalore.gov.in"
-        ward = random.choice(wards)
-        zone = random.choice(zones)
+        accounts.append((name, email, 'admin', "admin123", random.randint(100, 500)))
+    
+    with PasswordHashPool() as hasher:
+        password_hashes = hasher.hash_many([password for _, _, _, password, _ in accounts])
+    
+    ids_by_role = {'citizen': user_ids, 'officer': officer_ids, 'admin': admin_ids}
+    for (name, email, role, _, days_ago), password_hash in zip(accounts, password_hashes):
+        ward = random.choice(WARDS)
+        zone = random.choice(ZONES)
         phone = f"+91 {''.join([str(random.randint(0,9)) for _ in range(10)])}"
-        password_hash = security_service.hash_password("admin123")
         
         cursor.execute("""
             INSERT INTO citizens (name, email, phone, ward_number, zone, role, password_hash, created_at)
-            VALUES (%s, %s, %s, %s, %s, 'admin', %s, %s)
+            VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
             RETURNING id
-        """, (name, email, phone, ward, zone, password_hash, datetime.now() - timedelta(days=random.randint(100, 500))))
+        """, (name, email, phone, ward, zone, role, password_hash, datetime.now() - timedelta(days=days_ago)))
         
-        admin_ids.append(cursor.fetchone()[0])
+        ids_by_role[role].append(cursor.fetchone()[0])
     
     print(f"   Created {len(user_ids)} citizens, {len(officer_ids)} officers, {len(admin_ids)} admins")
     
     # 3. Create Complaints (100+ complaints)
     print("3. Creating complaints...")
     
-    complaint_descriptions = [
-        "Large pothole on main road causing traffic congestion",
-        "Street light not working for past week",
-        "Water supply disrupted since yesterday morning",
-        "Garbage not collected for 3 days",
-        "Drainage overflow near residential area",
-        "Road repair work incomplete and abandoned",
-        "No water supply in the morning hours",
-        "Streetlights remain on during daytime wasting electricity",
-        "Broken sewage pipe leaking on the street",
-        "Tree branches blocking road visibility",
-        "Illegal parking causing traffic jam",
-        "Public park gate broken and not repaired",
-        "Road flooding during rain due to poor drainage",
-        "Transformer making loud noise",
-        "Footpath damaged and dangerous for pedestrians",
-        "Bus stop shelter damaged",
-        "Signal light malfunction at junction",
-        "Stray dogs menace in the area",
-        "Street vendor encroachment blocking footpath",
-        "Public toilet not maintained properly"
-    ]
-    
     for i in range(120):
         user_id = random.choice(user_ids)
         ward = random.randint(1, 198)
-        category = random.choice(categories)
-        description = random.choice(complaint_descriptions)
-        status = random.choices(statuses, weights=[30, 40, 30])[0]  # More in_progress complaints
+        category = random.choice(CATEGORIES)
+        description = random.choice(COMPLAINT_DESCRIPTIONS)
+        status = random.choices(STATUSES, weights=[30, 40, 30])[0]  # More in_progress complaints
         days_ago = random.randint(1, 90)
         
         cursor.execute("""
@@ -157,37 +168,14 @@ def populate_database():
     # 4. Create Announcements (20+ announcements)
     print("4. Creating announcements...")
     
-    announcements = [
-        ("Road Maintenance Work", "Major road repair work will be conducted on MG Road from Dec 1-15. Expect traffic diversions.", None),
-        ("Water Supply Disruption", "Water supply will be disrupted on Dec 5 from 10 AM to 4 PM due to pipeline maintenance.", 25),
-        ("Waste Collection Schedule Change", "Garbage collection timings changed to 6 AM - 8 AM starting next week.", None),
-        ("New Park Opening", "A new children's park will be inaugurated in Ward 42 on December 10.", 42),
-        ("Property Tax Deadline", "Last date to pay property tax without penalty is December 31, 2025.", None),
-        ("Street Light Repair Drive", "All non-functional street lights will be repaired in the next 2 weeks.", None),
-        ("Vaccination Drive", "Free vaccination camp organized at community center on December 8.", 18),
-        ("Traffic Rule Awareness", "Special drive against traffic violations from December 1-10. Follow rules to avoid penalties.", None),
-        ("Monsoon Preparedness", "BBMP has cleaned major drains in preparation for monsoon. Report clogged drains on our portal.", None),
-        ("E-Governance Initiative", "New mobile app launched for citizen services. Download from Play Store.", None),
-        ("Tree Plantation Drive", "Join us for tree plantation drive on December 15. Register at ward office.", 35),
-        ("Power Outage Notice", "Scheduled power maintenance on Dec 8, 9 AM - 2 PM in selected areas.", 67),
-        ("Community Hall Booking", "Community hall now available for booking online. Visit our website.", None),
-        ("Road Safety Week", "Road safety week from Dec 10-17. Special sessions in schools.", None),
-        ("Senior Citizen Health Camp", "Free health checkup camp for senior citizens on December 12.", None),
-        ("Pothole Repair Initiative", "Report potholes through our app. Repairs within 48 hours guaranteed.", None),
-        ("Public Toilet Facilities", "10 new public toilets constructed across the city.", None),
-        ("Festival Traffic Advisory", "Heavy traffic expected during festival season. Use public transport.", None),
-        ("Water Conservation", "Water conservation drive launched. Report water wastage on helpline.", None),
-        ("Building Permit Guidelines", "New simplified guidelines for building permits now available online.", None)
-    ]
-    
-    for title, body, ward in announcements:
+    for title, body, ward in ANNOUNCEMENTS:
         days_ago = random.randint(1, 30)
         cursor.execute("""
             INSERT INTO announcements (ward_number, title, body, date)
             VALUES (%s, %s, %s, %s)
         """, (ward, title, body, datetime.now() - timedelta(days=days_ago)))
     
-    print(f"   Created {len(announcements)} announcements")
+    print(f"   Created {len(ANNOUNCEMENTS)} announcements")
     
     # 5. Create Reports (officer reports)
     print("5. Creating officer reports...")
@@ -4,7 +4,18 @@ Creates all necessary tables for the CitySense application
 """
 
 import psycopg2
+from psycopg2.extras import RealDictCursor
 from app.core.config import settings
+from app.core.security import USER_DELETED_TRIGGER_SQL
+from app.core.text_search import text_search
+from app.core.vector_search import vector_search
+from app.services.embedding_backfill import LEGACY_EMBEDDING_VERSION
+from app.services.complaint_neighbors import COMPLAINT_NEIGHBORS_TABLE_SQL
+from app.services.complaint_partitions import (
+    COMPLAINT_INDEXES, COMPLAINTS_SEARCH_TEXT, complaint_partitions, is_partitioned
+)
+from app.services.embedding_queue import EMBEDDING_JOBS_TABLE_SQL
+from app.services.vector_index import VECTOR_CHANGES_TRIGGER_SQL
 
 def setup_database():
     """Create all database tables"""
@@ -18,7 +29,7 @@ def setup_database():
         port=settings.DB_PORT
     )
     
-    cursor = conn.cursor()
+    cursor = conn.cursor(cursor_factory=RealDictCursor)
     
     print("Setting up database...")
     
@@ -49,44 +60,39 @@ def setup_database():
     cursor.execute("CREATE INDEX IF NOT EXISTS idx_citizens_ward ON citizens(ward_number);")
     cursor.execute("CREATE INDEX IF NOT EXISTS idx_citizens_zone ON citizens(zone);")
     
-    # Create Complaints table
+    # Create Complaints table, range-partitioned by month on date
     print("3. Creating Complaints table...")
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS complaints (
-            id SERIAL PRIMARY KEY,
-            user_id INTEGER NOT NULL REFERENCES citizens(id) ON DELETE CASCADE,
-            ward_number INTEGER NOT NULL,
-            category VARCHAR(100) NOT NULL,
-            description TEXT NOT NULL,
-            status VARCHAR(20) NOT NULL DEFAULT 'pending',
-            date TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
-            embedding VECTOR(384)
-        );
-    """)
-    
-    # Create indexes for Complaints
-    cursor.execute("CREATE INDEX IF NOT EXISTS idx_complaints_ward ON complaints(ward_number);")
-    cursor.execute("CREATE INDEX IF NOT EXISTS idx_complaints_status ON complaints(status);")
-    cursor.execute("CREATE INDEX IF NOT EXISTS idx_complaints_category ON complaints(category);")
-    cursor.execute("CREATE INDEX IF NOT EXISTS idx_complaints_date ON complaints(date DESC);")
-    cursor.execute("CREATE INDEX IF NOT EXISTS idx_complaints_user ON complaints(user_id);")
+    for statement in complaint_partitions.table_statements():
+        cursor.execute(statement)
+    if is_partitioned(cursor):
+        created = complaint_partitions.ensure_partitions(cursor)
+        print(f"   {len(created)} monthly partition(s) created")
+    else:
+        print("   Note: complaints is not partitioned; convert it with `python partition_complaints.py`")
+    
+    # Create indexes for Complaints (per partition on the partitioned table)
+    for statement in COMPLAINT_INDEXES:
+        cursor.execute(statement)
     
     # Try to create vector index (may fail if not enough data)
     try:
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_complaints_embedding ON complaints USING hnsw (embedding vector_cosine_ops);")
+        # Index layout follows VECTOR_STORAGE / VECTOR_BINARY_PREFILTER
+        for statement in vector_search.index_statements("complaints"):
+            cursor.execute(statement)
     except Exception as e:
         print(f"   Note: Vector index creation skipped (will be created when data is added): {e}")
     
     # Create Announcements table
     print("4. Creating Announcements table...")
-    cursor.execute("""
+    cursor.execute(f"""
         CREATE TABLE IF NOT EXISTS announcements (
             id SERIAL PRIMARY KEY,
             ward_number INTEGER,
             title VARCHAR(200) NOT NULL,
             body TEXT NOT NULL,
             date TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
-            embedding VECTOR(384)
+            embedding {vector_search.column_type},
+            embedding_model VARCHAR(100)
         );
     """)
     
@@ -96,20 +102,63 @@ def setup_database():
     
     # Create Reports table (if needed)
     print("5. Creating Reports table...")
-    cursor.execute("""
+    cursor.execute(f"""
         CREATE TABLE IF NOT EXISTS reports (
             id SERIAL PRIMARY KEY,
             officer_id INTEGER NOT NULL REFERENCES citizens(id) ON DELETE CASCADE,
             ward_number INTEGER NOT NULL,
             report_text TEXT NOT NULL,
             date TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
-            embedding VECTOR(384)
+            embedding {vector_search.column_type},
+            embedding_model VARCHAR(100)
         );
     """)
     
     cursor.execute("CREATE INDEX IF NOT EXISTS idx_reports_ward ON reports(ward_number);")
     cursor.execute("CREATE INDEX IF NOT EXISTS idx_reports_date ON reports(date DESC);")
     
+    # Record which model produced each vector; rows embedded before this
+    # column existed all came from the original model
+    print("   Tracking embedding model versions...")
+    for table in ("complaints", "announcements", "reports"):
+        cursor.execute(f"ALTER TABLE {table} ADD COLUMN IF NOT EXISTS embedding_model VARCHAR(100);")
+        cursor.execute(
+            f"UPDATE {table} SET embedding_model = %s WHERE embedding IS NOT NULL AND embedding_model IS NULL;",
+            (LEGACY_EMBEDDING_VERSION,)
+        )
+    
+    # Checkpoints for backfill_embeddings.py
+    print("6. Creating embedding backfill checkpoint table...")
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS embedding_backfill_state (
+            table_name VARCHAR(100) PRIMARY KEY,
+            last_id BIGINT NOT NULL DEFAULT 0,
+            rows_done BIGINT NOT NULL DEFAULT 0,
+            updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+        );
+    """)
+    
+    # Outbox consumed by the background embedding workers
+    print("7. Creating embedding job queue...")
+    cursor.execute(EMBEDDING_JOBS_TABLE_SQL)
+    
+    # API workers evict cached user ids when a citizen is deleted
+    print("8. Creating citizen delete notification trigger...")
+    cursor.execute(USER_DELETED_TRIGGER_SQL)
+    
+    # Precomputed similar complaints (fill with build_complaint_neighbors.py)
+    print("9. Creating complaint neighbours table...")
+    cursor.execute(COMPLAINT_NEIGHBORS_TABLE_SQL)
+    
+    # Lexical side of hybrid complaint search
+    print("10. Adding full-text search column to Complaints...")
+    for statement in text_search.column_statements("complaints", COMPLAINTS_SEARCH_TEXT):
+        cursor.execute(statement)
+    
+    # Change feed for the in-process vector index (VECTOR_INDEX_ENABLED)
+    print("11. Creating vector change notification triggers...")
+    cursor.execute(VECTOR_CHANGES_TRIGGER_SQL)
+    
     # Commit changes
     conn.commit()
     
@@ -119,6 +168,9 @@ def setup_database():
     print("  - complaints")
     print("  - announcements")
     print("  - reports")
+    print("  - embedding_backfill_state")
+    print("  - embedding_jobs")
+    print("  - complaint_neighbors")
     
     # Verify tables
     cursor.execute("""
@@ -132,7 +184,7 @@ def setup_database():
     tables = cursor.fetchall()
     print(f"\nTotal tables in database: {len(tables)}")
     for table in tables:
-        print(f"  - {table[0]}")
+        print(f"  - {table['table_name']}")
     
     cursor.close()
     conn.close()
@@ -366,8 +366,11 @@ CREATE INDEX idx_trees_embedding ON Trees USING hnsw (embedding vector_cosine_op
 -- ============================================================================================================
 
 -- Complaints (Enhanced from original)
+-- Range-partitioned by month on date; the primary key includes the partition key.
+-- Monthly partitions are created by backend/setup_database.py and backend/archive_complaints.py;
+-- until then rows land in the DEFAULT partition and are moved when their month is created.
 CREATE TABLE IF NOT EXISTS Complaints (
-    id SERIAL PRIMARY KEY,
+    id SERIAL,
     user_id INTEGER NOT NULL REFERENCES Citizens(id) ON DELETE CASCADE,
     ward_number INTEGER REFERENCES Wards(ward_number),
     category VARCHAR(100) NOT NULL, -- Street Light, Garbage, Water, Roads, etc.
@@ -382,9 +385,13 @@ CREATE TABLE IF NOT EXISTS Complaints (
     resolved_at TIMESTAMP,
     resolution_notes TEXT,
     citizen_rating INTEGER, -- 1-5 stars
-    embedding VECTOR(384)
-);
+    embedding VECTOR(384),
+    PRIMARY KEY (id, date)
+) PARTITION BY RANGE (date);
+
+CREATE TABLE IF NOT EXISTS complaints_default PARTITION OF Complaints DEFAULT;
 
+-- Indexes on the partitioned table are created on every partition
 CREATE INDEX idx_complaints_ward ON Complaints(ward_number);
 CREATE INDEX idx_complaints_status ON Complaints(status);
 CREATE INDEX idx_complaints_category ON Complaints(category);